@@ -0,0 +1,225 @@
+"""
+Precomputed answer bank.
+The question space of a portfolio assistant is small: FAQ keys, the greeting's
+example prompts and a few per-project follow-ups, in both chat modes. This batch
+job answers them all offline and appends them to a JSONL bank that the app loads
+at startup and serves before calling Groq. Runs are resumable: entries already in
+the bank for the current knowledge-base version are skipped.
+
+    python answer_bank.py --concurrency 4
+    python answer_bank.py --provider fake --limit 10
+"""
+
+import argparse
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from knowledge_base import CACHE_DIR
+from prefetch import followup_prompts
+from prompts import CHAT_MODES, build_intelligent_system_prompt
+from rate_limiter import GroqBudget, estimate_tokens, retry_after_seconds
+
+BANK_PATH = os.getenv("PORTFOLI_ANSWER_BANK", os.path.join(CACHE_DIR, "answer_bank.jsonl"))
+MODEL = "llama-3.3-70b-versatile"
+
+_EXAMPLE_RE = re.compile(r"👉\s*\*'(.+?)'\*")
+
+
+def normalize_question(text):
+    return " ".join(text.lower().split())
+
+
+def bank_key(chat_mode, project, question):
+    return (chat_mode, project or "", normalize_question(question))
+
+
+def bank_questions(kb, route=None, answered_locally=None):
+    """
+    [(chat_mode, project_url, question), ...] to precompute.
+    Free-standing questions get the project `route(question)` picks (see make_router);
+    follow-ups are keyed to their (selected) project. Questions for which
+    `answered_locally(question, selected_project)` is true never reach Groq in the
+    app, so they are left out.
+    """
+    free = list(kb.faq) + _EXAMPLE_RE.findall(kb.greeting_message or "")
+    asked = [(None, question) for question in free]
+    asked += [(project.url, question) for project in kb.projects for question in followup_prompts()]
+    if answered_locally:
+        asked = [(selected, question) for selected, question in asked if not answered_locally(question, selected)]
+    items = []
+    for mode in CHAT_MODES:
+        for selected, question in asked:
+            project = selected or (route(question) if route else None)
+            items.append((mode, project or "", question))
+    return items
+
+
+def make_router(kb, cards_path=None):
+    """
+    (route, answered_locally) callables for bank_questions that route like the app does
+    (routing.py): project-name search, the comparison guard, and the embedding index
+    over project profiles plus the README sections cached in the card store.
+    """
+    from answer_engine import AnswerEngine
+    from embeddings import build_project_index
+    from metrics_table import build_metrics_table
+    from project_cards import CARDS_PATH, ProjectCardStore
+    from project_search import ProjectSearch
+    from routing import classify_user_query, confident_local_answer, route_question
+
+    engine = AnswerEngine(kb, lambda: build_metrics_table(kb))
+    search = ProjectSearch(kb)
+    cards = ProjectCardStore(kb, path=cards_path or CARDS_PATH).cards
+    index = build_project_index(kb, {url: card["readme"] for url, card in cards.items() if card.get("readme")})
+
+    def route(question):
+        return route_question(question, classify_user_query(question)['type'], engine, search, lambda: index)
+
+    def answered_locally(question, selected_project):
+        query_type = classify_user_query(question)['type']
+        return query_type == 'code' or confident_local_answer(engine, question, query_type, selected_project) is not None
+
+    return route, answered_locally
+
+
+class AnswerBank:
+    """bank_key -> answer for one knowledge-base version."""
+
+    def __init__(self, kb_version, answers=None):
+        self.kb_version = kb_version
+        self.answers = answers or {}
+
+    @classmethod
+    def load(cls, kb_version, path=BANK_PATH):
+        answers = {}
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        rec = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from an interrupted run
+                    if rec.get("kb_version") == kb_version:
+                        answers[bank_key(rec["chat_mode"], rec["project"], rec["question"])] = rec["answer"]
+        except OSError:
+            pass
+        return cls(kb_version, answers)
+
+    def get(self, chat_mode, project, question):
+        return self.answers.get(bank_key(chat_mode, project, question))
+
+    def __len__(self):
+        return len(self.answers)
+
+
+def _complete(client, budget, messages, retries):
+    """One completion with admission control and exponential backoff; returns (text, total_tokens)."""
+    estimated = estimate_tokens(messages, max_tokens=800)
+    delay = 1.0
+    for attempt in range(retries + 1):
+        if not budget.acquire(estimated, max_wait=120):
+            continue
+        try:
+            completion = client.chat.completions.create(
+                model=MODEL, messages=messages, temperature=0.25, max_tokens=800
+            )
+            usage = getattr(completion, "usage", None)
+            budget.record_usage(usage, estimated)
+            return completion.choices[0].message.content.strip(), getattr(usage, "total_tokens", 0) or 0
+        except Exception as e:
+            if attempt == retries:
+                raise
+            wait = retry_after_seconds(e)
+            if wait:
+                budget.penalize(wait)
+            time.sleep(wait or delay)
+            delay *= 2
+    raise RuntimeError("Groq budget exhausted")
+
+
+def build_bank(kb, client, path=BANK_PATH, concurrency=4, retries=3, limit=None, route=None,
+               answered_locally=None, budget=None):
+    """Answer every missing bank question and append it to `path`; returns a throughput report."""
+    done = AnswerBank.load(kb.version, path)
+    todo = [item for item in bank_questions(kb, route, answered_locally) if bank_key(*item) not in done.answers]
+    todo = list(dict.fromkeys(todo))[:limit]
+    budget = budget or GroqBudget(
+        requests_per_min=int(os.getenv("GROQ_RPM", "30")),
+        tokens_per_min=int(os.getenv("GROQ_TPM", "6000")),
+    )
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lock = threading.Lock()
+    report = {"skipped": len(done), "answered": 0, "failed": 0, "tokens": 0}
+    started = time.monotonic()
+
+    def work(item):
+        mode, project, question = item
+        messages = [
+            {"role": "system", "content": build_intelligent_system_prompt(kb, mode, project or None)},
+            {"role": "user", "content": question},
+        ]
+        return item, _complete(client, budget, messages, retries)
+
+    with open(path, "a", encoding="utf-8") as out, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for future in as_completed([pool.submit(work, item) for item in todo]):
+            try:
+                (mode, project, question), (answer, tokens) = future.result()
+            except Exception:
+                report["failed"] += 1
+                continue
+            rec = {
+                "kb_version": kb.version, "chat_mode": mode, "project": project, "question": question,
+                "answer": answer, "model": MODEL, "tokens": tokens, "generated_at": int(time.time()),
+            }
+            with lock:
+                out.write(json.dumps(rec, ensure_ascii=False) + "\n")
+                out.flush()  # every finished answer survives an interrupted run
+                report["answered"] += 1
+                report["tokens"] += tokens
+
+    elapsed = time.monotonic() - started
+    report["seconds"] = round(elapsed, 2)
+    report["questions_per_s"] = round(report["answered"] / elapsed, 2) if elapsed else 0.0
+    report["tokens_per_s"] = round(report["tokens"] / elapsed, 1) if elapsed else 0.0
+    return report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Precompute the Portfoli-AI answer bank.")
+    parser.add_argument("--output", default=BANK_PATH)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--limit", type=int, default=None, help="answer at most N missing questions")
+    parser.add_argument("--provider", choices=("groq", "fake"), default="groq")
+    parser.add_argument("--fake-latency", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    from knowledge_base import load_knowledge_base
+
+    kb = load_knowledge_base()
+    if args.provider == "fake":
+        from fakes import FakeGroq
+        client = FakeGroq(latency=args.fake_latency)
+        budget = GroqBudget(requests_per_min=10_000, tokens_per_min=10_000_000)
+    else:
+        from groq import Groq
+        client = Groq(api_key=os.environ["GROQ_API_KEY"], max_retries=0)  # _complete retries itself
+        budget = None
+    route, answered_locally = make_router(kb)
+
+    report = build_bank(
+        kb, client, path=args.output, concurrency=args.concurrency, retries=args.retries,
+        limit=args.limit, route=route, answered_locally=answered_locally, budget=budget,
+    )
+    print(f"KB {kb.version}: {report['answered']} answered, {report['failed']} failed, "
+          f"{report['skipped']} already banked in {report['seconds']}s "
+          f"({report['questions_per_s']} q/s, {report['tokens_per_s']} tokens/s) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
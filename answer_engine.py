@@ -0,0 +1,235 @@
+"""
+Deterministic answers for structured intents, straight from the knowledge base.
+Handles the 'metrics' and 'comparison' intents from classify_user_query with
+templated responses and a confidence score; the app only falls back to Groq
+when the confidence is below its threshold.
+"""
+
+import re
+from dataclasses import dataclass
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that don't tell projects (or metrics) apart
+_GENERIC = {
+    "analysis", "analytics", "dashboard", "project", "projects", "the", "of", "and", "a", "in",
+    "data", "for", "what", "is", "was", "s", "rate", "overall", "avg", "total", "show", "me",
+}
+_CATEGORY_WORDS = {"excel": "Excel", "power bi": "Power BI", "powerbi": "Power BI", "python": "Python", "sql": "SQL"}
+# Metric-name tokens that are ordinary words in a question ("month_to_month_churn", "it_department")
+METRIC_STOPWORDS = {"to", "per", "it", "by", "for", "on", "at", "with", "vs", "below", "self", "help"}
+_COUNT_WORDS = {"count", "counts", "many", "number"}
+# Words naming the kind of artifact; generic for scoring, but they break ties between
+# projects sharing a name ("the telco dashboard" is the Power BI one)
+_TYPE_WORDS = {"dashboard", "analysis", "analytics"}
+_CATEGORY_TYPE_WORDS = {
+    "Excel": {"workbook", "spreadsheet"}, "Power BI": {"dashboard", "report"},
+    "Python": {"notebook"}, "SQL": {"sql", "query", "queries"},
+}
+# Metric-name words that ask for a figure even when another metric word also names the project
+_FIGURE_WORDS = {"rate", "avg", "average", "total"}
+_COMPARE_WORDS = {"vs", "versus", "compare", "comparison", "difference", "between"}
+# Separates the sides of "A vs B and C"
+_SIDE_SPLIT_RE = re.compile(r"\b(?:vs\.?|versus|and|with|against|compared to|compared with)\b|[,;/&]", re.IGNORECASE)
+
+
+@dataclass(frozen=True, slots=True)
+class LocalAnswer:
+    text: str
+    confidence: float
+    source: str  # which template produced it
+    projects: tuple = ()  # URLs of the projects the answer covers
+
+
+def _words(text):
+    return set(_WORD_RE.findall(text.lower()))
+
+
+def _metric_words(metric):
+    return set(metric.lower().split("_")) - _GENERIC - METRIC_STOPWORDS
+
+
+class AnswerEngine:
+    """Templated metrics/comparison answers over a KnowledgeBase (+ MetricsTable)."""
+
+    def __init__(self, kb, metrics_table=None):
+        """`metrics_table` is a MetricsTable or a zero-argument loader called on first use."""
+        self.kb = kb
+        self._metrics_table = metrics_table
+        self.name_words = {p.url: _words(p.name) - _GENERIC for p in kb.projects}
+        self.type_words = {
+            p.url: (_words(p.name) & _TYPE_WORDS) | _CATEGORY_TYPE_WORDS.get(p.category, set()) for p in kb.projects
+        }
+        # A project is only "mentioned" if a matched name word isn't also a metric word ("churn")
+        self.metric_vocab = {w for p in kb.projects for m, _ in p.key_metrics for w in _metric_words(m)}
+
+    @property
+    def metrics_table(self):
+        if callable(self._metrics_table):
+            self._metrics_table = self._metrics_table()
+        return self._metrics_table
+
+    # ---- resolution helpers ----
+    def mentioned_categories(self, text):
+        lowered = text.lower()
+        found = []
+        for phrase, cat in _CATEGORY_WORDS.items():
+            if re.search(rf"\b{phrase}\b", lowered) and cat in self.kb.by_category and cat not in found:
+                found.append(cat)
+        return found
+
+    def match_projects(self, text, min_score=0.5, tolerance=0.34):
+        """
+        [(project, score), ...] best first; score is the share of distinctive name words
+        mentioned. Near-ties are all returned ("Telco" matches three projects) unless type
+        words ("dashboard", "notebook", "sql") pick some of them.
+        """
+        words = _words(text)
+        categories = self.mentioned_categories(text)
+        scored = []
+        for p in self.kb.projects:
+            name_words = self.name_words[p.url]
+            matched = name_words & words
+            if not matched or not (matched - self.metric_vocab):
+                continue
+            score = len(matched) / len(name_words)
+            if p.category in categories:
+                score += 0.5
+            scored.append((p, score))
+        # "the Excel Telco project": an explicit category settles near-ties
+        in_category = [ps for ps in scored if ps[0].category in categories]
+        scored = sorted(in_category or scored, key=lambda ps: -ps[1])
+        if not scored or scored[0][1] < min_score:
+            return []
+        best = scored[0][1]
+        # A project below min_score still joins the tie when a type word points at it
+        tied = [
+            (p, s) for p, s in scored
+            if s >= best - tolerance and (s >= min_score or self.type_words[p.url] & words)
+        ]
+        typed = [(p, s) for p, s in tied if self.type_words[p.url] & words]
+        return typed or tied
+
+    def mentioned_projects(self, text, limit=4):
+        """
+        Distinct projects named on each side of a comparison ("A vs B and C"), in order.
+        Per side, the project sharing the most full-name words wins ("churn dashboard"
+        picks the dashboard over the analysis); sides naming no project are skipped.
+        """
+        found = []
+        for side in _SIDE_SPLIT_RE.split(text):
+            candidates = self.match_projects(side, tolerance=1.0)
+            if not candidates:
+                continue
+            words, categories = _words(side), self.mentioned_categories(side)
+
+            def rank(ps):
+                full = _words(ps[0].name)
+                hits = len(full & words)
+                return (hits + (0.5 if ps[0].category in categories else 0), hits / len(full))
+
+            best = max(candidates, key=rank)[0]
+            if best not in found:
+                found.append(best)
+        return found[:limit]
+
+    def match_metric(self, project, text):
+        """
+        ([(metric, value), ...] tied best metrics, overlap) for a project. Words that only name
+        the project ("the Telco churn project") don't ask for a metric on their own.
+        """
+        words = _words(text)
+        asked = words - self.name_words[project.url]
+        best, overlap = [], 0
+        for metric, value in project.key_metrics:
+            if not (_metric_words(metric) & asked or set(metric.lower().split("_")) & words & _FIGURE_WORDS):
+                continue
+            n = len(_metric_words(metric) & words)
+            if n > overlap:
+                best, overlap = [(metric, value)], n
+            elif n == overlap and n:
+                best.append((metric, value))
+        # "churn rate" -> prefer the overall metric when several tie
+        overall = [mv for mv in best if mv[0].startswith("overall")]
+        return (overall or best), overlap
+
+    # ---- templates ----
+    def _project_metric(self, text, intent, selected_project):
+        matches = self.match_projects(text)
+        # "Telco" matches several projects: the selected one settles it, else only a comparison wants them all
+        if len(matches) > 1 and selected_project in {p.url for p, _ in matches}:
+            matches = [(self.kb.by_url[selected_project], 1.0)]
+        project_conf = 1.0 if len(matches) == 1 else 0.8 if intent == "comparison" else 0.6
+        if not matches and selected_project in self.kb.by_url:
+            matches, project_conf = [(self.kb.by_url[selected_project], 1.0)], 0.85
+        if not matches:
+            return None
+
+        lines, metric_conf, covered = [], 1.0, []
+        for project, _ in matches:
+            metrics, overlap = self.match_metric(project, text)
+            if not metrics:
+                continue
+            covered.append(project.url)
+            if overlap < 2 and len(metrics) == 1:
+                metric_conf = min(metric_conf, 0.9)
+            elif len(metrics) > 1:
+                metric_conf = min(metric_conf, 0.7)
+            for metric, value in metrics:
+                lines.append(f"- **{project.name}** ({project.category}) — `{metric}`: {value}")
+        if not lines:
+            return None
+        text_out = "\n".join(lines)
+        text_out += "\n\n_Exact figures from Robin's repository._"
+        return LocalAnswer(text_out, round(project_conf * metric_conf, 2), "project_metric", tuple(covered))
+
+    def _category_counts(self, text):
+        categories = self.mentioned_categories(text)
+        if len(categories) < 2 or not (_words(text) & _COUNT_WORDS):
+            return None
+        lines = [f"- **{cat}**: {len(self.kb.by_category[cat])} projects" for cat in categories]
+        leader = max(categories, key=lambda c: len(self.kb.by_category[c]))
+        lines.append(f"\n**{leader}** has the most of the categories you asked about; the portfolio totals {len(self.kb.projects)} projects.")
+        for cat in categories:
+            names = ", ".join(p.name for p in self.kb.by_category[cat])
+            lines.append(f"\n*{cat}:* {names}")
+        return LocalAnswer("\n".join(lines), 0.95, "category_counts")
+
+    def _project_pair(self, text):
+        projects = []
+        for p in self.kb.projects:
+            name_words = self.name_words[p.url]
+            matched = name_words & _words(text)
+            if matched - self.metric_vocab and len(matched) / len(name_words) >= 0.6:
+                projects.append(p)
+        if len(projects) != 2:
+            return None
+        a, b = projects
+        rows = [
+            f"| | **{a.name}** ({a.category}) | **{b.name}** ({b.category}) |",
+            "|---|---|---|",
+            f"| Dataset | {a.dataset_size or '—'} | {b.dataset_size or '—'} |",
+            f"| Objective | {a.objective or '—'} | {b.objective or '—'} |",
+            f"| Techniques | {', '.join(a.techniques[:4]) or '—'} | {', '.join(b.techniques[:4]) or '—'} |",
+            f"| Business impact | {a.business_impact or '—'} | {b.business_impact or '—'} |",
+        ]
+        return LocalAnswer("\n".join(rows), 0.92, "project_pair", (a.url, b.url))
+
+    # ---- entry point ----
+    def answer(self, text, intent, selected_project=None):
+        """
+        Best LocalAnswer for the query, or None if no template applies. An answer that leaves
+        out a project the question names never wins ("Telco vs HR" answered with Telco alone).
+        """
+        words = _words(text)
+        named = tuple(p.url for p in self.mentioned_projects(text))
+        candidates = []
+        if intent in ("metrics", "comparison") and self.metrics_table is not None:
+            table_answer = self.metrics_table.answer(text, projects=named or None)
+            if table_answer:
+                candidates.append(LocalAnswer(table_answer, 0.85, "metrics_table", named))
+        if intent == "comparison" or words & _COMPARE_WORDS:
+            candidates += [self._category_counts(text), self._project_pair(text)]
+        if intent in ("metrics", "comparison") or words & _COUNT_WORDS:
+            candidates.append(self._project_metric(text, intent, selected_project))
+        candidates = [c for c in candidates if c is not None and set(named) <= set(c.projects)]
+        return max(candidates, key=lambda c: c.confidence, default=None)
@@ -1,178 +1,45 @@
 """
 Portfoli-AI — Streamlit app (Groq + Enhanced Intelligence + Context-Aware)
 Requirements: see requirements.txt
-Place robi_context.py (enhanced context with 21 projects) in same folder.
+Place robi_context.json (enhanced context with 21 projects) in same folder;
+edits to it are picked up live without restarting the app.
 Add your Groq API key to Streamlit secrets: GROQ_API_KEY = "gsk_..."
 """
 
 import streamlit as st
-from groq import Groq
-from gtts import gTTS
-from io import BytesIO
-import requests
-import json
+import difflib
+import hashlib
 import os
 import re
-from urllib.parse import urlparse
-
-# Import your enhanced context (21 projects - no hallucination)
-from robi_context import context
+import sys
+import time
+
+# Knowledge base (21 projects - no hallucination), hot-reloaded from robi_context.json.
+# Heavy dependencies (groq, gtts, requests, pandas, numpy) are imported on first use;
+# bench_startup.py keeps it that way.
+from knowledge_base import KnowledgeBaseWatcher
+from answer_engine import AnswerEngine
+from answer_bank import AnswerBank
+from background import BackgroundTasks
+from cache_backend import LRUBackend, open_backend
+from content_store import ContentStore, MemoryLedger, approx_size
+from conversation_io import export_conversation, read_conversation, usage_fields
+from fact_check import FactChecker, FactIndex
+from groq_client import LazyGroq, is_rate_limited
+from project_cards import ProjectCardStore
+from project_search import ProjectSearch
+from prefetch import SpeculativeCache, followup_prompts
+from prompts import (
+    CHAT_MODES, PrefixRegistry, build_intelligent_system_prompt, choose_profile, history_window,
+    prefix_profile, profile_tokens, project_section, static_prefix,
+)
+from render import MessageRenderer
+from routing import classify_user_query, confident_local_answer, route_question
+from rate_limiter import GroqBudget, estimate_tokens, retry_after_seconds
 
 # -----------------------
-# Helper: Build intelligent system prompt
+# Helpers: code extraction
 # -----------------------
-def build_intelligent_system_prompt(chat_mode, selected_project=None):
-    """
-    Build enhanced system prompt with deep project knowledge.
-    Prevents hallucination by grounding in actual context data.
-    """
-    
-    # Base instruction - firm on accuracy
-    base_prompt = f"""You are {context.get('assistant_name', 'Portfoli-AI')}, intelligent portfolio assistant for {context.get('owner_name')}.
-
-**CRITICAL: ACCURACY REQUIREMENT**
-- ONLY use data from the knowledge base below
-- NEVER invent metrics, formulas, or project details
-- If information is not in knowledge base, say: "That specific detail isn't available in Robin's repository"
-- Be specific: use exact numbers, exact project names, exact formulas
-- Admit uncertainty rather than guess
-
-**ROBIN'S PORTFOLIO SUMMARY**
-- Total Projects: 21 (Excel: 6, Power BI: 5, Python: 4, SQL: 6)
-- Total Records Analyzed: 185,000+
-- Industries: E-commerce, Healthcare, Finance, Telecom, Retail, Supply Chain
-- Data Span: 2019-2025
-
-**CORE PROJECTS DATA:**
-"""
-    
-    # Add project details for context awareness
-    for category, projects in context.get("projects_detailed", {}).items():
-        base_prompt += f"\n{category.upper()} PROJECTS:\n"
-        for proj_name, proj_data in projects.items():
-            base_prompt += f"- {proj_name}: {proj_data.get('dataset_size', 'N/A')}. "
-            if 'key_metrics' in proj_data:
-                metrics = proj_data['key_metrics']
-                if isinstance(metrics, dict):
-                    sample_metrics = list(metrics.items())[:2]
-                    base_prompt += f"Key metrics: {', '.join([f'{k}={v}' for k,v in sample_metrics])}. "
-            base_prompt += f"GitHub: {proj_data.get('url', 'N/A')}\n"
-    
-    if chat_mode == "Business Analytics Assistant":
-        base_prompt += """
-**BUSINESS ANALYTICS MODE**
-Focus on:
-- Specific metrics and KPIs from projects
-- Business impact and ROI
-- Industry patterns and insights
-- Data-driven recommendations
-- Exact formulas/queries when requested
-"""
-    else:
-        base_prompt += """
-**GENERAL ASSISTANT MODE**
-- Relate back to Robin's expertise when relevant
-- Discuss analytics methodologies
-- Explain project approaches
-- Maintain professional tone
-"""
-    
-    if selected_project:
-        # Add specific project context if user selected one
-        project_name, project_category = "Unknown", "N/A"
-        project_details = {}
-        
-        for cat, projs in context.get("projects_detailed", {}).items():
-            for pname, pdata in projs.items():
-                if pdata.get('url') == selected_project:
-                    project_name = pname
-                    project_category = cat
-                    project_details = pdata
-                    break
-        
-        base_prompt += f"""
-
-**CURRENT PROJECT CONTEXT**
-Name: {project_name}
-Category: {project_category}
-URL: {selected_project}
-
-Available data on this project:
-- Dataset: {project_details.get('dataset_size', 'Not specified')}
-- Objective: {project_details.get('objective', 'Not specified')}
-- Key Metrics: {json.dumps(project_details.get('key_metrics', {}), indent=2)}
-- Techniques: {', '.join(project_details.get('techniques', []))}
-- Business Impact: {project_details.get('business_impact', 'Not specified')}
-
-When answering, prioritize insights from THIS project.
-"""
-    
-    base_prompt += """
-
-**RESPONSE GUIDELINES**
-1. Use EXACT project names: "Telco Customer Churn Analysis" not "Telecom project"
-2. Quote EXACT metrics: "26.54% churn rate" not "around 25%"
-3. Provide EXACT code when asked: DAX formulas, SQL queries, Python code
-4. Explain the "why" behind technical choices
-5. Link insights to business outcomes
-6. Keep responses 150-500 words (concise but thorough)
-
-**IF ASKED FOR:**
-- Code/Formulas: Provide exact snippets from projects
-- Project Details: Cite dataset size, key metrics, GitHub link
-- Comparison: Use actual numbers from multiple projects
-- Methodology: Explain exact techniques used (K-Means, ARIMA, DAX, etc.)
-- Business Impact: Reference specific outcomes ($, %, improvements)
-
-**ABSOLUTE RULES:**
-- Never say "probably" or "likely" without data
-- Never invent dataset sizes, metrics, or results
-- Never hallucinate formulas or code
-- Always ground answers in the 21 projects listed above
-- When uncertain, ask for clarification or admit gap
-"""
-    
-    return base_prompt.strip()
-
-
-def classify_user_query(query_text):
-    """
-    Classify query to determine response strategy.
-    Returns: {'type': 'code'|'metrics'|'explanation'|'comparison'|'general', 'context': {...}}
-    """
-    query_lower = query_text.lower()
-    
-    # Code extraction queries
-    code_patterns = {
-        'dax': r'\b(dax|measure|measures?)\b',
-        'sql': r'\b(sql|query|select|where|join)\b',
-        'python': r'\b(python|script|\.py|import|def|pandas|sklearn)\b',
-        'formula': r'\b(formula|equation|function)\b'
-    }
-    
-    # Metrics queries
-    metrics_patterns = r'\b(metric|rate|average|total|percentage|churn|revenue|profit)\b'
-    
-    # Comparison queries
-    comparison_patterns = r'\b(vs|versus|compare|difference|better|similar)\b'
-    
-    # Classification logic
-    for code_type, pattern in code_patterns.items():
-        if re.search(pattern, query_lower):
-            return {'type': 'code', 'language': code_type}
-    
-    if re.search(comparison_patterns, query_lower):
-        return {'type': 'comparison'}
-    
-    if re.search(metrics_patterns, query_lower):
-        return {'type': 'metrics'}
-    
-    if any(word in query_lower for word in ['explain', 'how', 'why', 'understand', 'tell me']):
-        return {'type': 'explanation'}
-    
-    return {'type': 'general'}
-
-
 def extract_code_blocks_from_readme(readme_text):
     """
     Extract fenced code blocks from README using literal regex.
@@ -211,9 +78,43 @@ def detect_requested_lang(user_text):
     return None
 
 
-def find_code_blocks_for_lang(lang):
-    """Return list of code strings matching language."""
-    blocks = st.session_state.get("code_blocks", []) or []
+def project_code_blocks(repo_url):
+    """Code blocks of a project's README from the shared code index (extracted once per README content)."""
+    readme = (load_project_card(repo_url) or {}).get("readme") if repo_url else None
+    if not readme:
+        return []
+    key = (repo_url, hashlib.sha256(readme.encode("utf-8")).hexdigest()[:16])
+    blocks = shared_caches["code"].get(key)
+    if blocks is None:
+        blocks = extract_code_blocks_from_readme(readme)
+        shared_caches["code"].set(key, blocks)
+    return [{**b, "code": content_store.intern(b.get("code"))} for b in blocks]
+
+
+@st.cache_resource(max_entries=2)
+def get_source_index(mtime):
+    """Repository source index written by source_index.py; reloaded when the file changes."""
+    from source_index import SourceIndex
+    return SourceIndex.load()
+
+
+def source_index():
+    from source_index import SOURCE_INDEX_PATH
+    try:
+        mtime = os.path.getmtime(SOURCE_INDEX_PATH)
+    except OSError:
+        mtime = 0
+    return get_source_index(mtime)
+
+
+def find_code_blocks_for_lang(lang, query=""):
+    """Return list of code strings matching language (repository source files first, README fences otherwise)."""
+    repo_url = st.session_state.get("selected_project")
+    if repo_url:
+        indexed = source_index().find(repo_url, lang, query)
+        if indexed:
+            return indexed
+    blocks = project_code_blocks(repo_url)
     
     if not lang:
         return blocks
@@ -226,20 +127,152 @@ def find_code_blocks_for_lang(lang):
     return matches
 
 
+def cached_system_prompt(kb_version, chat_mode, profile="standard"):
+    """
+    System prompt from the shared prompt cache, keyed by knowledge-base version; old versions are never hit again.
+    The selected project isn't part of it (llm_messages sends that with the question), so it stays put for a session.
+    """
+    key = (kb_version, chat_mode, profile)
+    prompt = shared_caches["prompt"].get(key)
+    if prompt is None:
+        prompt = build_intelligent_system_prompt(kb, chat_mode, None, profile)
+        shared_caches["prompt"].set(key, prompt)
+    return prompt
+
+
+def response_cache_key(kb_version, chat_mode, selected_project, user_text):
+    """Normalized key for the shared response cache (first element is the KB version)."""
+    return (kb_version, chat_mode, selected_project or "", " ".join(user_text.lower().split()))
+
+
+def degraded_answer(user_text, cached_answer=None):
+    """
+    Friendly fallback when the Groq budget is exhausted:
+    a cached answer for the same question, else the closest FAQ entry, else a retry note.
+    """
+    if cached_answer:
+        return f"{cached_answer}\n\n_(Served from cache — the assistant is busy right now.)_"
+    
+    faq = kb.faq
+    match = difflib.get_close_matches(user_text, list(faq.keys()), n=1, cutoff=0.5)
+    if match:
+        return f"**{match[0]}**\n\n{faq[match[0]]}\n\n_(Quick answer from the FAQ — the assistant is busy right now.)_"
+    
+    return "⏳ I'm handling a lot of questions right now. Please try again in a few seconds."
+
+
 # -----------------------
 # Page config
 # -----------------------
 st.set_page_config(page_title="Portfoli-AI", page_icon="🤖", layout="wide")
 
+@st.cache_resource
+def get_shared_caches():
+    """
+    One namespace per cache on the backend named by PORTFOLI_CACHE_URL (SQLite under
+    .cache/ by default), so every worker shares warm data and it survives restarts.
+    """
+    backend = open_backend()
+    return {
+        "backend": backend,
+        "cards": backend.namespace("cards"),
+        "code": backend.namespace("code"),
+        "prompt": backend.namespace("prompt"),
+        "response": backend.namespace("response", ttl=7 * 24 * 3600),
+        "tts": backend.namespace("tts", codec="bytes", ttl=30 * 24 * 3600),
+    }
+
+shared_caches = get_shared_caches()
+response_cache = shared_caches["response"]
+
+@st.cache_resource
+def get_content_store():
+    """Interned README, code, answer and HTML text shared by every session in this process."""
+    return ContentStore(max_bytes=int(float(os.getenv("PORTFOLI_CONTENT_STORE_MB", "64")) * 1024 * 1024))
+
+content_store = get_content_store()
+
+@st.cache_resource
+def get_memory_ledger():
+    """Approximate session-state bytes per session, recorded after every chat turn and every run."""
+    return MemoryLedger()
+
+memory_ledger = get_memory_ledger()
+
+def session_memory():
+    """(own, shared) bytes of this session's state; shared = interned text other sessions reuse."""
+    return approx_size({k: st.session_state[k] for k in st.session_state}, content_store)
+
+def record_session_memory():
+    memory_ledger.record(st.session_state.session_id, *session_memory())
+
+@st.cache_resource
+def get_kb_watcher():
+    """Process-wide knowledge-base holder; reloads robi_context.json when it changes."""
+    return KnowledgeBaseWatcher(poll_interval=float(os.getenv("PORTFOLI_KB_POLL", "2")))
+
+kb_watcher = get_kb_watcher()
+kb = kb_watcher.current()
+
+@st.cache_resource(max_entries=2)
+def get_metrics_table(kb_version, _kb):
+    """Normalized numeric key_metrics table, rebuilt once per knowledge-base version (pandas loads here)."""
+    from metrics_table import build_metrics_table
+    return build_metrics_table(_kb)
+
+@st.cache_resource(max_entries=2)
+def get_answer_engine(kb_version, _kb):
+    """Deterministic metrics/comparison answers; below routing.LOCAL_ANSWER_THRESHOLD we ask Groq instead."""
+    return AnswerEngine(_kb, lambda: get_metrics_table(kb_version, _kb))
+
+answer_engine = get_answer_engine(kb.version, kb)
+
+@st.cache_resource(max_entries=2)
+def get_answer_bank(kb_version):
+    """Offline-generated answers for this knowledge-base version (see answer_bank.py)."""
+    return AnswerBank.load(kb_version)
+
+answer_bank = get_answer_bank(kb.version)
+
+@st.cache_resource(max_entries=2)
+def get_project_index(kb_version, readme_keys, _kb, _readmes):
+    """Memory-mapped embedding index used to route questions to a project (numpy loads here)."""
+    from embeddings import build_project_index
+    return build_project_index(_kb, _readmes)
+
+def project_index():
+    """Index over project profiles plus README sections of every card fetched so far (rebuilt as more arrive)."""
+    cards = {url: card for url, card in card_store.cards.items() if card.get("readme")}
+    readme_keys = tuple(sorted((url, card["key"]) for url, card in cards.items()))
+    return get_project_index(kb.version, readme_keys, kb, {url: card["readme"] for url, card in cards.items()})
+
+@st.cache_resource(max_entries=2)
+def get_project_search(kb_version, _kb):
+    """Trie + trigram index over project names, categories, techniques and metrics."""
+    return ProjectSearch(_kb)
+
+project_search = get_project_search(kb.version, kb)
+
+@st.cache_resource(max_entries=2)
+def get_fact_checker(kb_version, _kb):
+    """Numbers and project names the knowledge base (and static prompt) can back up."""
+    return FactChecker(FactIndex(_kb, (static_prefix(_kb, "full")[0],)))
+
+fact_checker = get_fact_checker(kb.version, kb)
+
+@st.cache_resource
+def get_message_renderer(assistant_name):
+    """Markdown -> sanitized HTML for chat bubbles, cached on each message by content hash."""
+    return MessageRenderer(assistant_name, store=content_store)
+
+render_html = get_message_renderer(kb.assistant_name)
+
 # -----------------------
 # Session state defaults
 # -----------------------
-if "messages" not in st.session_state: st.session_state.messages = []
-if "chat_history" not in st.session_state: st.session_state.chat_history = []
 if "history" not in st.session_state: st.session_state.history = []
 if "awaiting_clear" not in st.session_state: st.session_state.awaiting_clear = False
-if "code_blocks" not in st.session_state: st.session_state.code_blocks = []
-if "response_cache" not in st.session_state: st.session_state.response_cache = {}
+if "session_id" not in st.session_state: st.session_state.session_id = os.urandom(8).hex()  # background-task inbox
 
 # -----------------------
 # Colors & links
@@ -265,440 +298,538 @@ robot_svg = """
 """
 
 # -----------------------
-# Sticky Header (EXACT - unchanged)
-# -----------------------
-st.markdown(f"""
-    <style>
-        :root {{
-          --accent: {ACCENT};
-          --hover-accent: {HOVER_ACCENT};
-        }}
-        html, body {{
-          height: 100%;
-          margin: 0;
-          padding: 0;
-          background: linear-gradient(180deg, #000814 0%, #001f3f 100%);
-          color: #e8f7ff;
-        }}
-        .sticky-header {{
-            position: fixed; top: 0; left: 0; width: 100%;
-            background: rgba(3,7,18,0.55); backdrop-filter: blur(6px);
-            z-index: 9999; padding: 0.6rem 0;
-            border-bottom: 1px solid var(--accent)33;
-        }}
-        .header-title {{
-            text-align: center; font-size: 22px; font-weight: 600;
-            color: var(--accent); text-shadow: 0 0 12px var(--accent);
-        }}
-        .clear-btn-container {{
-            position: absolute; top: 8px; right: 20px;
-        }}
-        .clear-btn {{
-            background-color:var(--accent); border:none; color:white;
-            padding:6px 12px; border-radius:10px; cursor:pointer; font-weight:600;
-            transition: all 0.18s ease-in-out;
-            box-shadow: 0 6px 20px var(--accent)33, inset 0 -2px 6px rgba(0,0,0,0.35);
-        }}
-        .clear-btn:hover {{ transform: scale(1.04); box-shadow: 0 8px 28px var(--hover-accent)44; }}
-        .spacer {{ height: 68px; }}
-    </style>
-    <div class="sticky-header">
-        <div class="header-title">🤖 Portfoli-AI — Robin Jimmichan Pooppally's Portfolio Assistant</div>
-        <div class="clear-btn-container">
-            <form action="" method="get">
-                <button class="clear-btn" name="clear" type="submit" aria-label="Clear chat">🧹 Clear Chat</button>
-            </form>
-        </div>
-    </div>
-    <div class="spacer"></div>
-""", unsafe_allow_html=True)
-
-# -----------------------
-# Global CSS (EXACT - unchanged)
-# -----------------------
-st.markdown(f"""
-<style>
-body {{ background: transparent; color:#e8f7ff; font-size:16px; line-height:1.6; scroll-behavior:smooth; }}
-h1,h2,h3 {{ color:var(--accent); text-shadow:0 0 12px var(--accent); }}
-
-@keyframes fadeInUp {{
-  0% {{ opacity: 0; transform: translateY(8px); }}
-  100% {{ opacity: 1; transform: translateY(0); }}
-}}
-@keyframes pulseGlow {{
-  0% {{ box-shadow: 0 6px 16px rgba(0,0,0,0.2), 0 0 0 0 rgba(0,191,255,0.0); }}
-  50% {{ box-shadow: 0 8px 28px rgba(0,0,0,0.25), 0 0 24px rgba(0,191,255,0.06); }}
-  100% {{ box-shadow: 0 6px 16px rgba(0,0,0,0.2), 0 0 0 0 rgba(0,191,255,0.0); }}
-}}
-.chat-bubble-user, .chat-bubble-bot {{
-  padding:12px 16px; border-radius:14px; margin:10px 0;
-  transition: background 0.22s ease, transform 0.18s ease, box-shadow 0.18s ease;
-  animation: fadeInUp .35s ease both;
-}}
-.chat-bubble-user {{
-  background: linear-gradient(180deg, rgba(0,191,255,0.06), rgba(0,191,255,0.03));
-  border: 1px solid var(--accent)33; color:#cffcff;
-  box-shadow: 0 6px 20px rgba(0,191,255,0.06), 0 1px 0 rgba(0,0,0,0.4);
-}}
-.chat-bubble-bot {{
-  background: linear-gradient(180deg, rgba(255,255,255,0.02), rgba(255,255,255,0.01));
-  border: 1px solid var(--accent)22; color:#e8f7ff;
-  box-shadow: 0 6px 18px rgba(0,0,0,0.4), 0 0 8px rgba(0,191,255,0.02) inset;
-}}
-
-button.stButton>button {{
-  border-radius:10px; transition: all 0.18s ease-in-out;
-  border: 1px solid var(--accent)22;
-  background: linear-gradient(180deg, rgba(255,255,255,0.02), rgba(255,255,255,0.00));
-}}
-button.stButton>button:hover {{
-  transform: translateY(-2px);
-  box-shadow: 0 10px 30px var(--accent)22;
-  border-color: var(--hover-accent);
-  background: linear-gradient(180deg, rgba(0,191,255,0.1), rgba(0,191,255,0.05));
-}}
-
-.stSelectbox [data-baseweb="select"], select {{
-  border-color: var(--accent) !important; box-shadow: 0 0 18px var(--accent)15 !important;
-  accent-color: var(--accent);
-}}
-input[type="radio"], input[type="checkbox"], select {{
-  accent-color: var(--accent);
-}}
-
-/* Radio button blue styling */
-[data-testid="stRadio"] {{
-  color: var(--accent);
-}}
-[data-testid="stRadio"] label {{
-  color: #e8f7ff;
-}}
-[data-testid="stRadio"] [role="radio"] {{
-  accent-color: var(--accent) !important;
-  border-color: var(--accent) !important;
-}}
-[data-testid="stRadio"] input[type="radio"] {{
-  accent-color: var(--accent) !important;
-}}
-
-/* Category buttons - remove red on hover/select */
-button {{
-  background-color: transparent !important;
-}}
-button:hover {{
-  background-color: rgba(0, 191, 255, 0.1) !important;
-  border-color: var(--accent) !important;
-  color: var(--accent) !important;
-}}
-button:focus {{
-  background-color: rgba(0, 191, 255, 0.1) !important;
-  border-color: var(--accent) !important;
-  color: var(--accent) !important;
-}}
-button[kind="secondary"]:hover {{
-  background-color: rgba(0, 191, 255, 0.15) !important;
-  border: 1px solid var(--accent) !important;
-  color: var(--accent) !important;
-}}
-.stSelectbox {{
-  color: #e8f7ff;
-}}
-.stSelectbox [data-baseweb="select"] {{
-  border: 1px solid var(--accent) !important;
-  box-shadow: 0 0 18px var(--accent)15 !important;
-}}
-.stSelectbox svg {{
-  fill: var(--accent) !important;
-}}
-
-.selected-project-label {{ color: var(--accent); font-weight:700; }}
-
-.code-bubble {{
-  background: rgba(3,8,15,0.9);
-  border-left: 3px solid var(--accent);
-  padding: 12px;
-  margin: 8px 0;
-  border-radius: 10px;
-  font-family: monospace;
-  white-space: pre-wrap;
-  overflow-x: auto;
-}}
-
-.social-row {{
-  display:flex; gap:10px; align-items:center; margin-top:8px;
-}}
-.social-btn {{
-  display:inline-flex; align-items:center; justify-content:center;
-  width:36px; height:36px; border-radius:999px;
-  border:1px solid var(--accent)33; background: rgba(255,255,255,0.008);
-  box-shadow: 0 6px 18px rgba(0,0,0,0.55);
-  transition: all .18s ease-in-out;
-}}
-.social-btn:hover {{
-  transform: translateY(-3px);
-  box-shadow: 0 10px 32px rgba(0,191,255,0.08);
-  border-color: var(--hover-accent);
-}}
-.social-btn svg {{
-  width:18px; height:18px; display:block;
-  stroke: var(--accent); fill: none; stroke-width:1.6; stroke-linecap:round; stroke-linejoin:round;
-}}
-.sidebar-robot svg {{ width:44px; height:44px; stroke: var(--accent); fill: none; stroke-width:1.6; }}
-
-.footer-icons {{
-  display:flex; gap:12px; align-items:center; justify-content:flex-start;
-  padding: 10px 6px;
-}}
-.footer-icon-btn {{
-  display:inline-flex; align-items:center; justify-content:center;
-  width:40px; height:40px; border-radius:10px;
-  border:1px solid var(--accent)22; background: rgba(0,0,0,0.18);
-  box-shadow: 0 6px 18px rgba(0,0,0,0.5);
-  transition: all .22s ease-in-out;
-}}
-.footer-icon-btn:hover {{
-  transform: translateY(-4px) scale(1.02);
-  box-shadow: 0 14px 36px rgba(0,191,255,0.12), 0 0 28px rgba(0,191,255,0.06);
-  border-color: var(--hover-accent);
-  animation: pulseGlow 1.6s ease-in-out 1;
-}}
-.footer-icon-btn svg {{ width:18px; height:18px; stroke: var(--accent); fill:none; stroke-width:1.6; }}
-
-@media (max-width: 600px) {{
-  .header-title {{ font-size: 18px; }}
-  .footer-icons {{ gap:10px; }}
-}}
-</style>
-""", unsafe_allow_html=True)
-
+# Sticky Header (EXACT - unchanged markup; CSS lives in static/style.css)
 # -----------------------
-# Sidebar (EXACT - unchanged structure, enhanced logic)
-# -----------------------
-st.sidebar.markdown(
-    f"""
-    <div style='display:flex;align-items:center;gap:12px;'>
-      <div class='sidebar-robot'>{robot_svg}</div>
-      <div style='line-height:1;'>
-        <div style='font-weight:700;color:{ACCENT};'>🤖 Built by Robin Jimmichan P</div>
-        <div style='font-size:12px;color:#bfefff;margin-top:2px;'>Portfolio Assistant</div>
-      </div>
+HEADER_HTML = """
+<div class="sticky-header">
+    <div class="header-title">🤖 Portfoli-AI — Robin Jimmichan Pooppally's Portfolio Assistant</div>
+    <div class="clear-btn-container">
+        <form action="" method="get">
+            <button class="clear-btn" name="clear" type="submit" aria-label="Clear chat">🧹 Clear Chat</button>
+        </form>
     </div>
-    """,
-    unsafe_allow_html=True,
-)
+</div>
+<div class="spacer"></div>
+"""
 
-# Controls section
-st.sidebar.markdown("<div class='section-card'>", unsafe_allow_html=True)
-st.sidebar.markdown("### ⚙️ Controls")
-tts_sidebar = st.sidebar.checkbox("🔊 Play responses (TTS)", key="tts_sidebar", value=False)
-
-if st.sidebar.button("🧹 Clear Chat History"):
-    st.session_state.awaiting_clear = True
-
-if st.session_state.get("awaiting_clear", False):
-    st.sidebar.warning("Are you sure? This cannot be undone.")
-    c1, c2 = st.sidebar.columns(2)
-    if c1.button("Yes, clear"):
-        st.session_state.history = []
-        st.session_state.messages = []
-        st.session_state.chat_history = []
-        st.session_state.awaiting_clear = False
-        st.rerun()
-    if c2.button("No, cancel"):
-        st.session_state.awaiting_clear = False
+@st.cache_resource
+def load_css():
+    """static/style.css, read once per process (inlined only when static serving is off)."""
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), "static", "style.css"), encoding="utf-8") as f:
+        return f.read()
 
-if st.sidebar.button("💾 Save Chat History"):
-    history_json = json.dumps(st.session_state.get("history", []), indent=2)
-    st.sidebar.download_button("Download JSON", history_json, file_name="chat_history.json", mime="application/json")
+if st.get_option("server.enableStaticServing"):
+    # The browser fetches and caches the stylesheet; reruns only resend this tag
+    st.markdown('<link rel="stylesheet" href="app/static/style.css">', unsafe_allow_html=True)
+else:
+    st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
+st.markdown(HEADER_HTML, unsafe_allow_html=True)
 
-st.sidebar.markdown("</div>", unsafe_allow_html=True)
+# -----------------------
+# Groq initialization
+# -----------------------
+GROQ_MODEL = "llama-3.3-70b-versatile"
+
+@st.cache_resource
+def init_groq(api_key):
+    """One Groq client per process, reused by every rerun and session; the SDK loads on the first call."""
+    return LazyGroq(api_key)
+
+try:
+    api_key = st.secrets.get("GROQ_API_KEY")
+except Exception:
+    api_key = None  # no secrets.toml at all (e.g. containers configured through the environment)
+api_key = api_key or os.getenv("GROQ_API_KEY")
+if not api_key:
+    st.error("Missing Groq API key. Add GROQ_API_KEY to Streamlit secrets.")
+    st.stop()
+try:
+    client = init_groq(api_key)
+except Exception as e:
+    st.error(f"Failed to initialize Groq: {e}")
+    st.stop()
+
+@st.cache_resource
+def get_groq_budget():
+    """Process-wide request/token budget shared by every session."""
+    return GroqBudget(
+        requests_per_min=int(os.getenv("GROQ_RPM", "30")),
+        tokens_per_min=int(os.getenv("GROQ_TPM", "6000")),
+        max_wait=float(os.getenv("GROQ_MAX_WAIT", "8")),
+    )
+
+budget = get_groq_budget()
+
+@st.cache_resource
+def get_prefix_registry():
+    """Process-wide record of static prompt prefixes sent to Groq."""
+    return PrefixRegistry()
+
+prefix_registry = get_prefix_registry()
+
+COMPARISON_TOKENS = int(os.getenv("PORTFOLI_COMPARISON_TOKENS", "1500"))
+MAX_COMPLETION_TOKENS = 800
+# Optional cap on the static prefix size (prefill latency grows with it); unset = no cap
+PROMPT_TOKEN_CAP = int(os.environ["PORTFOLI_PROMPT_TOKENS"]) if os.getenv("PORTFOLI_PROMPT_TOKENS") else None
+
+def llm_messages(user_input, chat_mode, target_project, history, pin_profile=True):
+    """
+    Chat messages for Groq: system prompt, recent turns, and question-specific context (selected
+    project, normalized metric rows, comparison excerpts) in a system message just before the
+    question, so everything earlier repeats the previous request verbatim.
+    With `pin_profile`, the session's prompt profile only steps up (see prompts.py); prefetches
+    for questions nobody asked yet leave it alone.
+    """
+    query_type = classify_user_query(user_input)['type']
+    # Portfolio detail scales with the question; a tight budget or latency cap steps it down
+    floor = st.session_state.get("prompt_profile") if pin_profile else None
+    profile = choose_profile(kb, query_type, budget.tokens_available() - MAX_COMPLETION_TOKENS, PROMPT_TOKEN_CAP, floor)
+    if pin_profile:
+        st.session_state.prompt_profile = profile
+    system_prompt = cached_system_prompt(kb.version, chat_mode, profile)
+    context = []
+    
+    # The project the question is about changes from turn to turn, so it travels with the question
+    if target_project in kb.by_url:
+        context.append(project_section(kb, target_project).strip())
+    
+    # Numeric questions the table couldn't settle still get the normalized rows
+    if query_type in ('metrics', 'comparison'):
+        metric_rows = get_metrics_table(kb.version, kb).prompt_rows(user_input)
+        if metric_rows:
+            context.append(f"**RELEVANT METRICS (normalized)**\n{metric_rows}")
+    
+    # Questions spanning several projects get README excerpts for each, not just the selected one
+    # ("compare ... vs Python segmentation" classifies as 'code', so the mentions decide)
+    projects = answer_engine.mentioned_projects(user_input)
+    if query_type == 'comparison' and len(projects) == 1 and kb.by_url.get(target_project) not in (None, projects[0]):
+        projects.insert(0, kb.by_url[target_project])
+    if len(projects) >= 2:
+        from project_context import comparison_context
+        context.append(comparison_context(card_store, projects, user_input, COMPARISON_TOKENS))
+    
+    turns = [{"role": ("user" if h["role"] == "user" else "assistant"), "content": h["content"]} for h in history]
+    if context:
+        at = len(turns) - 1 if turns and turns[-1]["role"] == "user" else len(turns)
+        turns.insert(at, {"role": "system", "content": "\n\n".join(context)})
+    return [{"role": "system", "content": system_prompt}, *turns]
+
+def groq_complete(messages):
+    """One chat completion; returns (text, usage). Safe to call from worker threads."""
+    profile, prefix_text, prefix_hash = prefix_profile(kb, messages[0]["content"])
+    if prefix_hash:
+        prefix_registry.record(prefix_hash, len(prefix_text), profile)
+    completion = client.chat.completions.create(
+        model=GROQ_MODEL,
+        messages=messages,
+        temperature=0.25,
+        max_tokens=MAX_COMPLETION_TOKENS
+    )
+    return completion.choices[0].message.content.strip(), getattr(completion, "usage", None)
 
-# Portfolio overview
-st.sidebar.markdown("<div class='section-card'>", unsafe_allow_html=True)
-st.sidebar.markdown("### 📊 Portfolio Overview")
-for k, v in context.get("summary", {}).items():
-    st.sidebar.markdown(f"- **{k}**: {v}")
-st.sidebar.markdown("</div>", unsafe_allow_html=True)
+# -----------------------
+# Speculative pre-generation (optional; PORTFOLI_PREFETCH=1)
+# -----------------------
+@st.cache_resource
+def get_prefetcher():
+    """Process-wide pre-generated answers for likely first questions, or None if disabled."""
+    if os.getenv("PORTFOLI_PREFETCH", "0") != "1":
+        return None
+    return SpeculativeCache(
+        groq_complete,
+        budget,
+        tokens_per_hour=int(os.getenv("PORTFOLI_PREFETCH_TOKENS", "20000")),
+    )
+
+prefetcher = get_prefetcher()
+FOLLOWUP_PROMPTS = followup_prompts()
+
+def schedule_followups(project_url, chat_mode):
+    """Pre-generate the likely first questions for a freshly selected project (history is empty then)."""
+    if prefetcher is None or not project_url:
+        return
+    for prompt in FOLLOWUP_PROMPTS:
+        # Questions the local engine or README code answers never reach Groq
+        query_type = classify_user_query(prompt)['type']
+        if query_type == 'code' or confident_local_answer(answer_engine, prompt, query_type, project_url):
+            continue
+        key = response_cache_key(kb.version, chat_mode, project_url, prompt)
+        prefetcher.schedule(key, llm_messages(prompt, chat_mode, project_url, [{"role": "user", "content": prompt}], pin_profile=False))
 
 # -----------------------
-# Projects & Filtering (EXACT - unchanged)
+# Background side effects (TTS, persistence, cache writes)
 # -----------------------
-projects_by_cat = context.get("projects_detailed", {})
-all_projects = []
-for cat, d in projects_by_cat.items():
-    for pname, repo_data in d.items():
-        all_projects.append((cat, pname, repo_data.get('url')))
-
-st.markdown("### 🔎 Filter by category")
-cols = st.columns(4)
-cats = list(projects_by_cat.keys())
-ordered = [c for c in ["Excel", "Power BI", "Python", "SQL"] if c in cats] or cats
-selected_cat = None
-for i, cat in enumerate(ordered):
-    if cols[i % 4].button(cat):
-        selected_cat = cat
-
-if "selected_category" not in st.session_state:
-    st.session_state.selected_category = "All"
-if selected_cat:
-    st.session_state.selected_category = selected_cat
+@st.cache_resource
+def get_background_tasks():
+    """Process-wide bounded executor; results reach the session through background_inbox()."""
+    return BackgroundTasks(workers=int(os.getenv("PORTFOLI_BACKGROUND_WORKERS", "2")))
 
-if st.session_state.get("selected_category", "All") == "All":
-    st.markdown("Showing projects: **All categories**")
-else:
-    st.markdown(f"Showing projects: <span class='selected-project-label'>**{st.session_state['selected_category']}**</span>", unsafe_allow_html=True)
+background = get_background_tasks()
 
-def build_project_list(filter_cat):
-    choices = []
-    for cat, pname, repo in all_projects:
-        if filter_cat in (None, "All") or cat == filter_cat:
-            choices.append(f"{cat} — {pname}")
-    return choices
-
-project_choices = build_project_list(st.session_state.get("selected_category", "All"))
-if not project_choices:
-    st.info("No projects in this category.")
-    project_choice = None
-else:
-    project_choice = st.selectbox("Choose a project to explore", ["(none)"] + project_choices)
+# -----------------------
+# Semantic response cache (paraphrases reuse an earlier Groq answer)
+# -----------------------
+SEMANTIC_CACHE = os.getenv("PORTFOLI_SEMANTIC_CACHE", "1") == "1"
 
-st.markdown("---")
-mode = st.radio("Chat mode", ("General Assistant", "Business Analytics Assistant"), horizontal=True)
-if "chat_mode" not in st.session_state or st.session_state.get("chat_mode") != mode:
-    st.session_state.chat_mode = mode
-    st.session_state.history = []
+@st.cache_resource(max_entries=2)
+def get_semantic_cache(kb_version, _kb):
+    """
+    Process-wide nearest-neighbour answer cache over local embeddings (numpy loads here).
+    With the default hashing embedder it catches rewordings; PORTFOLI_EMBED_MODEL catches looser paraphrases.
+    """
+    from embeddings import get_embedder
+    from semantic_cache import SemanticCache
+    entities = set(project_search.word_df) | {w for c in _kb.categories for w in c.lower().split()}
+    return SemanticCache(
+        get_embedder(),
+        threshold=float(os.getenv("PORTFOLI_SEMANTIC_THRESHOLD", "0.85")),
+        sample_rate=float(os.getenv("PORTFOLI_SEMANTIC_SAMPLE", "0.05")),
+        entities=entities,
+    )
+
+def semantic_reusable(user_input, history):
+    """Only self-contained questions: an answer given mid-conversation may lean on earlier turns."""
+    from semantic_cache import is_followup
+    return SEMANTIC_CACHE and (len(history) == 1 or not is_followup(user_input))
+
+def audit_semantic_hit(messages, user_input, cached_text, estimated):
+    """Re-ask a sampled hit in the background, on spare budget only, and score how well the answers agree."""
+    if not budget.acquire_spare(estimated):
+        return
+    cache = get_semantic_cache(kb.version, kb)
+
+    def run():
+        fresh, usage = groq_complete(messages)
+        budget.record_usage(usage, estimated)
+        return cache.audit(user_input, cached_text, fresh)
+
+    background.submit("semantic_audit", run)
 
 # -----------------------
-# Groq initialization
+# Project cards (README previews pre-rendered; see project_cards.py)
 # -----------------------
-def init_groq():
-    api_key = st.secrets.get("GROQ_API_KEY") if "GROQ_API_KEY" in st.secrets else os.getenv("GROQ_API_KEY")
-    if not api_key:
-        st.error("Missing Groq API key. Add GROQ_API_KEY to Streamlit secrets.")
-        st.stop()
+@st.cache_resource(max_entries=2)
+def get_card_store(kb_version, _kb):
+    """Rendered cards for every project: .cache/project_cards.json, backed by the shared card cache."""
+    return ProjectCardStore(_kb, cache=shared_caches["cards"], store=content_store)
+
+card_store = get_card_store(kb.version, kb)
+
+def save_cards():
     try:
-        return Groq(api_key=api_key)
-    except Exception as e:
-        st.error(f"Failed to initialize Groq: {e}")
-        st.stop()
-
-client = init_groq()
-
-# -----------------------
-# README fetch helper
-# -----------------------
-def extract_owner_repo(repo_url):
-    parsed = urlparse(repo_url)
-    parts = parsed.path.strip("/").split("/")
-    if len(parts) >= 2:
-        return parts[0], parts[1]
-    return None, None
-
-def fetch_readme_lines(repo_url, max_lines=20):
-    owner, repo = extract_owner_repo(repo_url)
-    if not owner: return None, "Invalid repo URL"
-    raw_main = f"https://raw.githubusercontent.com/{owner}/{repo}/main/README.md"
-    raw_master = f"https://raw.githubusercontent.com/{owner}/{repo}/master/README.md"
-    headers = {"Accept": "application/vnd.github.v3.raw"}
-    for url in (raw_main, raw_master):
-        try:
-            r = requests.get(url, headers=headers, timeout=8)
-            if r.status_code == 200 and r.text.strip():
-                lines = r.text.splitlines()
-                preview = "\n".join(lines[:max_lines])
-                full = r.text
-                return preview, full
-        except Exception:
-            continue
-    return None, None
+        card_store.save()
+    except OSError:
+        pass
+
+def load_project_card(repo_url):
+    """Card for repo_url: a dict lookup, fetching and rendering only on a cold miss."""
+    card = card_store.get(repo_url)
+    if card is None:
+        card = card_store.refresh(repo_url)
+        background.submit("persist", save_cards, key="card_store.save")  # one queued save covers every miss
+    return card
 
 # -----------------------
 # TTS helper
 # -----------------------
-def speak_text(text):
-    try:
+def synthesize_speech(text):
+    """gTTS audio for text, stored in the shared TTS cache; returns its cache key. Runs on a background thread."""
+    key = hashlib.sha256(text.encode("utf-8")).hexdigest()
+    if shared_caches["tts"].get(key) is None:
+        from gtts import gTTS  # deferred: only needed once TTS is switched on
+        from io import BytesIO
         tts = gTTS(text=text, lang="en", slow=False)
         buf = BytesIO()
         tts.write_to_fp(buf)
-        buf.seek(0)
-        st.audio(buf.read(), format="audio/mp3")
-    except Exception as e:
-        st.warning("TTS unavailable: " + str(e))
+        shared_caches["tts"].set(key, buf.getvalue())
+    return key
+
+def speak_text(text, message):
+    """Queue TTS for an answer; the audio is attached to `message` when background_inbox() delivers it."""
+    background.submit("tts", synthesize_speech, text, session=st.session_state.session_id, tag=message["ts"])
 
 # -----------------------
-# Project selection & README loading
+# Sidebar (EXACT - unchanged structure, enhanced logic)
 # -----------------------
+# The page is split into fragments (sidebar controls, project browser, chat pane)
+# that rerun independently; shared state goes through st.session_state and the
+# cached resources above. Anything that changes what another fragment shows
+# (clearing chat, picking a project) triggers a full st.rerun().
+st.sidebar.markdown(
+    f"""
+    <div style='display:flex;align-items:center;gap:12px;'>
+      <div class='sidebar-robot'>{robot_svg}</div>
+      <div style='line-height:1;'>
+        <div style='font-weight:700;color:{ACCENT};'>🤖 Built by Robin Jimmichan P</div>
+        <div style='font-size:12px;color:#bfefff;margin-top:2px;'>Portfolio Assistant</div>
+      </div>
+    </div>
+    """,
+    unsafe_allow_html=True,
+)
+
+def import_conversation():
+    """file_uploader callback: restore history, mode and project, and keep its answers as this session's fallbacks."""
+    uploaded = st.session_state.get("import_file")
+    if uploaded is None:
+        return
+    try:
+        header, messages = read_conversation(uploaded)
+        imported = list(messages)
+    except (ValueError, OSError) as e:
+        st.session_state.import_error = f"Couldn't import that file: {e}"
+        return
+    st.session_state.import_error = None
+    
+    mode = header.get("chat_mode")
+    if mode in CHAT_MODES:
+        st.session_state.chat_mode = st.session_state.chat_mode_radio = mode
+    # The project selectbox must agree, or project_browser() sees a new pick and clears the history
+    project = header.get("selected_project")
+    if project in kb.by_url:
+        st.session_state.selected_project = project
+        pick_project(project)
+    else:
+        st.session_state.selected_project = None
+        st.session_state.project_choice = "(none)"
+    st.session_state.history[:] = imported
+    
+    # Uploaded text is untrusted: its answers stay in this session and never reach the shared response cache
+    imported_answers = {}
+    if header.get("kb_version") == kb.version:
+        chat_mode = st.session_state.get("chat_mode", CHAT_MODES[0])
+        for question, answer in zip(imported, imported[1:]):
+            if question["role"] == "user" and answer["role"] == "assistant" and answer.get("source") in ("groq", "bank", "prefetch"):
+                key = response_cache_key(kb.version, chat_mode, answer.get("project"), question["content"])
+                imported_answers[key] = answer["content"]
+    st.session_state.imported_answers = imported_answers
+    st.session_state.conversation_imported = True
+
+@st.fragment
+def sidebar_controls():
+    # Controls section
+    st.markdown("<div class='section-card'>", unsafe_allow_html=True)
+    st.markdown("### ⚙️ Controls")
+    st.checkbox("🔊 Play responses (TTS)", key="tts_sidebar", value=False)
+    
+    if st.button("🧹 Clear Chat History"):
+        st.session_state.awaiting_clear = True
+    
+    if st.session_state.get("awaiting_clear", False):
+        st.warning("Are you sure? This cannot be undone.")
+        c1, c2 = st.columns(2)
+        if c1.button("Yes, clear"):
+            st.session_state.history.clear()
+            st.session_state.awaiting_clear = False
+            st.rerun()
+        if c2.button("No, cancel"):
+            st.session_state.awaiting_clear = False
+    
+    # History is only ever cleared in place, so the export callable always sees the live list
+    history = st.session_state.history
+    meta = {
+        "kb_version": kb.version,
+        "chat_mode": st.session_state.get("chat_mode"),
+        "selected_project": st.session_state.get("selected_project"),
+    }
+    st.download_button(
+        "💾 Save Chat History",
+        data=lambda: export_conversation(history, meta),
+        file_name="chat_history.ndjson.gz",
+        mime="application/gzip",
+    )
+    
+    st.file_uploader("📂 Import Chat History", type=["gz", "ndjson", "jsonl"], key="import_file", on_change=import_conversation)
+    if st.session_state.get("import_error"):
+        st.error(st.session_state.import_error)
+    if st.session_state.pop("conversation_imported", False):
+        # The chat pane and project card live outside this fragment
+        st.rerun()
+    
+    st.markdown("</div>", unsafe_allow_html=True)
+    
+    # Portfolio overview
+    st.markdown("<div class='section-card'>", unsafe_allow_html=True)
+    st.markdown("### 📊 Portfolio Overview")
+    for k, v in kb.summary.items():
+        st.markdown(f"- **{k}**: {v}")
+    st.markdown("</div>", unsafe_allow_html=True)
+
+with st.sidebar:
+    sidebar_controls()
+
+# -----------------------
+# Projects & Filtering (EXACT - unchanged)
+# -----------------------
+if "selected_category" not in st.session_state: st.session_state.selected_category = "All"
 if "selected_project" not in st.session_state: st.session_state.selected_project = None
-if "readme_full" not in st.session_state: st.session_state.readme_full = None
-if "readme_preview" not in st.session_state: st.session_state.readme_preview = None
 if "show_more" not in st.session_state: st.session_state.show_more = False
 
-if project_choice and project_choice != "(none)":
-    cat, pname = project_choice.split(" — ", 1)
-    repo_url = None
-    for c, name, r in all_projects:
-        if c == cat and name == pname:
-            repo_url = r
-            break
-    
-    if st.session_state.get("selected_project") != repo_url:
-        st.session_state.selected_project = repo_url
-        st.session_state.history = []
-        st.session_state.readme_preview, st.session_state.readme_full = fetch_readme_lines(repo_url, max_lines=20)
-        st.session_state.code_blocks = extract_code_blocks_from_readme(st.session_state.readme_full)
-        st.session_state.show_more = False
-
-# Display selected project card
-if st.session_state.get("selected_project"):
-    repo_url = st.session_state.selected_project
-    card_cat = card_name = None
-    for c, name, r in all_projects:
-        if r == repo_url:
-            card_cat, card_name = c, name
-            break
+def build_project_list(filter_cat):
+    return [p.label for p in kb.projects_in(filter_cat)]
+
+def pick_project(repo_url):
+    """Point the project selectbox at a project (widget callbacks only: runs before it is drawn)."""
+    st.session_state.selected_category = "All"
+    st.session_state.project_choice = kb.by_url[repo_url].label
+    st.session_state.quick_find_suggestions = []
+    st.session_state.quick_find_query = None
+
+def quick_find():
+    """Quick-find callback: exact label, else a typo-tolerant match, else suggestions to pick from."""
+    text = st.session_state.quick_find_box
+    st.session_state.quick_find_box = None
+    if not text:
+        return
+    project = kb.by_label.get(text) or kb.by_url.get(project_search.resolve(text))
+    if project:
+        pick_project(project.url)
+    else:
+        st.session_state.quick_find_suggestions = [p.url for p in project_search.suggest(text)]
+        st.session_state.quick_find_query = text
+
+@st.fragment
+def project_browser():
+    # The browser filters the options as you type; free text goes through project_search
+    st.selectbox(
+        "Quick find", list(kb.by_label), index=None, key="quick_find_box", on_change=quick_find,
+        accept_new_options=True, placeholder="Type a project, technique or metric (typos are fine)…",
+    )
+    suggestions = st.session_state.get("quick_find_suggestions")
+    if suggestions:
+        st.caption(f"Projects matching “{st.session_state.get('quick_find_query', '')}”:")
+        cols = st.columns(min(len(suggestions), 3))
+        for i, url in enumerate(suggestions):
+            cols[i % 3].button(kb.by_url[url].name, key=f"suggest_{i}", on_click=pick_project, args=(url,))
+    elif suggestions is not None and st.session_state.get("quick_find_query"):
+        st.caption("No matching projects.")
     
-    st.markdown("<div class='section-card'>", unsafe_allow_html=True)
-    st.markdown(f"### 📁 {card_name}")
-    st.markdown(f"**Category:** {card_cat}  ")
-    st.markdown(f"🔗 **Repo:** [{repo_url}]({repo_url})")
-    if st.session_state.get("readme_preview"):
-        st.markdown("---")
-        st.markdown("**README preview:**")
-        st.code(st.session_state["readme_preview"], language="markdown")
-        if st.session_state.get("readme_full"):
+    st.markdown("### 🔎 Filter by category")
+    cols = st.columns(4)
+    cats = list(kb.categories)
+    ordered = [c for c in ["Excel", "Power BI", "Python", "SQL"] if c in cats] or cats
+    selected_cat = None
+    for i, cat in enumerate(ordered):
+        if cols[i % 4].button(cat):
+            selected_cat = cat
+    
+    if selected_cat:
+        st.session_state.selected_category = selected_cat
+    
+    if st.session_state.get("selected_category", "All") == "All":
+        st.markdown("Showing projects: **All categories**")
+    else:
+        st.markdown(f"Showing projects: <span class='selected-project-label'>**{st.session_state['selected_category']}**</span>", unsafe_allow_html=True)
+    
+    project_choices = build_project_list(st.session_state.get("selected_category", "All"))
+    if not project_choices:
+        st.info("No projects in this category.")
+        project_choice = None
+    else:
+        project_choice = st.selectbox("Choose a project to explore", ["(none)"] + project_choices, key="project_choice")
+    
+    # Project selection & README loading
+    if project_choice and project_choice != "(none)":
+        repo_url = kb.by_label[project_choice].url
+        
+        if st.session_state.get("selected_project") != repo_url:
+            st.session_state.selected_project = repo_url
+            st.session_state.history.clear()
+            load_project_card(repo_url)  # warm the shared card cache before the rerun
+            st.session_state.show_more = False
+            schedule_followups(repo_url, st.session_state.get("chat_mode", CHAT_MODES[0]))
+            # The chat pane depends on the selected project
+            st.rerun()
+    
+    # Display selected project card
+    if st.session_state.get("selected_project"):
+        repo_url = st.session_state.selected_project
+        card = load_project_card(repo_url) or {}
+        
+        st.markdown("<div class='section-card'>", unsafe_allow_html=True)
+        if card.get("markdown"):
+            st.markdown(card["markdown"])
+        if card.get("readme"):
             if st.button("Show more" if not st.session_state.show_more else "Show less"):
                 st.session_state.show_more = not st.session_state.show_more
             if st.session_state.show_more:
                 st.markdown("<details open><summary>Full README</summary>", unsafe_allow_html=True)
-                st.code(st.session_state["readme_full"], language="markdown")
+                st.code(card["readme"], language="markdown")
                 st.markdown("</details>", unsafe_allow_html=True)
-    else:
-        st.info("No README found for this repository.")
-    st.markdown("</div>", unsafe_allow_html=True)
+        else:
+            st.info("No README found for this repository.")
+        st.markdown("</div>", unsafe_allow_html=True)
+
+project_browser()
 
 st.markdown("---")
 
 # -----------------------
 # Display chat history
 # -----------------------
-for m in st.session_state.history:
-    role, text = m.get("role"), m.get("content")
-    if role == "user":
-        st.markdown(f"<div class='chat-bubble-user' aria-label='User message'><b>You:</b> {text}</div>", unsafe_allow_html=True)
+# Only the most recent messages are rendered on each rerun; older ones stay
+# collapsed so rerun time and payload don't grow with the conversation.
+HISTORY_WINDOW = int(os.getenv("PORTFOLI_HISTORY_WINDOW", "12"))
+
+def add_message(role, content, **meta):
+    """Append to the history with a timestamp (plus source/model/latency/usage for answers)."""
+    st.session_state.history.append({"role": role, "content": content_store.intern(content), "ts": round(time.time(), 3), **meta})
+    return st.session_state.history[-1]
+
+def render_message(m):
+    # HTML is built once per message (escaped, code highlighted) and reused on every rerun
+    st.html(render_html(m))
+
+if "show_full_history" not in st.session_state: st.session_state.show_full_history = False
+
+def render_history():
+    history = st.session_state.history
+    hidden = 0 if st.session_state.show_full_history else max(len(history) - HISTORY_WINDOW, 0)
+    if len(history) > HISTORY_WINDOW:
+        label = f"⬆️ Show {hidden} earlier messages" if hidden else "⬇️ Collapse earlier messages"
+        if st.button(label, key="toggle_full_history"):
+            st.session_state.show_full_history = not st.session_state.show_full_history
+            st.rerun(scope="fragment")
+    for m in history[hidden:]:
+        render_message(m)
+    if history:
+        render_audio(history[-1])
+
+def render_audio(m):
+    """Audio for the latest answer (autoplays once), or why there is none."""
+    if m.get("_tts_error"):
+        st.warning("TTS unavailable: " + m["_tts_error"])
+    elif m.get("_tts"):
+        audio = shared_caches["tts"].get(m["_tts"])
+        if audio:
+            st.audio(audio, format="audio/mp3", autoplay=not m.get("_tts_played"))
+            m["_tts_played"] = True
+
+@st.fragment(run_every="1s")
+def background_inbox():
+    """Polls this session's background results; only drawn while some are outstanding."""
+    session = st.session_state.session_id
+    by_ts = {m.get("ts"): m for m in st.session_state.history}
+    for kind, tag, result, error in background.collect(session):
+        m = by_ts.get(tag)
+        if kind == "tts" and m is not None:
+            if error:
+                m["_tts_error"] = "the speech service is busy, try again shortly" if error == "busy" else error
+            else:
+                m["_tts"] = result
+    if background.pending(session):
+        st.caption("🔊 Preparing audio…")
     else:
-        st.markdown(f"<div class='chat-bubble-bot' aria-label='Assistant message'><b>{context.get('assistant_name','Portfoli-AI')}:</b> {text}</div>", unsafe_allow_html=True)
+        st.rerun()  # show the audio in the chat pane; this fragment isn't drawn again, so polling stops
 
 # -----------------------
 # Chat input & processing
 # -----------------------
-tts_toggle = st.session_state.get("tts_sidebar", False)
-
-user_input = st.chat_input("Type your message and press Enter...")
-
-if user_input:
+def handle_user_input(user_input):
+    tts_toggle = st.session_state.get("tts_sidebar", False)
+    
     # Add to history immediately
-    st.session_state.history.append({"role": "user", "content": user_input})
-    st.markdown(f"<div class='chat-bubble-user' aria-label='User message'><b>You:</b> {user_input}</div>", unsafe_allow_html=True)
+    render_message(add_message("user", user_input))
     
     # Classify query for intelligent routing
     query_classification = classify_user_query(user_input)
@@ -706,57 +837,196 @@ if user_input:
     code_matches = []
     
     if requested_lang:
-        code_matches = find_code_blocks_for_lang(requested_lang)
+        code_matches = find_code_blocks_for_lang(requested_lang, user_input)
+    
+    show_code = requested_lang and code_matches and query_classification['type'] == 'code'
+    
+    # Metrics/comparison questions are answered locally and exactly when confident enough
+    local_answer = None
+    if not show_code:
+        local_answer = confident_local_answer(answer_engine, user_input, query_classification['type'], st.session_state.get("selected_project"))
     
     # If user explicitly asked for code and we have matches
-    if requested_lang and code_matches and query_classification['type'] == 'code':
-        st.markdown(f"<div class='code-bubble'><b>Exact `{requested_lang}` snippet(s) from README:</b>\n\n", unsafe_allow_html=True)
+    if show_code:
+        # Indexed blocks carry the file they came from; README fences don't
+        from_repo = bool(code_matches[0].get("path"))
+        origin = "the repository" if from_repo else "README"
+        st.markdown(f"<div class='code-bubble'><b>Exact `{requested_lang}` snippet(s) from {origin}:</b>\n\n", unsafe_allow_html=True)
         for idx, blk in enumerate(code_matches[:5], start=1):
             lang_label = blk.get("lang") or "code"
             code_text = blk.get("code", "")
-            st.markdown(f"<div class='code-bubble'><b>Snippet {idx} — {lang_label}</b>\n\n```{lang_label}\n{code_text}\n```</div>", unsafe_allow_html=True)
+            where = f" · `{blk['path']}`" if blk.get("path") else ""
+            where += f" ({blk['symbol']})" if blk.get("symbol") else ""
+            st.markdown(f"<div class='code-bubble'><b>Snippet {idx} — {lang_label}{where}</b>\n\n```{lang_label}\n{code_text}\n```</div>", unsafe_allow_html=True)
         
-        st.session_state.history.append({"role": "assistant", "content": f"Displayed {len(code_matches[:5])} {requested_lang} snippet(s) from README."})
+        shown = add_message("assistant", f"Displayed {len(code_matches[:5])} {requested_lang} snippet(s) from {origin}.", source="repository" if from_repo else "readme")
         
         if tts_toggle:
-            speak_text(f"Displayed {len(code_matches[:5])} {requested_lang} snippet{'s' if len(code_matches)>1 else ''} from the README.")
+            speak_text(f"Displayed {len(code_matches[:5])} {requested_lang} snippet{'s' if len(code_matches)>1 else ''} from {'the repository' if from_repo else 'the README'}.", shown)
+    elif local_answer:
+        answer = add_message("assistant", local_answer.text, source="local", confidence=local_answer.confidence)
+        render_message(answer)
+        st.caption(f"⚡ Answered locally from the knowledge base (confidence {local_answer.confidence:.2f})")
+        
+        if tts_toggle:
+            speak_text(local_answer.text, answer)
     else:
-        # Use intelligent Groq response
-        system_prompt = build_intelligent_system_prompt(st.session_state.chat_mode, st.session_state.get("selected_project"))
+        # No project picked in the selectbox: route the question to the project it is about
+        target_project = st.session_state.get("selected_project")
+        if not target_project:
+            target_project = route_question(user_input, query_classification['type'], answer_engine, project_search, project_index)
+            if target_project:
+                st.caption(f"🎯 Auto-detected project: {kb.by_url[target_project].name}")
         
         # Add context awareness: mention if user is asking about selected project
         enhanced_user_msg = user_input
-        if st.session_state.get("selected_project"):
-            for c, name, url in all_projects:
-                if url == st.session_state.get("selected_project"):
-                    enhanced_user_msg = f"[Regarding: {name} project] {user_input}"
-                    break
+        selected = kb.by_url.get(target_project)
+        if selected:
+            enhanced_user_msg = f"[Regarding: {selected.name} project] {user_input}"
         
-        messages = [
-            {"role": "system", "content": system_prompt},
-            *[{"role": ("user" if h["role"] == "user" else "assistant"), "content": h["content"]}
-              for h in st.session_state.history[-8:]]
-        ]
+        # Use intelligent Groq response
+        messages = llm_messages(user_input, st.session_state.chat_mode, target_project, history_window(st.session_state.history))
         
+        cache_key = response_cache_key(kb.version, st.session_state.chat_mode, target_project, user_input)
+        cached_answer = response_cache.get(cache_key) or st.session_state.get("imported_answers", {}).get(cache_key)
+        estimated = estimate_tokens(messages, max_tokens=MAX_COMPLETION_TOKENS)
+        
+        # Banked and pre-generated answers assume an empty conversation, so only the first question can use them
+        pregenerated, source = None, None
+        if len(st.session_state.history) == 1:
+            pregenerated, source = answer_bank.get(st.session_state.chat_mode, target_project, user_input), "bank"
+            if not pregenerated and prefetcher is not None:
+                pregenerated, source = prefetcher.get(cache_key), "prefetch"
+        
+        # A paraphrase of an earlier question in the same mode and project reuses its answer
+        scope = (kb.version, st.session_state.chat_mode, target_project or "")
+        reusable = not pregenerated and semantic_reusable(user_input, st.session_state.history)
+        semantic_hit = get_semantic_cache(kb.version, kb).lookup(scope, user_input) if reusable else None
+        
+        meta = {"project": target_project or ""}
         with st.spinner("Thinking..."):
-            try:
-                completion = client.chat.completions.create(
-                    model="llama-3.3-70b-versatile",
-                    messages=messages,
-                    temperature=0.25,
-                    max_tokens=800
-                )
-                bot_text = completion.choices[0].message.content.strip()
-            except Exception as e:
-                bot_text = f"⚠️ Groq API error: {e}"
+            if pregenerated:
+                bot_text = pregenerated
+                meta.update(source=source, model=GROQ_MODEL)
+                background.submit("cache_write", response_cache.set, cache_key, bot_text)
+            elif semantic_hit:
+                bot_text, similarity, _, sampled = semantic_hit
+                meta.update(source="semantic", model=GROQ_MODEL, similarity=round(similarity, 3))
+                if sampled:
+                    audit_semantic_hit(messages, user_input, bot_text, estimated)
+            elif not budget.acquire(estimated):
+                # Budget exhausted: shed load instead of hammering the API
+                bot_text = degraded_answer(user_input, cached_answer)
+                meta.update(source="degraded")
+            else:
+                started = time.perf_counter()
+                try:
+                    prefix_registry.record_messages(st.session_state.session_id, messages)
+                    bot_text, usage = groq_complete(messages)
+                    meta.update(source="groq", model=GROQ_MODEL, usage=usage_fields(usage))
+                    budget.record_usage(usage, estimated)
+                    background.submit("cache_write", response_cache.set, cache_key, bot_text)
+                    if reusable:
+                        background.submit("semantic_store", get_semantic_cache(kb.version, kb).store, scope, user_input, bot_text)
+                except Exception as e:
+                    if is_rate_limited(e):
+                        budget.penalize(retry_after_seconds(e))
+                        bot_text = degraded_answer(user_input, cached_answer)
+                        meta.update(source="degraded")
+                    else:
+                        bot_text = f"⚠️ Groq API error: {e}"
+                        meta.update(source="error")
+                meta["latency_ms"] = round((time.perf_counter() - started) * 1000)
+        
+        # Flag numbers/project names the knowledge base doesn't back up
+        if meta["source"] in ("groq", "bank", "prefetch", "semantic"):
+            bot_text = fact_checker.check(bot_text)
         
         # Display response
-        st.markdown(f"<div class='chat-bubble-bot' aria-label='Assistant message'><b>{context.get('assistant_name','Portfoli-AI')}:</b> {bot_text}</div>", unsafe_allow_html=True)
-        st.session_state.history.append({"role": "assistant", "content": bot_text})
+        answer = add_message("assistant", bot_text, **meta)
+        render_message(answer)
         
-        # TTS
+        # TTS (synthesized in the background; the turn ends here)
         if tts_toggle:
-            speak_text(bot_text)
+            speak_text(bot_text, answer)
+    
+    # chat_pane is a fragment: a turn doesn't rerun the script, so the ledger is updated here too
+    record_session_memory()
+
+
+@st.fragment
+def chat_pane():
+    mode = st.radio("Chat mode", CHAT_MODES, horizontal=True, key="chat_mode_radio")
+    if "chat_mode" not in st.session_state or st.session_state.get("chat_mode") != mode:
+        st.session_state.chat_mode = mode
+        st.session_state.history.clear()
+        schedule_followups(st.session_state.get("selected_project"), mode)
+    
+    render_history()
+    
+    user_input = st.chat_input("Type your message and press Enter...")
+    if user_input:
+        handle_user_input(user_input)
+    if background.pending(st.session_state.session_id):
+        background_inbox()
+
+chat_pane()
+
+# -----------------------
+# Metrics
+# -----------------------
+@st.cache_resource(ttl=300, show_spinner=False)
+def cache_memory():
+    """
+    Approximate bytes held by each process-wide cache (interned text counted where it is held).
+    Walking every cache is too slow for the 15 s metrics refresh, so it's measured at most every 5 minutes.
+    """
+    sizes = {
+        "project_cards": card_store.cards,
+        "source_index": source_index().repos,
+        "answer_bank": answer_bank.answers,
+    }
+    if prefetcher is not None:
+        sizes["prefetch"] = prefetcher.answers
+    if isinstance(shared_caches["backend"], LRUBackend):
+        sizes["shared_lru"] = shared_caches["backend"].data
+    out = {name: sum(approx_size(obj)) for name, obj in sizes.items()}
+    out["content_store"] = content_store.snapshot()["bytes"]
+    out["measured_at"] = time.strftime("%H:%M:%S")
+    return out
+
+@st.fragment(run_every="15s")
+def metrics_panel():
+    with st.expander("📈 Metrics"):
+        st.markdown(f"**Knowledge base** version `{kb.version}` · reloads: {kb_watcher.reloads} · banked answers: {len(answer_bank)}")
+        st.markdown("**Groq budget**")
+        st.json(budget.snapshot())
+        st.markdown("**Prompt prefix reuse**")
+        st.json({**prefix_registry.snapshot(), "profile_tokens": profile_tokens(kb)})
+        st.markdown(f"**Shared caches** ({shared_caches['backend'].name})")
+        st.json({name: ns.snapshot() for name, ns in shared_caches.items() if name != "backend"})
+        st.markdown("**Fact check**")
+        st.json(fact_checker.snapshot())
+        st.markdown("**Background tasks**")
+        st.json(background.snapshot())
+        st.markdown("**Source index**")
+        st.json(source_index().snapshot())
+        st.markdown("**Message rendering**")
+        st.json(render_html.snapshot())
+        st.markdown("**Memory** (approximate bytes)")
+        st.json({"this_session": dict(zip(("own", "shared"), session_memory())), **memory_ledger.snapshot(),
+                 "content_store": content_store.snapshot(), "caches": cache_memory()})
+        if "semantic_cache" in sys.modules:  # not created until the first question reaches Groq
+            st.markdown("**Semantic response cache**")
+            st.json(get_semantic_cache(kb.version, kb).snapshot())
+        if prefetcher is not None:
+            st.markdown("**Speculative pre-generation**")
+            st.json(prefetcher.snapshot())
+
+record_session_memory()
+
+with st.sidebar:
+    metrics_panel()
 
 # -----------------------
 # Footer (EXACT - unchanged)
@@ -0,0 +1,108 @@
+"""
+Off-critical-path executor for side effects (TTS synthesis, card persistence,
+shared-cache writes). A small thread pool behind a bounded queue: submit() never
+blocks the script; when the queue is full the task is dropped and counted.
+Tasks tagged with a session id post their result to that session's inbox, which
+the app drains from a polling fragment, so a chat turn finishes as soon as the
+text is ready.
+"""
+
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+class BackgroundTasks:
+    """Process-wide bounded executor with per-session result inboxes."""
+
+    def __init__(self, workers=2, max_queue=64, max_sessions=1000):
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="background")
+        self.slots = threading.BoundedSemaphore(workers + max_queue)
+        self.max_sessions = max_sessions
+        self.lock = threading.Lock()
+        self.inboxes = OrderedDict()  # session id -> deque of (kind, tag, result, error)
+        self.in_flight = {}  # session id -> tasks not yet delivered
+        self.keys = set()  # dedupe keys of queued tasks
+        self.stats = {}  # kind -> {"submitted", "completed", "failed", "dropped", "deduped", "total_ms"}
+
+    def _stat(self, kind, field, amount=1):
+        s = self.stats.setdefault(kind, {"submitted": 0, "completed": 0, "failed": 0, "dropped": 0, "deduped": 0, "total_ms": 0.0})
+        s[field] += amount
+
+    def submit(self, kind, fn, *args, session=None, tag=None, key=None, **kwargs):
+        """
+        Run fn(*args, **kwargs) in the background. With `session`, its result (or error)
+        is posted to that session's inbox along with `tag`. A task with a `key` that is
+        already queued is skipped (e.g. one pending save is enough). Returns False if
+        the task was dropped or deduplicated.
+        """
+        with self.lock:
+            if key is not None and key in self.keys:
+                self._stat(kind, "deduped")
+                return False
+            if not self.slots.acquire(blocking=False):
+                self._stat(kind, "dropped")
+                if session is not None:
+                    self._post(session, (kind, tag, None, "busy"))
+                return False
+            if key is not None:
+                self.keys.add(key)
+            if session is not None:
+                self.in_flight[session] = self.in_flight.get(session, 0) + 1
+            self._stat(kind, "submitted")
+        self.executor.submit(self._run, kind, fn, args, kwargs, session, tag, key)
+        return True
+
+    def _run(self, kind, fn, args, kwargs, session, tag, key):
+        started = time.perf_counter()
+        result, error = None, None
+        try:
+            result = fn(*args, **kwargs)
+        except Exception as e:
+            error = str(e) or type(e).__name__
+        with self.lock:
+            self._stat(kind, "failed" if error else "completed")
+            self._stat(kind, "total_ms", (time.perf_counter() - started) * 1000)
+            self.keys.discard(key)
+            if session is not None:
+                self._post(session, (kind, tag, result, error))
+        self.slots.release()
+
+    def _post(self, session, item):
+        # caller holds self.lock
+        inbox = self.inboxes.pop(session, None) or deque(maxlen=64)
+        inbox.append(item)
+        self.inboxes[session] = inbox
+        while len(self.inboxes) > self.max_sessions:  # sessions that went away never drain theirs
+            old, _ = self.inboxes.popitem(last=False)
+            self.in_flight.pop(old, None)
+
+    def pending(self, session):
+        """True while the session has tasks running or results waiting to be collected."""
+        with self.lock:
+            return bool(self.in_flight.get(session) or self.inboxes.get(session))
+
+    def collect(self, session):
+        """[(kind, tag, result, error), ...] delivered to this session since the last call."""
+        with self.lock:
+            inbox = self.inboxes.pop(session, None)
+            if not inbox:
+                return []
+            items = list(inbox)
+            delivered = sum(1 for _, _, _, error in items if error != "busy")
+            left = self.in_flight.get(session, 0) - delivered
+            if left > 0:
+                self.in_flight[session] = left
+            else:
+                self.in_flight.pop(session, None)
+            return items
+
+    def snapshot(self):
+        with self.lock:
+            out = {"sessions_waiting": len(self.in_flight)}
+            for kind, s in self.stats.items():
+                done = s["completed"] + s["failed"]
+                out[kind] = {**{k: v for k, v in s.items() if k != "total_ms"},
+                             "avg_ms": round(s["total_ms"] / done, 1) if done else 0.0}
+            return out
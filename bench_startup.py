@@ -0,0 +1,115 @@
+"""
+Cold-start benchmark for app.py.
+Imports everything app.py imports at module level in a fresh interpreter under
+`python -X importtime`, reports the slowest imports, and exits non-zero if the
+app's own import cost (everything except Streamlit itself) exceeds the budget or
+if a dependency that should load lazily was imported at startup.
+
+    python bench_startup.py --budget-ms 150
+    python bench_startup.py --run-app --run-budget-ms 3000   # also time a first AppTest run
+"""
+
+import argparse
+import ast
+import os
+import subprocess
+import sys
+import time
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+# Must not be imported until a request needs them
+LAZY_MODULES = ("groq", "gtts", "requests", "pandas", "numpy")
+
+
+def top_level_imports(path=APP_PATH):
+    """Module names app.py imports at module level (not inside functions)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), path)
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            names.append(node.module)
+    return list(dict.fromkeys(names))
+
+
+def _importtime(code):
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(APP_PATH), check=True,
+    )
+
+
+def measure_imports(modules):
+    """
+    ({root module: cumulative µs}, [modules loaded]) from a fresh `python -X importtime` run,
+    leaving out what a bare interpreter imports anyway (site, encodings, ...).
+    """
+    baseline = {line.rsplit("|", 1)[1].strip() for line in _importtime("pass").stderr.splitlines() if "|" in line}
+    code = "; ".join(f"import {m}" for m in modules) + "; import sys; print(','.join(sorted(sys.modules)))"
+    proc = _importtime(code)
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _self_us, cum_us, raw_name = line[len("import time:"):].split("|")
+        if raw_name.startswith("  "):
+            continue  # nested import, already counted in its parent's cumulative time
+        name = raw_name.strip()
+        if name in baseline:
+            continue
+        cumulative[name] = cumulative.get(name, 0) + int(cum_us)
+    return cumulative, proc.stdout.strip().split(",")
+
+
+def time_first_run():
+    """Wall time (s) of a first AppTest run of app.py with a placeholder API key."""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(APP_PATH, default_timeout=120)
+    at.secrets["GROQ_API_KEY"] = "gsk_startup_bench"
+    started = time.perf_counter()
+    at.run()
+    elapsed = time.perf_counter() - started
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+    return elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check app.py's cold-start import cost against a budget.")
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("PORTFOLI_STARTUP_BUDGET_MS", "150")),
+                        help="max import time for app.py's own imports, excluding streamlit")
+    parser.add_argument("--run-app", action="store_true", help="also time a first AppTest run")
+    parser.add_argument("--run-budget-ms", type=float, default=3000)
+    parser.add_argument("--top", type=int, default=8)
+    args = parser.parse_args(argv)
+
+    cumulative, loaded = measure_imports(top_level_imports())
+    streamlit_us = sum(us for name, us in cumulative.items() if name.split(".")[0] == "streamlit")
+    app_us = sum(cumulative.values()) - streamlit_us
+    print(f"streamlit: {streamlit_us / 1000:.0f} ms   app imports: {app_us / 1000:.0f} ms (budget {args.budget_ms:.0f} ms)")
+    for name, us in sorted(cumulative.items(), key=lambda kv: -kv[1])[: args.top]:
+        print(f"  {us / 1000:8.1f} ms  {name}")
+
+    failures = []
+    eager = [m for m in LAZY_MODULES if m in loaded]
+    if eager:
+        failures.append(f"imported at startup but should be lazy: {', '.join(eager)}")
+    if app_us / 1000 > args.budget_ms:
+        failures.append(f"app import time {app_us / 1000:.0f} ms exceeds {args.budget_ms:.0f} ms")
+
+    if args.run_app:
+        elapsed_ms = time_first_run() * 1000
+        print(f"first AppTest run: {elapsed_ms:.0f} ms (budget {args.run_budget_ms:.0f} ms)")
+        if elapsed_ms > args.run_budget_ms:
+            failures.append(f"first run {elapsed_ms:.0f} ms exceeds {args.run_budget_ms:.0f} ms")
+
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+Shared cache backends.
+One small interface (get/set/delete on bytes) with three implementations:
+an in-process LRU, a SQLite file that every worker on the host shares and that
+survives restarts, and a minimal Redis (RESP2) client for multi-host setups.
+`open_backend(url)` picks one from PORTFOLI_CACHE_URL:
+
+    memory://?max_entries=2048
+    sqlite:///path/to/cache.db        (default: .cache/shared.db)
+    redis://host:6379/0
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, urlparse
+
+from knowledge_base import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_URL = "sqlite:///" + os.path.join(CACHE_DIR, "shared.db")
+
+
+class CacheBackend:
+    """Bytes in, bytes out. `ttl` is in seconds (None = no expiry)."""
+
+    name = "base"
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value, ttl=None):
+        raise NotImplementedError
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def namespace(self, name, codec="json", ttl=None):
+        return Namespace(self, name, codec, ttl)
+
+
+class LRUBackend(CacheBackend):
+    """Process-local OrderedDict LRU, bounded by entry count."""
+
+    name = "memory"
+
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.data = OrderedDict()  # key -> (value, expires_at)
+
+    def get(self, key):
+        with self.lock:
+            item = self.data.get(key)
+            if item is None:
+                return None
+            if item[1] is not None and item[1] < time.time():
+                del self.data[key]
+                return None
+            self.data.move_to_end(key)
+            return item[0]
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.data[key] = (value, time.time() + ttl if ttl else None)
+            self.data.move_to_end(key)
+            while len(self.data) > self.max_entries:
+                self.data.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.data.pop(key, None)
+
+
+class SQLiteBackend(CacheBackend):
+    """Key/value table in one SQLite file (WAL mode, so several processes can share it)."""
+
+    name = "sqlite"
+
+    def __init__(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("CREATE TABLE IF NOT EXISTS kv (key TEXT PRIMARY KEY, value BLOB, expires REAL)")
+        self.writes = 0
+
+    def get(self, key):
+        with self.lock:
+            row = self.conn.execute("SELECT value, expires FROM kv WHERE key = ?", (key,)).fetchone()
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            return None
+        return bytes(row[0])
+
+    def set(self, key, value, ttl=None):
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO kv (key, value, expires) VALUES (?, ?, ?)",
+                (key, sqlite3.Binary(value), time.time() + ttl if ttl else None),
+            )
+            self.writes += 1
+            if self.writes % 500 == 0:
+                self.conn.execute("DELETE FROM kv WHERE expires IS NOT NULL AND expires < ?", (time.time(),))
+
+    def delete(self, key):
+        with self.lock:
+            self.conn.execute("DELETE FROM kv WHERE key = ?", (key,))
+
+
+class RedisBackend(CacheBackend):
+    """Minimal RESP2 client (GET/SET EX/DEL) over one socket; reconnects once on failure."""
+
+    name = "redis"
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=2.0):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.sock = None
+        self.reader = None
+
+    def _connect(self):
+        self.sock = socket.create_connection(self.address, timeout=self.timeout)
+        self.reader = self.sock.makefile("rb")
+        if self.password:
+            self._roundtrip("AUTH", self.password)
+        if self.db:
+            self._roundtrip("SELECT", str(self.db))
+
+    def _close(self):
+        try:
+            if self.sock is not None:
+                self.sock.close()
+        finally:
+            self.sock = self.reader = None
+
+    @staticmethod
+    def _encode(*args):
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode("utf-8")
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(out)
+
+    def _read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("redis closed the connection")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RuntimeError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            if n < 0:
+                return None
+            data = self.reader.read(n + 2)
+            return data[:-2]
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read_reply() for _ in range(n)]
+        raise ConnectionError(f"bad RESP reply: {line!r}")
+
+    def _roundtrip(self, *args):
+        self.sock.sendall(self._encode(*args))
+        return self._read_reply()
+
+    def command(self, *args):
+        with self.lock:
+            for attempt in (1, 2):
+                try:
+                    if self.sock is None:
+                        self._connect()
+                    return self._roundtrip(*args)
+                except (OSError, ConnectionError):
+                    self._close()
+                    if attempt == 2:
+                        raise
+
+    def get(self, key):
+        return self.command("GET", key)
+
+    def set(self, key, value, ttl=None):
+        if ttl:
+            self.command("SET", key, value, "EX", int(ttl))
+        else:
+            self.command("SET", key, value)
+
+    def delete(self, key):
+        self.command("DEL", key)
+
+
+class Namespace:
+    """
+    Typed view of a backend under a key prefix: 'json' values (default) or raw 'bytes'.
+    Backend failures are logged and treated as misses, so a cache outage never breaks a request.
+    """
+
+    def __init__(self, backend, name, codec="json", ttl=None):
+        self.backend = backend
+        self.name = name
+        self.codec = codec
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, key):
+        if not isinstance(key, str):
+            key = json.dumps(key, ensure_ascii=False, separators=(",", ":"))
+        if len(key) > 200:
+            key = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return f"portfoli:{self.name}:{key}"
+
+    def get(self, key, default=None):
+        try:
+            raw = self.backend.get(self._key(key))
+        except Exception as e:
+            logger.warning("cache %s get failed: %s", self.name, e)
+            raw = None
+        if raw is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return raw if self.codec == "bytes" else json.loads(raw)
+
+    def set(self, key, value, ttl=None):
+        raw = value if self.codec == "bytes" else json.dumps(value, ensure_ascii=False).encode("utf-8")
+        try:
+            self.backend.set(self._key(key), raw, ttl or self.ttl)
+        except Exception as e:
+            logger.warning("cache %s set failed: %s", self.name, e)
+
+    def __getitem__(self, key):
+        value = self.get(key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __setitem__(self, key, value):
+        self.set(key, value)
+
+    def snapshot(self):
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": round(self.hits / total, 3) if total else 0.0}
+
+
+def open_backend(url=None):
+    """Backend for `url` (default PORTFOLI_CACHE_URL, else SQLite under .cache/); falls back to memory."""
+    url = url or os.getenv("PORTFOLI_CACHE_URL") or DEFAULT_CACHE_URL
+    parsed = urlparse(url)
+    options = {k: v[-1] for k, v in parse_qs(parsed.query).items()}
+    try:
+        if parsed.scheme == "memory":
+            return LRUBackend(max_entries=int(options.get("max_entries", 2048)))
+        if parsed.scheme == "sqlite":
+            return SQLiteBackend(parsed.path)
+        if parsed.scheme == "redis":
+            db = int(parsed.path.strip("/") or 0)
+            return RedisBackend(parsed.hostname or "localhost", parsed.port or 6379, db, parsed.password)
+        raise ValueError(f"unsupported cache URL scheme: {parsed.scheme!r}")
+    except (OSError, sqlite3.Error, ValueError) as e:
+        logger.warning("cache backend %s unavailable (%s); using in-process LRU", url, e)
+        return LRUBackend()
@@ -0,0 +1,119 @@
+"""
+Content-addressed string interning and approximate memory accounting.
+READMEs, code blocks, answers and rendered HTML repeat across sessions (every
+visitor who opens the same project or gets the same banked answer). Passing them
+through ContentStore.intern() makes all holders share one str object per distinct
+content, so memory grows with distinct content instead of with visitor count.
+approx_size() walks a container and MemoryLedger keeps the latest per-session
+totals for the metrics panel.
+"""
+
+import sys
+import threading
+from collections import OrderedDict
+
+
+class ContentStore:
+    """
+    Process-wide text -> canonical text map, LRU-bounded by bytes. Evicting an entry
+    never invalidates anything: holders keep their reference, later copies just
+    stop being shared with it.
+    """
+
+    def __init__(self, max_bytes=64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.texts = OrderedDict()  # text -> the same text (the shared instance)
+        self.ids = set()  # id() of every stored instance, for approx_size()
+        self.bytes = 0
+        self.interned = 0
+        self.deduped = 0
+        self.bytes_saved = 0
+
+    def intern(self, text):
+        """The shared instance of `text` (non-strings pass through)."""
+        if not isinstance(text, str) or not text:
+            return text
+        with self.lock:
+            self.interned += 1
+            shared = self.texts.get(text)
+            if shared is not None:
+                self.texts.move_to_end(text)
+                if shared is not text:
+                    self.deduped += 1
+                    self.bytes_saved += sys.getsizeof(text)
+                return shared
+            self.texts[text] = text
+            self.ids.add(id(text))
+            self.bytes += sys.getsizeof(text)
+            while self.bytes > self.max_bytes and len(self.texts) > 1:
+                old, _ = self.texts.popitem(last=False)
+                self.ids.discard(id(old))
+                self.bytes -= sys.getsizeof(old)
+            return text
+
+    def owns(self, obj):
+        return id(obj) in self.ids
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "entries": len(self.texts),
+                "bytes": self.bytes,
+                "interned": self.interned,
+                "deduped": self.deduped,
+                "bytes_saved": self.bytes_saved,
+            }
+
+
+def approx_size(obj, store=None, seen=None):
+    """
+    (own bytes, shared bytes) reachable from obj: containers, strings and bytes, each
+    object counted once. Strings owned by `store` are reported as shared.
+    """
+    seen = set() if seen is None else seen
+    own = shared = 0
+    stack = [obj]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        size = sys.getsizeof(item)
+        if store is not None and isinstance(item, str) and store.owns(item):
+            shared += size
+            continue
+        own += size
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            stack.extend(item)
+    return own, shared
+
+
+class MemoryLedger:
+    """Latest approx_size() per session, capped so abandoned sessions age out."""
+
+    def __init__(self, max_sessions=1000):
+        self.max_sessions = max_sessions
+        self.lock = threading.Lock()
+        self.sessions = OrderedDict()  # session id -> (own bytes, shared bytes)
+
+    def record(self, session, own, shared):
+        with self.lock:
+            self.sessions.pop(session, None)
+            self.sessions[session] = (own, shared)
+            while len(self.sessions) > self.max_sessions:
+                self.sessions.popitem(last=False)
+
+    def snapshot(self):
+        with self.lock:
+            own = [o for o, _ in self.sessions.values()]
+            return {
+                "sessions": len(own),
+                "session_bytes_total": sum(own),
+                "session_bytes_avg": round(sum(own) / len(own)) if own else 0,
+                "session_bytes_max": max(own, default=0),
+                "shared_bytes_referenced": sum(s for _, s in self.sessions.values()),
+            }
@@ -0,0 +1,84 @@
+"""
+Conversation export/import as NDJSON (optionally gzip-compressed).
+Line 1 is a header (format, knowledge-base version, chat mode, project); every
+following line is one message with its timestamp and, for generated answers, the
+model, latency and token usage. Both directions stream line by line, so large
+histories never become one big string.
+"""
+
+import gzip
+import json
+import tempfile
+import time
+import zlib
+
+FORMAT = "portfoli-chat/1"
+_GZIP_MAGIC = b"\x1f\x8b"
+
+
+def write_conversation(fp, history, meta=None):
+    """Write header + one line per message to a binary file object."""
+    header = {"type": "header", "format": FORMAT, "exported_at": time.time(), **(meta or {})}
+    fp.write(json.dumps(header, ensure_ascii=False).encode("utf-8") + b"\n")
+    for message in history:
+        fields = {k: v for k, v in message.items() if not k.startswith("_")}  # "_html" etc. are render caches
+        fp.write(json.dumps({"type": "message", **fields}, ensure_ascii=False).encode("utf-8") + b"\n")
+
+
+def export_conversation(history, meta=None, compress=True):
+    """
+    Binary file object (rewound) holding the export; small exports stay in memory,
+    larger ones spill to a temporary file.
+    """
+    out = tempfile.SpooledTemporaryFile(max_size=1 << 20)
+    if compress:
+        with gzip.GzipFile(fileobj=out, mode="wb", mtime=0) as gz:
+            write_conversation(gz, history, meta)
+    else:
+        write_conversation(out, history, meta)
+    out.seek(0)
+    return out
+
+
+def read_conversation(fp):
+    """
+    (header, messages iterator) from a binary file object written by export_conversation,
+    compressed or not; the file is not closed. Raises ValueError if it isn't a conversation
+    export, including while iterating over a truncated or corrupt one. Keys starting with
+    "_" (render caches) are dropped: uploaded files never supply them.
+    """
+    head = fp.read(2)
+    fp.seek(0)
+    if head == _GZIP_MAGIC:
+        fp = gzip.GzipFile(fileobj=fp, mode="rb")  # leaves the caller's file open
+    lines = iter(fp)  # bytes lines; json.loads decodes UTF-8 itself
+
+    try:
+        header = json.loads(next(lines))
+    except (StopIteration, ValueError, EOFError, OSError, zlib.error):
+        raise ValueError("empty or malformed conversation file")
+    if not isinstance(header, dict) or header.get("type") != "header" or header.get("format") != FORMAT:
+        raise ValueError(f"not a {FORMAT} export")
+
+    def messages():
+        try:
+            for line in lines:
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                if not isinstance(record, dict) or record.pop("type", None) != "message":
+                    continue
+                if record.get("role") in ("user", "assistant") and isinstance(record.get("content"), str):
+                    yield {k: v for k, v in record.items() if not k.startswith("_")}
+        except (EOFError, OSError, zlib.error) as e:
+            raise ValueError(f"truncated or corrupt conversation file ({e})")
+
+    return header, messages()
+
+
+def usage_fields(usage):
+    """completion.usage (object or dict) as a plain dict for the export."""
+    if usage is None:
+        return None
+    get = usage.get if isinstance(usage, dict) else (lambda k: getattr(usage, k, None))
+    return {k: get(k) for k in ("prompt_tokens", "completion_tokens", "total_tokens")}
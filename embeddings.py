@@ -0,0 +1,194 @@
+"""
+Dense-vector project index for routing a question to the project it is about.
+Vectors come from a small CPU embedder (feature-hashed words + character trigrams
+by default, or a local sentence-transformers model if PORTFOLI_EMBED_MODEL is set).
+The matrix is saved as .npy and memory-mapped on load; search is one batched
+matrix product plus argpartition top-k. No network use.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zlib
+
+import numpy as np
+
+from knowledge_base import CACHE_DIR
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_HEADING_RE = re.compile(r"^#{1,6}\s", re.MULTILINE)
+_STOPWORDS = {
+    "the", "a", "an", "and", "or", "of", "to", "in", "on", "for", "with", "is", "are", "was",
+    "what", "which", "how", "me", "show", "tell", "about", "this", "that", "project", "projects",
+    "robin", "s", "it", "its", "by", "from", "as", "at", "be", "can", "you", "your", "i",
+}
+
+
+class HashingEmbedder:
+    """Feature-hashing embedder: words and their character trigrams hashed into `dim` signed buckets."""
+
+    name = "hash"
+
+    def __init__(self, dim=512):
+        self.dim = dim
+
+    def _features(self, text):
+        for w in _WORD_RE.findall(text.lower()):
+            if w in _STOPWORDS:
+                continue
+            yield w, 1.0
+            padded = f"#{w}#"
+            for i in range(len(padded) - 2):
+                yield padded[i:i + 3], 0.3
+
+    def encode(self, texts):
+        out = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feat, weight in self._features(text):
+                h = zlib.crc32(feat.encode("utf-8"))
+                out[row, h % self.dim] += weight if (h >> 31) & 1 else -weight
+        norms = np.linalg.norm(out, axis=1, keepdims=True)
+        return out / np.maximum(norms, 1e-9)
+
+
+class SentenceTransformerEmbedder:
+    """Wraps a locally available sentence-transformers model (e.g. all-MiniLM-L6-v2)."""
+
+    def __init__(self, model_name):
+        from sentence_transformers import SentenceTransformer  # optional dependency
+        self.name = "st-" + model_name.replace("/", "_")
+        self.model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(self, texts):
+        return self.model.encode(list(texts), batch_size=32, normalize_embeddings=True).astype(np.float32)
+
+
+def get_embedder():
+    """Local sentence-transformers model if configured and installed, else the hashing embedder."""
+    model_name = os.getenv("PORTFOLI_EMBED_MODEL")
+    if model_name:
+        try:
+            return SentenceTransformerEmbedder(model_name)
+        except Exception:
+            pass
+    return HashingEmbedder()
+
+
+def split_readme_sections(readme_text, max_chars=1200):
+    """Split a README into heading-delimited sections (each capped at max_chars)."""
+    if not readme_text:
+        return []
+    starts = [m.start() for m in _HEADING_RE.finditer(readme_text)] or [0]
+    if starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = zip(starts, starts[1:] + [len(readme_text)])
+    return [readme_text[a:b].strip()[:max_chars] for a, b in bounds if readme_text[a:b].strip()]
+
+
+def project_documents(kb, readmes=None):
+    """(url, text) chunks: one profile per project plus its README sections if provided."""
+    readmes = readmes or {}
+    docs = []
+    for p in kb.projects:
+        profile = " ".join([
+            p.name, p.name, p.category, p.objective, p.dataset_size, p.business_impact,
+            " ".join(p.techniques), " ".join(p.key_findings),
+            " ".join(k.replace("_", " ") for k, _ in p.key_metrics),
+        ])
+        docs.append((p.url, profile))
+        for section in split_readme_sections(readmes.get(p.url)):
+            docs.append((p.url, f"{p.name} {section}"))
+    return docs
+
+
+class ProjectIndex:
+    """
+    Row-normalized embedding matrix with the project URL for each row, plus the
+    projects each document word occurs in (to tell distinctive query terms apart).
+    """
+
+    def __init__(self, embedder, matrix, row_urls, term_projects=None):
+        self.embedder = embedder
+        self.matrix = matrix
+        self.row_urls = np.asarray(row_urls)
+        self.term_projects = term_projects or {}
+        self.project_count = len(set(row_urls))
+
+    def search(self, queries, k=3):
+        """Batched cosine top-k: for each query, [(url, score), ...] best project first."""
+        q = self.embedder.encode(queries)
+        scores = q @ self.matrix.T
+        results = []
+        for row in scores:
+            top = np.argpartition(-row, min(len(row) - 1, 4 * k))[: 4 * k]
+            best = {}
+            for i in top[np.argsort(-row[top])]:
+                url = str(self.row_urls[i])
+                if url not in best:
+                    best[url] = float(row[i])
+                if len(best) == k:
+                    break
+            results.append(list(best.items()))
+        return results
+
+    def distinctive_terms(self, query, url, max_share=0.15):
+        """Query words found in `url`'s documents and in at most `max_share` of all projects."""
+        limit = max(1, int(max_share * self.project_count))
+        return [
+            w for w in _WORD_RE.findall(query.lower())
+            if url in self.term_projects.get(w, ()) and len(self.term_projects[w]) <= limit
+        ]
+
+    def route(self, query, min_score=0.2, min_margin=0.03, strong_score=0.4, strong_margin=0.15):
+        """
+        Project URL the query is most likely about, or None if it's not clear-cut.
+        Similarity alone is noisy ("Show me the SQL query" sits nearest some project), so
+        without a distinctive word shared with that project the match must clear
+        `strong_score` or lead by `strong_margin`.
+        """
+        hits = self.search([query], k=2)[0]
+        if not hits or hits[0][1] < min_score:
+            return None
+        url, score = hits[0]
+        margin = score - hits[1][1] if len(hits) > 1 else score
+        if margin < min_margin:
+            return None
+        if not self.distinctive_terms(query, url) and score < strong_score and margin < strong_margin:
+            return None
+        return url
+
+
+def _term_projects(docs):
+    """word -> frozenset of project URLs whose documents use it."""
+    terms = {}
+    for url, text in docs:
+        for w in set(_WORD_RE.findall(text.lower())) - _STOPWORDS:
+            terms.setdefault(w, set()).add(url)
+    return {w: frozenset(urls) for w, urls in terms.items()}
+
+
+def build_project_index(kb, readmes=None, embedder=None, cache_dir=CACHE_DIR):
+    """
+    Build (or load from cache) the index for this knowledge-base version.
+    The matrix is written once as .npy and then memory-mapped read-only.
+    """
+    embedder = embedder or get_embedder()
+    docs = project_documents(kb, readmes)
+    digest = hashlib.sha256(json.dumps(docs).encode("utf-8")).hexdigest()[:12]
+    base = os.path.join(cache_dir, f"project-index-{embedder.name}-{digest}")
+    row_urls = [url for url, _ in docs]
+    terms = _term_projects(docs)
+    try:
+        return ProjectIndex(embedder, np.load(base + ".npy", mmap_mode="r"), row_urls, terms)
+    except (OSError, ValueError):
+        pass
+    matrix = embedder.encode([text for _, text in docs])
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.save(base + ".tmp.npy", matrix)
+        os.replace(base + ".tmp.npy", base + ".npy")
+        matrix = np.load(base + ".npy", mmap_mode="r")
+    except OSError:
+        pass  # read-only filesystem: keep the in-memory matrix
+    return ProjectIndex(embedder, matrix, row_urls, terms)
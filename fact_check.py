@@ -0,0 +1,173 @@
+"""
+Post-generation fact check of model answers against the knowledge base.
+Every number that appears anywhere in the context (and the static prompt) is
+precomputed into a set of accepted values; answers are scanned with one
+precompiled pattern and numbers or project-like names that the context doesn't
+support are flagged. StreamingVerifier checks text chunk by chunk as it arrives,
+so a streamed response is verified by the time its last chunk lands.
+"""
+
+import re
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+
+# 26.54% / $2.5M / 1,869 / ₹4.2 / 0.82 (optionally signed or approximate)
+_NUM_RE = re.compile(r"(?<![\w.,])[~+-]?[$₹€£]?(\d{1,3}(?:,\d{3})+(?:\.\d+)?|\d+(?:\.\d+)?)\s?([KMB]\b|%)?")
+# "Telco Customer Churn Analysis", "Retail Sales Dashboard", ...
+_PROJECT_PHRASE_RE = re.compile(
+    r"\b((?:[A-Z][\w&-]*\s+){1,5}(?:Analysis|Analytics|Dashboard|Prediction|Segmentation|Forecasting|Project))\b"
+)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_SCALE = {"K": 1e3, "M": 1e6, "B": 1e9}
+# Words a project-like phrase may carry on top of a real project's name words
+_PHRASE_FILLER = {"the", "project", "analysis", "analytics", "dashboard", "robin", "robin's", "s"}
+
+
+def _strings(obj):
+    if isinstance(obj, str):
+        yield obj
+    elif isinstance(obj, Mapping):
+        for k, v in obj.items():
+            yield str(k)
+            yield from _strings(v)
+    elif isinstance(obj, (list, tuple)):
+        for v in obj:
+            yield from _strings(v)
+    elif obj is not None and not isinstance(obj, bool):
+        yield str(obj)
+
+
+def _canonical(digits, suffix=None):
+    """Numeric spellings an answer may legitimately use for one value (exact and rounded)."""
+    value = float(digits.replace(",", ""))
+    forms = {round(value, 2), round(value, 1), round(value)}
+    if suffix in _SCALE:
+        scaled = value * _SCALE[suffix]
+        forms |= {round(scaled, 2), round(scaled)}
+    return forms
+
+
+def _is_exempt(value, digits):
+    # Small counts, list numbering and years carry no claim worth checking
+    return (value < 10 and "." not in digits) or (1990 <= value <= 2035 and "." not in digits and "," not in digits)
+
+
+@dataclass(frozen=True, slots=True)
+class Issue:
+    kind: str  # "number" | "project"
+    text: str
+
+
+class FactIndex:
+    """Accepted numbers and project names for one knowledge-base version."""
+
+    def __init__(self, kb, extra_texts=()):
+        sources = [kb.summary, kb.faq, kb.skills_matrix, kb.technical_details, kb.key_business_outcomes,
+                   kb.greeting_message, *extra_texts]
+        for p in kb.projects:
+            sources += [p.name, p.objective, p.dataset_size, p.business_impact, p.key_metrics,
+                        p.techniques, p.key_findings, p.visualizations, p.details]
+        self.numbers = set()
+        for text in _strings(sources):
+            for m in _NUM_RE.finditer(text):
+                self.numbers |= _canonical(m.group(1), m.group(2))
+        self.name_words = [set(_WORD_RE.findall(p.name.lower())) for p in kb.projects]
+
+    def number_ok(self, digits, suffix=None):
+        value = float(digits.replace(",", ""))
+        if _is_exempt(value, digits):
+            return True
+        return round(value, 2) in self.numbers or (suffix in _SCALE and round(value * _SCALE[suffix], 2) in self.numbers)
+
+    def project_ok(self, phrase):
+        words = set(_WORD_RE.findall(phrase.lower())) - _PHRASE_FILLER
+        # Fine if it names (a shortened form of) a real project
+        return not words or any(words <= (nw | _PHRASE_FILLER) or nw - _PHRASE_FILLER <= words for nw in self.name_words)
+
+    def scan(self, text):
+        issues = []
+        for m in _NUM_RE.finditer(text):
+            if not self.number_ok(m.group(1), m.group(2)):
+                issues.append(Issue("number", m.group(0).strip()))
+        for m in _PROJECT_PHRASE_RE.finditer(text):
+            if not self.project_ok(m.group(1)):
+                issues.append(Issue("project", m.group(1)))
+        return issues
+
+
+class StreamingVerifier:
+    """
+    Incremental checker for one response: feed() chunks as they arrive, finish() at the end.
+    Text is only scanned up to the last line/sentence boundary; the tail is carried over so
+    numbers and names split across chunks are seen whole.
+    """
+
+    def __init__(self, index):
+        self.index = index
+        self.carry = ""
+        self.issues = []
+
+    def feed(self, chunk):
+        text = self.carry + chunk
+        cut = max(text.rfind("\n"), text.rfind(". "))
+        if cut < 0:
+            self.carry = text
+            return []
+        head, self.carry = text[:cut + 1], text[cut + 1:]
+        found = self.index.scan(head)
+        self.issues += found
+        return found
+
+    def finish(self):
+        if self.carry:
+            self.issues += self.index.scan(self.carry)
+            self.carry = ""
+        return self.issues
+
+
+def annotate(text, issues):
+    """Append a footnote listing unsupported values (the answer itself is left as written)."""
+    if not issues:
+        return text
+    seen = list(dict.fromkeys(i.text for i in issues))
+    return f"{text}\n\n_⚠️ Not found in Robin's knowledge base, treat with care: {', '.join(seen)}_"
+
+
+class FactChecker:
+    """Process-wide entry point: verifies whole answers or streams and keeps timing stats."""
+
+    def __init__(self, index):
+        self.index = index
+        self.lock = threading.Lock()
+        self.stats = {"checked": 0, "flagged": 0, "issues": 0, "total_us": 0.0}
+
+    def verifier(self):
+        return StreamingVerifier(self.index)
+
+    def record(self, issues, elapsed_s):
+        with self.lock:
+            self.stats["checked"] += 1
+            self.stats["flagged"] += bool(issues)
+            self.stats["issues"] += len(issues)
+            self.stats["total_us"] += elapsed_s * 1e6
+
+    def check(self, text):
+        """annotate(text) after feeding it through a StreamingVerifier in one chunk."""
+        started = time.perf_counter()
+        verifier = self.verifier()
+        verifier.feed(text)
+        issues = verifier.finish()
+        self.record(issues, time.perf_counter() - started)
+        return annotate(text, issues)
+
+    def snapshot(self):
+        with self.lock:
+            checked = self.stats["checked"]
+            return {
+                "checked": checked,
+                "flagged": self.stats["flagged"],
+                "issues": self.stats["issues"],
+                "avg_check_us": round(self.stats["total_us"] / checked, 1) if checked else 0.0,
+            }
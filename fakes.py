@@ -0,0 +1,154 @@
+"""
+Stand-ins for external services, for offline runs and load tests.
+FakeGroq mimics the slice of the Groq client the app uses
+(client.chat.completions.create -> .choices[0].message.content, .usage);
+FakeRedisServer speaks enough RESP2 for cache_backend.RedisBackend.
+"""
+
+import random
+import socketserver
+import threading
+import time
+from types import SimpleNamespace
+
+from rate_limiter import estimate_tokens
+
+
+class _FakeCompletions:
+    def __init__(self, latency, jitter, answer):
+        self.latency = latency
+        self.jitter = jitter
+        self.answer = answer
+
+    def create(self, model=None, messages=(), max_tokens=800, **kwargs):
+        _sleep(self.latency, self.jitter)
+        question = next((m["content"] for m in reversed(messages) if m.get("role") == "user"), "")
+        text = self.answer(question) if callable(self.answer) else self.answer
+        prompt_tokens = estimate_tokens(messages)
+        completion_tokens = max(1, len(text) // 4)
+        usage = SimpleNamespace(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+        message = SimpleNamespace(content=text)
+        return SimpleNamespace(model=model, choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+class FakeGroq:
+    """Deterministic Groq replacement; `latency`/`jitter` are seconds per call."""
+
+    def __init__(self, api_key=None, latency=0.0, jitter=0.0, answer=None):
+        answer = answer or (lambda question: f"(offline answer) {question}")
+        self.chat = SimpleNamespace(completions=_FakeCompletions(latency, jitter, answer))
+
+
+
+def _sleep(latency, jitter):
+    if latency or jitter:
+        time.sleep(max(0.0, latency + random.uniform(-jitter, jitter)))
+
+
+FAKE_README = """# Project
+
+Overview of the analysis.
+
+## Queries
+
+```sql
+SELECT customer_id, SUM(total) FROM orders GROUP BY customer_id;
+```
+
+## Measures
+
+```dax
+Churn Rate = DIVIDE([Churned], [Customers])
+```
+"""
+
+
+def fake_readme_get(latency=0.0, jitter=0.0, text=FAKE_README):
+    """A requests.get replacement that answers every README URL with `text` after a delay."""
+    def get(url, headers=None, timeout=None, **kwargs):
+        _sleep(latency, jitter)
+        if headers and headers.get("If-None-Match") == '"fake"':
+            return SimpleNamespace(status_code=304, text="", headers={"ETag": '"fake"'})
+        return SimpleNamespace(status_code=200, text=text, headers={"ETag": '"fake"'})
+    return get
+
+
+class FakeGTTS:
+    """gTTS stand-in: writes a few bytes of 'audio' after `latency` seconds."""
+
+    latency = 0.0
+
+    def __init__(self, text="", lang="en", slow=False):
+        self.text = text
+
+    def write_to_fp(self, fp):
+        _sleep(self.latency, 0.0)
+        fp.write(b"ID3" + self.text[:32].encode("utf-8"))
+
+class _RedisHandler(socketserver.StreamRequestHandler):
+    def _read_command(self):
+        line = self.rfile.readline()
+        if not line.startswith(b"*"):
+            return None
+        args = []
+        for _ in range(int(line[1:-2])):
+            n = int(self.rfile.readline()[1:-2])
+            args.append(self.rfile.read(n + 2)[:-2])
+        return args
+
+    def handle(self):
+        store, lock = self.server.store, self.server.lock
+        while True:
+            args = self._read_command()
+            if not args:
+                return
+            cmd = args[0].upper()
+            with lock:
+                now = time.time()
+                if cmd == b"GET":
+                    value, expires = store.get(args[1], (None, None))
+                    if value is None or (expires and expires < now):
+                        reply = b"$-1\r\n"
+                    else:
+                        reply = b"$%d\r\n%s\r\n" % (len(value), value)
+                elif cmd == b"SET":
+                    ttl = int(args[4]) if len(args) > 4 and args[3].upper() == b"EX" else None
+                    store[args[1]] = (args[2], now + ttl if ttl else None)
+                    reply = b"+OK\r\n"
+                elif cmd == b"DEL":
+                    reply = b":%d\r\n" % sum(store.pop(k, None) is not None for k in args[1:])
+                elif cmd == b"DBSIZE":
+                    reply = b":%d\r\n" % len(store)
+                elif cmd == b"FLUSHDB":
+                    store.clear()
+                    reply = b"+OK\r\n"
+                elif cmd in (b"PING", b"SELECT", b"AUTH"):
+                    reply = b"+PONG\r\n" if cmd == b"PING" else b"+OK\r\n"
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+class FakeRedisServer(socketserver.ThreadingTCPServer):
+    """In-memory Redis stand-in on localhost; use as a context manager, `url` is its redis:// URL."""
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, port=0):
+        super().__init__(("127.0.0.1", port), _RedisHandler)
+        self.store = {}
+        self.lock = threading.Lock()
+        self.url = f"redis://127.0.0.1:{self.server_address[1]}/0"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc):
+        self.shutdown()
+        self.server_close()
@@ -0,0 +1,35 @@
+"""
+Lazily constructed Groq client.
+Importing the groq SDK costs ~250 ms, so the app holds a LazyGroq and the SDK is
+only imported (and the real client built) on the first completion.
+"""
+
+import threading
+
+
+class LazyGroq:
+    """Drop-in for groq.Groq where only `.chat.completions.create` is used."""
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.lock = threading.Lock()
+        self._client = None
+
+    @property
+    def loaded(self):
+        return self._client is not None
+
+    @property
+    def chat(self):
+        if self._client is None:
+            with self.lock:
+                if self._client is None:
+                    from groq import Groq  # deferred: heavy import
+                    # The app retries with its own backoff and rate budget; SDK retries would multiply them
+                    self._client = Groq(api_key=self.api_key, max_retries=0)
+        return self._client.chat
+
+
+def is_rate_limited(error):
+    """True for groq.RateLimitError (HTTP 429), checked without importing groq."""
+    return getattr(error, "status_code", None) == 429 or type(error).__name__ == "RateLimitError"
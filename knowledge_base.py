@@ -0,0 +1,211 @@
+"""
+Typed, read-only view of the Portfoli-AI knowledge base.
+Loads the raw context (robi_context.json, or another JSON/YAML file) once into
+frozen dataclasses with precomputed lookup maps, so every per-request lookup is O(1).
+KnowledgeBaseWatcher reloads the file atomically when it changes; each build is
+stamped with a content hash (`version`) that caches use in their keys.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from types import MappingProxyType
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "robi_context.json")
+# Derived artifacts (embedding matrices, rendered cards, ...) live here
+CACHE_DIR = os.getenv("PORTFOLI_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+
+# Raw project fields folded into the typed attributes below; everything else
+# (dax_measures, key_queries, segments, ...) is kept in Project.details.
+_TECHNIQUE_FIELDS = ("techniques", "sql_techniques")
+_FINDING_FIELDS = ("key_findings", "key_insights")
+_CORE_FIELDS = {
+    "url", "objective", "dataset_size", "dataset", "business_impact",
+    "key_metrics", "visualizations", *_TECHNIQUE_FIELDS, *_FINDING_FIELDS,
+}
+
+
+@dataclass(frozen=True, slots=True)
+class Project:
+    category: str
+    name: str
+    url: str
+    objective: str
+    dataset_size: str
+    business_impact: str
+    key_metrics: tuple  # ((metric_name, value), ...)
+    techniques: tuple
+    key_findings: tuple
+    visualizations: tuple
+    details: MappingProxyType
+
+    @property
+    def label(self):
+        """Selectbox label, e.g. 'Excel — Telco Customer Churn Analysis'."""
+        return f"{self.category} — {self.name}"
+
+    def metrics_dict(self):
+        return dict(self.key_metrics)
+
+
+@dataclass(frozen=True, slots=True)
+class KnowledgeBase:
+    version: str  # content hash of the source data
+    assistant_name: str
+    owner_name: str
+    owner_role: str
+    persona: str
+    greeting_message: str
+    summary: MappingProxyType
+    faq: MappingProxyType
+    skills_matrix: MappingProxyType
+    technical_details: MappingProxyType
+    key_business_outcomes: tuple
+    projects: tuple
+    categories: tuple
+    by_url: MappingProxyType
+    by_key: MappingProxyType  # (category, name) -> Project
+    by_label: MappingProxyType  # "Category — Name" -> Project
+    by_category: MappingProxyType  # category -> (Project, ...)
+    by_technique: MappingProxyType  # lowercased technique -> (Project, ...)
+
+    def projects_in(self, category=None):
+        """All projects, or only those in `category` ("All"/None means every category)."""
+        if category in (None, "All"):
+            return self.projects
+        return self.by_category.get(category, ())
+
+
+def _project_from_raw(category, name, raw):
+    techniques = tuple(t for f in _TECHNIQUE_FIELDS for t in raw.get(f, []))
+    findings = tuple(t for f in _FINDING_FIELDS for t in raw.get(f, []))
+    metrics = raw.get("key_metrics", {})
+    return Project(
+        category=category,
+        name=name,
+        url=raw.get("url", ""),
+        objective=raw.get("objective", ""),
+        dataset_size=raw.get("dataset_size") or raw.get("dataset", ""),
+        business_impact=raw.get("business_impact", ""),
+        key_metrics=tuple(metrics.items()) if isinstance(metrics, dict) else (),
+        techniques=techniques,
+        key_findings=findings,
+        visualizations=tuple(raw.get("visualizations", [])),
+        details=MappingProxyType({k: v for k, v in raw.items() if k not in _CORE_FIELDS}),
+    )
+
+
+def content_version(raw_bytes):
+    return hashlib.sha256(raw_bytes).hexdigest()[:12]
+
+
+def build_knowledge_base(data, version=None):
+    """Build a KnowledgeBase from the raw context dict."""
+    if version is None:
+        version = content_version(json.dumps(data, sort_keys=True).encode("utf-8"))
+    projects = []
+    by_category = {}
+    for category, items in data.get("projects_detailed", {}).items():
+        cat_projects = tuple(_project_from_raw(category, name, raw) for name, raw in items.items())
+        by_category[category] = cat_projects
+        projects.extend(cat_projects)
+
+    by_technique = {}
+    for p in projects:
+        for t in p.techniques:
+            by_technique.setdefault(t.lower(), []).append(p)
+
+    return KnowledgeBase(
+        version=version,
+        assistant_name=data.get("assistant_name", "Portfoli-AI"),
+        owner_name=data.get("owner_name", ""),
+        owner_role=data.get("owner_role", ""),
+        persona=data.get("persona", ""),
+        greeting_message=data.get("greeting_message", ""),
+        summary=MappingProxyType(dict(data.get("summary", {}))),
+        faq=MappingProxyType(dict(data.get("faq", {}))),
+        skills_matrix=MappingProxyType(dict(data.get("skills_matrix", {}))),
+        technical_details=MappingProxyType(dict(data.get("technical_details", {}))),
+        key_business_outcomes=tuple(data.get("key_business_outcomes", [])),
+        projects=tuple(projects),
+        categories=tuple(by_category),
+        by_url=MappingProxyType({p.url: p for p in projects}),
+        by_key=MappingProxyType({(p.category, p.name): p for p in projects}),
+        by_label=MappingProxyType({p.label: p for p in projects}),
+        by_category=MappingProxyType(by_category),
+        by_technique=MappingProxyType({t: tuple(ps) for t, ps in by_technique.items()}),
+    )
+
+
+def parse_context_bytes(raw_bytes, path):
+    """Parse raw context data; .yaml/.yml files need PyYAML, everything else is JSON."""
+    if path.endswith((".yaml", ".yml")):
+        import yaml  # optional; only needed for YAML knowledge bases
+        return yaml.safe_load(raw_bytes)
+    return json.loads(raw_bytes)
+
+
+def knowledge_base_path(path=None):
+    return path or os.getenv("PORTFOLI_KB_PATH") or DEFAULT_KB_PATH
+
+
+def load_knowledge_base(path=None):
+    """Load the knowledge base from `path`, $PORTFOLI_KB_PATH, or robi_context.json."""
+    path = knowledge_base_path(path)
+    with open(path, "rb") as f:
+        raw = f.read()
+    return build_knowledge_base(parse_context_bytes(raw, path), version=content_version(raw))
+
+
+class KnowledgeBaseWatcher:
+    """
+    Polls the knowledge-base file's mtime (at most every `poll_interval` seconds)
+    and swaps in a freshly built KnowledgeBase when its content hash changes.
+    Readers always get a complete snapshot; a file that fails to parse (e.g. caught
+    mid-write) is ignored and the previous version keeps serving.
+    """
+
+    def __init__(self, path=None, poll_interval=2.0):
+        self.path = knowledge_base_path(path)
+        self.poll_interval = poll_interval
+        self.lock = threading.Lock()
+        self.mtime = self._stat_mtime()
+        self.kb = load_knowledge_base(self.path)
+        self.checked = time.monotonic()
+        self.reloads = 0
+
+    def _stat_mtime(self):
+        try:
+            return os.stat(self.path).st_mtime_ns
+        except OSError:
+            return None
+
+    def current(self):
+        """Latest KnowledgeBase, reloading first if the file changed."""
+        now = time.monotonic()
+        if now - self.checked < self.poll_interval:
+            return self.kb
+        with self.lock:
+            self.checked = now
+            mtime = self._stat_mtime()
+            if mtime is None or mtime == self.mtime:
+                return self.kb
+            try:
+                with open(self.path, "rb") as f:
+                    raw = f.read()
+                version = content_version(raw)
+                if version != self.kb.version:
+                    self.kb = build_knowledge_base(parse_context_bytes(raw, self.path), version=version)
+                    self.reloads += 1
+                    logger.info("Knowledge base reloaded: version %s", version)
+                self.mtime = mtime
+            except Exception as e:
+                logger.warning("Knowledge base reload failed, keeping %s: %s", self.kb.version, e)
+            return self.kb
@@ -0,0 +1,281 @@
+"""
+Concurrent-session load test for app.py.
+Starts the app on a local Streamlit server with Groq, the GitHub README fetch and
+gTTS replaced by the fakes in fakes.py (configurable latency), then drives N
+concurrent visitors over the same websocket protocol the browser uses. Each
+visitor loads the page, picks a project, switches chat mode, turns TTS on and
+chats. For each concurrency level it reports rerun latency percentiles plus the
+server's CPU use and resident memory per session (Linux /proc).
+Needs the development requirements (websockets): pip install -r requirements-dev.txt
+
+    python loadtest.py --sessions 1,5,10,20 --messages 4 --groq-latency 0.8
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+QUESTIONS = (
+    "Explain this project",
+    "What were the key findings?",
+    "What is the highest churn rate?",
+    "Show me the SQL query",
+    "Compare Excel vs Power BI project counts",
+    "How would you improve this analysis?",
+    "What was the business impact?",
+)
+
+
+def install_fakes(groq_latency, github_latency, tts_latency, jitter):
+    """Swap the external services for fakes.py stand-ins (the app imports them lazily, so patching works)."""
+    import functools
+
+    import groq
+    import gtts
+    import requests
+
+    from fakes import FakeGTTS, FakeGroq, fake_readme_get
+
+    groq.Groq = functools.partial(FakeGroq, latency=groq_latency, jitter=jitter)
+    requests.get = fake_readme_get(latency=github_latency, jitter=jitter)
+    FakeGTTS.latency = tts_latency
+    gtts.gTTS = FakeGTTS
+
+
+def serve(port, args):
+    """Run app.py on `port` with the fakes installed (the --serve child process)."""
+    from streamlit.web import bootstrap
+
+    install_fakes(args.groq_latency, args.github_latency, args.tts_latency, args.jitter)
+    flags = {"server.port": port, "server.headless": True, "browser.gatherUsageStats": False}
+    bootstrap.load_config_options(flags)
+    bootstrap.run(APP_PATH, False, [], flags)
+
+
+# -----------------------------
+# Server process
+# -----------------------------
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(args):
+    """Spawn the fake-backed app server and wait for its health check; returns (process, port)."""
+    port = free_port()
+    cmd = [
+        sys.executable, os.path.abspath(__file__), "--serve", str(port),
+        "--groq-latency", str(args.groq_latency), "--github-latency", str(args.github_latency),
+        "--tts-latency", str(args.tts_latency), "--jitter", str(args.jitter),
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"app server exited: {proc.stderr.read()[-2000:]}")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1) as r:
+                if r.status == 200:
+                    return proc, port
+        except OSError:
+            time.sleep(0.2)
+    proc.kill()
+    raise RuntimeError("app server did not become healthy within 60s")
+
+
+def proc_usage(pid):
+    """(cpu seconds, rss MB) for a process from /proc, or (None, None) off Linux."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+        cpu = (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+        with open(f"/proc/{pid}/status") as f:
+            rss = next(int(line.split()[1]) for line in f if line.startswith("VmRSS:")) / 1024
+        return cpu, rss
+    except (OSError, StopIteration, IndexError, ValueError):
+        return None, None
+
+
+# -----------------------------
+# Websocket visitor
+# -----------------------------
+WIDGET_TYPES = ("selectbox", "radio", "checkbox", "chat_input")
+
+
+class Visitor:
+    """
+    One browser tab. Mirrors what the frontend does: keeps every widget's current
+    value and sends all of them with each rerun (triggers only once), scoping the
+    rerun to the widget's fragment like the browser does.
+    """
+
+    def __init__(self, ws, rng):
+        self.ws = ws
+        self.rng = rng
+        self.widgets = {}  # (type, label) -> (id, options, fragment_id)
+        self.values = {}  # widget id -> WidgetState
+        self.latencies = []
+        self.errors = []
+
+    async def rerun(self, trigger=None, fragment_id=""):
+        from streamlit.proto.BackMsg_pb2 import BackMsg
+        from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+        msg = BackMsg()
+        msg.rerun_script.query_string = ""
+        msg.rerun_script.page_script_hash = ""
+        msg.rerun_script.fragment_id = fragment_id
+        states = list(self.values.values()) + ([trigger] if trigger is not None else [])
+        msg.rerun_script.widget_states.widgets.extend(states)
+
+        started = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            fwd = ForwardMsg()
+            fwd.ParseFromString(await asyncio.wait_for(self.ws.recv(), 120))
+            kind = fwd.WhichOneof("type")
+            if kind == "delta" and fwd.delta.WhichOneof("type") == "new_element":
+                self._note_element(fwd.delta)
+            elif kind == "script_finished" and fwd.script_finished != ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                break
+        self.latencies.append(time.perf_counter() - started)
+
+    def _note_element(self, delta):
+        element = delta.new_element
+        kind = element.WhichOneof("type")
+        if kind == "exception":
+            self.errors.append(f"{element.exception.type}: {element.exception.message}")
+        elif kind in WIDGET_TYPES:
+            w = getattr(element, kind)
+            label = getattr(w, "label", "") or getattr(w, "placeholder", "")  # chat_input has no label
+            self.widgets[(kind, label)] = (w.id, list(getattr(w, "options", [])), delta.fragment_id)
+
+    def _find(self, kind, label):
+        return next(((k, v) for k, v in self.widgets.items() if k[0] == kind and label in k[1]), (None, None))[1]
+
+    async def set_value(self, kind, label, field, value):
+        from streamlit.proto.WidgetStates_pb2 import WidgetState
+
+        found = self._find(kind, label)
+        if found is None:
+            self.errors.append(f"no {kind} labelled {label!r}")
+            return
+        widget_id, _, fragment_id = found
+        state = WidgetState(id=widget_id)
+        if field == "chat_input_value":
+            state.chat_input_value.data = value
+            await self.rerun(trigger=state, fragment_id=fragment_id)
+            return
+        setattr(state, field, value)
+        self.values[widget_id] = state
+        await self.rerun(fragment_id=fragment_id)
+
+    async def visit(self, messages):
+        await self.rerun()
+        project = self._find("selectbox", "Choose a project")
+        if project:
+            await self.set_value("selectbox", "Choose a project", "string_value", self.rng.choice(project[1][1:]))
+        mode = self._find("radio", "Chat mode")
+        if mode:
+            await self.set_value("radio", "Chat mode", "string_value", self.rng.choice(mode[1]))
+        await self.set_value("checkbox", "TTS", "bool_value", True)
+        for _ in range(messages):
+            await self.set_value("chat_input", "Type your message", "chat_input_value", self.rng.choice(QUESTIONS))
+
+
+async def run_visitors(port, sessions, messages, seed):
+    import websockets
+
+    async def one(i):
+        visitor = Visitor(None, random.Random(seed + i))
+        try:
+            async with websockets.connect(
+                f"ws://127.0.0.1:{port}/_stcore/stream", subprotocols=["streamlit"], max_size=None
+            ) as ws:
+                visitor.ws = ws
+                await visitor.visit(messages)
+        except Exception as e:
+            visitor.errors.append(f"{type(e).__name__}: {e}")
+        return visitor
+
+    return await asyncio.gather(*(one(i) for i in range(sessions)))
+
+
+def run_level(args, sessions):
+    """Fresh server per level so memory and cache state don't carry over."""
+    proc, port = start_server(args)
+    try:
+        cpu_before, rss_before = proc_usage(proc.pid)
+        started = time.perf_counter()
+        visitors = asyncio.run(run_visitors(port, sessions, args.messages, args.seed))
+        wall = time.perf_counter() - started
+        cpu_after, rss_after = proc_usage(proc.pid)
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+    latencies = [t for v in visitors for t in v.latencies] or [0.0]
+    quantiles = statistics.quantiles(latencies, n=100, method="inclusive") if len(latencies) > 1 else latencies * 99
+    measured = cpu_before is not None and cpu_after is not None
+    return {
+        "sessions": sessions,
+        "reruns": sum(len(v.latencies) for v in visitors),
+        "p50_ms": quantiles[49] * 1000,
+        "p90_ms": quantiles[89] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "max_ms": max(latencies) * 1000,
+        "cpu_pct": 100 * (cpu_after - cpu_before) / wall if measured else float("nan"),
+        "rss_mb": rss_after if measured else float("nan"),
+        "rss_per_session_mb": max(rss_after - rss_before, 0.0) / sessions if measured else float("nan"),
+        "errors": [e for v in visitors for e in v.errors],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Simulate concurrent visitors against app.py.")
+    parser.add_argument("--sessions", default="1,5,10", help="comma-separated concurrency levels")
+    parser.add_argument("--messages", type=int, default=3, help="chat messages per session")
+    parser.add_argument("--groq-latency", type=float, default=0.5)
+    parser.add_argument("--github-latency", type=float, default=0.2)
+    parser.add_argument("--tts-latency", type=float, default=0.3)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Isolated caches: every run starts cold and leaves nothing behind (inherited by the server)
+    os.environ.setdefault("PORTFOLI_CACHE_DIR", tempfile.mkdtemp(prefix="portfoli-loadtest-"))
+    os.environ.setdefault("PORTFOLI_CACHE_URL", "memory://")
+    os.environ.setdefault("GROQ_API_KEY", "gsk_loadtest")
+    os.environ.setdefault("GROQ_RPM", "100000")
+    os.environ.setdefault("GROQ_TPM", "100000000")
+    if args.serve:
+        serve(args.serve, args)
+        return 0
+
+    print(f"{'sessions':>8} {'reruns':>7} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'max ms':>8} "
+          f"{'cpu %':>6} {'rss MB':>7} {'MB/sess':>8}")
+    failed = False
+    for level in (int(n) for n in args.sessions.split(",")):
+        r = run_level(args, level)
+        print(f"{r['sessions']:>8} {r['reruns']:>7} {r['p50_ms']:>8.0f} {r['p90_ms']:>8.0f} {r['p99_ms']:>8.0f} "
+              f"{r['max_ms']:>8.0f} {r['cpu_pct']:>6.0f} {r['rss_mb']:>7.0f} {r['rss_per_session_mb']:>8.1f}")
+        for message in sorted(set(r["errors"]))[:3]:
+            print(f"         error: {message}")
+        failed |= bool(r["errors"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
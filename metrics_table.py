@@ -0,0 +1,209 @@
+"""
+Numeric view of every project's key_metrics.
+Free-text values like "26.5%", "$2.3M" or "7,043 customer records" are parsed once
+at load time into typed columns of a pandas DataFrame, and MetricsTable answers
+max/min/sort/compare questions from it locally instead of asking the LLM.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from answer_engine import METRIC_STOPWORDS
+
+_NUMBER = r"(\d[\d,]*(?:\.\d+)?)"
+_CURRENCY_RE = re.compile(r"^[~+]?\s*([$₹€£])\s?" + _NUMBER + r"\s*([KMB])?\b")
+_PERCENT_RE = re.compile(r"^[~+]?" + _NUMBER + r"\s*%")
+_COUNT_RE = re.compile(r"^[~+]?" + _NUMBER + r"\s*(x\b|[A-Za-z]+)?")
+# "$0 - $10,000", "4.62-5.41%", "10 to 15%": no single value to rank
+_RANGE_RE = re.compile(r"^[~+]?\s*[$₹€£]?\s?" + _NUMBER + r"\s*[KMB%]?\s*(?:-|–|to)\s*[$₹€£]?\s?\d")
+_SHARE_RE = re.compile(r"\(" + _NUMBER + r"%\)")
+_SCALE = {"K": 1e3, "M": 1e6, "B": 1e9}
+
+# Query vocabulary
+# Only words that ask for a numeric ordering ("most", "best", "top", "list" are too common)
+_MAX_WORDS = {"highest", "max", "maximum", "largest", "biggest", "peak"}
+_MIN_WORDS = {"lowest", "min", "minimum", "smallest"}
+_SORT_WORDS = {"rank", "ranking", "sort", "sorted"}
+_COMPARE_WORDS = {"compare", "comparison", "vs", "versus", "difference"}
+_SYNONYMS = {
+    "dataset": "dataset_size", "datasets": "dataset_size", "records": "dataset_size", "size": "dataset_size",
+    "sizes": "dataset_size", "attrition": "attrition", "churn": "churn", "revenue": "revenue",
+    "sales": "sales", "price": "price", "bill": "bill", "claim": "claim", "claims": "claims",
+    "turnover": "turnover", "mortality": "mortality", "recovery": "recovery", "subscription": "subscription",
+    "loan": "loan", "loans": "loans", "tenure": "tenure", "stay": "stay", "roi": "roi",
+}
+_GENERIC_TOKENS = {"rate", "avg", "total", "overall", "of", "the", "a", "in", "and"}
+
+
+def parse_metric_value(raw):
+    """
+    Parse one free-text metric into (value, kind, unit, share_pct).
+    kind is 'percent', 'currency', 'count', 'number' or 'text' (value NaN).
+    """
+    text = str(raw).strip()
+    share = _SHARE_RE.search(text)
+    share_pct = float(share.group(1).replace(",", "")) if share else np.nan
+    if _RANGE_RE.match(text):
+        return np.nan, "text", "", share_pct
+
+    m = _CURRENCY_RE.match(text)
+    if m:
+        value = float(m.group(2).replace(",", "")) * _SCALE.get(m.group(3) or "", 1.0)
+        return value, "currency", m.group(1), share_pct
+    m = _PERCENT_RE.match(text)
+    if m:
+        return float(m.group(1).replace(",", "")), "percent", "%", np.nan
+    m = _COUNT_RE.match(text)
+    if m:
+        number = m.group(1).replace(",", "")
+        unit = (m.group(2) or "").lower()
+        kind = "count" if "." not in number and unit not in ("x", "days", "months") else "number"
+        return float(number), kind, unit, share_pct
+    return np.nan, "text", "", share_pct
+
+
+def _metric_tokens(metric):
+    return tuple(t for t in metric.lower().split("_") if t)
+
+
+def build_metrics_table(kb):
+    """One row per (project, metric), plus a dataset_size row per project."""
+    rows = []
+    for p in kb.projects:
+        items = list(p.key_metrics)
+        if p.dataset_size:
+            items.append(("dataset_size", p.dataset_size))
+        for metric, raw in items:
+            value, kind, unit, share_pct = parse_metric_value(raw)
+            rows.append({
+                "category": p.category,
+                "project": p.name,
+                "url": p.url,
+                "metric": metric,
+                "raw": raw,
+                "value": value,
+                "kind": kind,
+                "unit": unit,
+                "share_pct": share_pct,
+            })
+    df = pd.DataFrame(rows)
+    df["kind"] = df["kind"].astype("category")
+    df["tokens"] = df["metric"].map(_metric_tokens)
+    return MetricsTable(df)
+
+
+class MetricsTable:
+    """
+    Small query engine over the normalized metrics DataFrame.
+    Token -> row-mask arrays are precomputed so a query is a few NumPy ops.
+    """
+
+    def __init__(self, df):
+        self.df = df
+        numeric = df[df["kind"] != "text"].reset_index(drop=True)
+        self.numeric = numeric
+        self.values = numeric["value"].to_numpy()
+        self.projects = numeric["project"].to_numpy()
+        self.urls = numeric["url"].to_numpy()
+        self.records = numeric.to_dict("records")
+        # Like is only compared with like: currencies by symbol, everything else by kind
+        self.groups = np.where(numeric["kind"] == "currency", numeric["unit"], numeric["kind"].astype(str))
+        self.token_masks = {}
+        for i, toks in enumerate(numeric["tokens"]):
+            for t in toks:
+                self.token_masks.setdefault(t, np.zeros(len(numeric), dtype=bool))[i] = True
+        self.vocabulary = {
+            t for t in self.token_masks
+            if t not in _GENERIC_TOKENS | METRIC_STOPWORDS | _MAX_WORDS | _MIN_WORDS and not t.isdigit()
+        }
+
+    def match(self, question):
+        """Row indices (into self.numeric) whose metric name best matches the question."""
+        words = re.findall(r"[a-z0-9]+", question.lower())
+        wanted = set()
+        for w in words:
+            w = _SYNONYMS.get(w, w)
+            if w == "dataset_size":
+                wanted.update(("dataset", "size"))
+            elif w in self.vocabulary:
+                wanted.add(w)
+            elif w.endswith("s") and w[:-1] in self.vocabulary:
+                wanted.add(w[:-1])
+        if not wanted:
+            return np.array([], dtype=int)
+        scores = np.zeros(len(self.numeric))
+        for w in wanted:
+            scores += self.token_masks[w]
+        for w in set(words) & _GENERIC_TOKENS:
+            if w in self.token_masks:
+                scores += 0.1 * self.token_masks[w]
+        best = scores.max()
+        if best < 1:
+            return np.array([], dtype=int)
+        idx = np.flatnonzero(scores == best)
+        labels, counts = np.unique(self.groups[idx], return_counts=True)
+        return idx[self.groups[idx] == labels[counts.argmax()]]
+
+    def _sorted(self, idx, ascending=False):
+        order = np.argsort(self.values[idx], kind="stable")
+        return idx[order] if ascending else idx[order[::-1]]
+
+    def answer(self, question, projects=None):
+        """
+        Answer a superlative/sort/compare question locally.
+        Returns markdown text, or None if the question isn't a confident numeric query.
+        `projects` (repository URLs) restricts the comparison to those projects, and only
+        metrics every one of them reports are ranked.
+        """
+        words = set(re.findall(r"[a-z]+", question.lower()))
+        if words & _MAX_WORDS:
+            op = "max"
+        elif words & _MIN_WORDS:
+            op = "min"
+        elif words & (_COMPARE_WORDS | _SORT_WORDS):
+            op = "sort"
+        else:
+            return None
+
+        idx = self.match(question)
+        if projects:
+            idx = idx[np.isin(self.urls[idx], list(projects))]
+        if len(idx) < 2:
+            return None
+
+        # Values are only ranked against the same metric: "highest" across different metrics means nothing
+        by_metric = {}
+        for i in self._sorted(idx):
+            by_metric.setdefault(self.records[i]["metric"], []).append(self.records[i])
+        ranked = {
+            metric: rows for metric, rows in by_metric.items()
+            if len(rows) >= 2 and set(projects or ()) <= {r["url"] for r in rows}
+        }
+        if not ranked:
+            return None
+
+        lines = []
+        for metric, rows in ranked.items():
+            if lines:
+                lines.append("")
+            if op in ("max", "min"):
+                row = rows[0] if op == "max" else rows[-1]
+                label = "Highest" if op == "max" else "Lowest"
+                lines += [f"**{label} `{metric}`:** {row['project']} ({row['category']}) — {row['raw']}", "", "All projects:"]
+            else:
+                lines += [f"**`{metric}` across projects (highest first):**", ""]
+            lines += [f"- {r['project']} ({r['category']}): {r['raw']}" for r in rows]
+        return "\n".join(lines)
+
+    def prompt_rows(self, question, limit=12):
+        """Matching normalized rows as a compact markdown table for the LLM prompt."""
+        idx = self.match(question)
+        if not len(idx):
+            return ""
+        lines = ["| Project | Metric | Value | Kind |", "|---|---|---|---|"]
+        for i in self._sorted(idx)[:limit]:
+            r = self.records[i]
+            lines.append(f"| {r['project']} | {r['metric']} | {r['value']:g}{'%' if r['kind'] == 'percent' else ''} | {r['kind']} |")
+        return "\n".join(lines)
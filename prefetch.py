@@ -0,0 +1,105 @@
+"""
+Speculative pre-generation of answers to likely follow-up questions.
+Right after a project is selected the next question is predictable ("Explain
+this project", ...). A small background pool generates those answers while the
+Groq budget has spare capacity, so that first question becomes a cache hit.
+"""
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from rate_limiter import TokenBucket, estimate_tokens
+
+DEFAULT_FOLLOWUPS = (
+    "Explain this project",
+    "What were the key findings?",
+    "What was the business impact?",
+)
+
+
+def followup_prompts():
+    """Follow-ups to pre-generate; PORTFOLI_PREFETCH_PROMPTS overrides them ('|'-separated)."""
+    raw = os.getenv("PORTFOLI_PREFETCH_PROMPTS")
+    if not raw:
+        return DEFAULT_FOLLOWUPS
+    return tuple(p.strip() for p in raw.split("|") if p.strip())
+
+
+class SpeculativeCache:
+    """
+    Process-wide store of pre-generated answers, keyed like the session response cache.
+    `generate(messages)` must return (text, usage) and is called from worker threads.
+    Spending is capped by its own hourly token allowance and by GroqBudget.acquire_spare,
+    so speculation never takes capacity a live request could use.
+    """
+
+    def __init__(self, generate, budget, tokens_per_hour=20000, workers=1, max_tokens=800, max_entries=512):
+        self.generate = generate
+        self.budget = budget
+        self.allowance = TokenBucket(tokens_per_hour, tokens_per_hour / 3600.0)
+        self.max_tokens = max_tokens
+        self.max_entries = max_entries
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="prefetch")
+        self.lock = threading.Lock()
+        self.answers = OrderedDict()
+        self.pending = set()
+        self.stats = {
+            "scheduled": 0,
+            "generated": 0,
+            "skipped_budget": 0,
+            "errors": 0,
+            "hits": 0,
+            "misses": 0,
+            "tokens_used": 0,
+        }
+
+    def schedule(self, key, messages):
+        """Queue one pre-generation unless it is cached, in flight, or over the allowance."""
+        with self.lock:
+            if key in self.answers or key in self.pending:
+                return False
+            self.pending.add(key)
+            self.stats["scheduled"] += 1
+        self.executor.submit(self._run, key, messages)
+        return True
+
+    def _run(self, key, messages):
+        estimated = estimate_tokens(messages, self.max_tokens)
+        try:
+            with self.lock:
+                if self.allowance.wait_time(estimated, time.monotonic()) > 0:
+                    self.stats["skipped_budget"] += 1
+                    return
+                self.allowance.take(estimated)
+            if not self.budget.acquire_spare(estimated):
+                with self.lock:
+                    self.stats["skipped_budget"] += 1
+                return
+            text, usage = self.generate(messages)
+            self.budget.record_usage(usage, estimated)
+            total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(usage, "total_tokens", None)
+            with self.lock:
+                self.answers[key] = text
+                while len(self.answers) > self.max_entries:
+                    self.answers.popitem(last=False)
+                self.stats["generated"] += 1
+                self.stats["tokens_used"] += total or estimated
+        except Exception:
+            with self.lock:
+                self.stats["errors"] += 1
+        finally:
+            with self.lock:
+                self.pending.discard(key)
+
+    def get(self, key):
+        with self.lock:
+            text = self.answers.get(key)
+            self.stats["hits" if text is not None else "misses"] += 1
+            return text
+
+    def snapshot(self):
+        with self.lock:
+            return {"cached": len(self.answers), "in_flight": len(self.pending), **self.stats}
@@ -0,0 +1,161 @@
+"""
+Pre-rendered project cards.
+Each card (metadata from the knowledge base + README preview + code-block summary)
+is rendered once to markdown and stored under the key "<kb version>:<README ETag>",
+so showing a card is a dictionary lookup. Cards are persisted to
+.cache/project_cards.json; run this module to (re)build all of them:
+
+    python project_cards.py
+"""
+
+import json
+import os
+import re
+import threading
+from collections import Counter
+
+from knowledge_base import CACHE_DIR
+from readmes import fetch_readme
+
+CARDS_PATH = os.path.join(CACHE_DIR, "project_cards.json")
+PREVIEW_LINES = 20
+
+_FENCE_RE = re.compile(r"```([\w\-\+]+)?\n(.*?)```", re.DOTALL | re.IGNORECASE)
+
+
+def card_key(kb_version, etag):
+    return f"{kb_version}:{etag or 'none'}"
+
+
+def code_summary(readme_text):
+    """e.g. '3 × sql, 1 × dax' for the fenced blocks in a README."""
+    langs = Counter((m.group(1) or "code").lower() for m in _FENCE_RE.finditer(readme_text or ""))
+    return ", ".join(f"{n} × {lang}" for lang, n in langs.most_common())
+
+
+def render_card(project, readme_text):
+    """Markdown for the selected-project card."""
+    lines = [
+        f"### 📁 {project.name}",
+        f"**Category:** {project.category}  ",
+        f"🔗 **Repo:** [{project.url}]({project.url})",
+    ]
+    if readme_text:
+        preview = "\n".join(readme_text.splitlines()[:PREVIEW_LINES])
+        lines += ["", "---", "**README preview:**", "", "````markdown", preview, "````"]
+        summary = code_summary(readme_text)
+        if summary:
+            lines.append(f"**Code in README:** {summary}")
+    return "\n".join(lines)
+
+
+class ProjectCardStore:
+    """
+    url -> {"key", "etag", "markdown", "readme"}.
+    Cards whose knowledge-base version is stale are re-rendered from the stored
+    README without refetching it. With a `cache` (a cache_backend.Namespace),
+    cards are written through to it and misses are looked up there, so workers
+    share fetched READMEs. With a `store` (a content_store.ContentStore), README
+    and card text is interned so it is held once however it was loaded.
+    """
+
+    def __init__(self, kb, path=CARDS_PATH, cache=None, store=None):
+        self.kb = kb
+        self.path = path
+        self.cache = cache
+        self.store = store
+        self.lock = threading.Lock()
+        self.cards = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                stored = json.load(f).get("cards", {})
+        except (OSError, ValueError):
+            return
+        for url, card in stored.items():
+            project = self.kb.by_url.get(url)
+            if project is None or (card.get("readme") is None and card.get("etag") is None):
+                continue  # older files persisted failed fetches; leave them to be retried
+            if card.get("key") != card_key(self.kb.version, card.get("etag")):
+                card = self._render(project, card.get("readme"), card.get("etag"))
+            self.cards[url] = self._intern(card)
+
+    def _intern(self, card):
+        if self.store is not None:
+            card = {**card, "markdown": self.store.intern(card.get("markdown")), "readme": self.store.intern(card.get("readme"))}
+        card.pop("preview", None)  # older card files; the preview is part of "markdown"
+        return card
+
+    def _render(self, project, readme_text, etag):
+        return self._intern({
+            "key": card_key(self.kb.version, etag),
+            "etag": etag,
+            "markdown": render_card(project, readme_text),
+            "readme": readme_text,
+        })
+
+    def get(self, url):
+        card = self.cards.get(url)
+        if card is None and self.cache is not None and url in self.kb.by_url:
+            card = self.cache.get(url)
+            if card is not None:
+                if card.get("key") != card_key(self.kb.version, card.get("etag")):
+                    card = self._render(self.kb.by_url[url], card.get("readme"), card.get("etag"))
+                else:
+                    card = self._intern(card)
+                with self.lock:
+                    self.cards[url] = card
+        return card
+
+    def put(self, url, readme_text, etag=None, persist=True):
+        """Render and store a card; with persist=False it is kept in memory only (not shared, not saved)."""
+        project = self.kb.by_url.get(url)
+        if project is None:
+            return None
+        card = self._render(project, readme_text, etag)
+        if not persist:
+            card["unfetched"] = True
+        with self.lock:
+            self.cards[url] = card
+        if self.cache is not None and persist:
+            self.cache.set(url, card)
+        return card
+
+    def refresh(self, url):
+        """Revalidate one README against its stored ETag and re-render if it changed."""
+        old = self.get(url) or {}
+        text, etag = fetch_readme(url, etag=old.get("etag"))
+        if text is None and old and not old.get("unfetched"):
+            return old  # 304 unchanged, or the fetch failed: keep the card we have
+        # A failed fetch (network error, 404) still gets a card for now, but a later run retries it
+        return self.put(url, text, etag, persist=text is not None)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self.lock:
+            cards = {url: card for url, card in self.cards.items() if not card.get("unfetched")}
+            payload = {"version": self.kb.version, "cards": cards}
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(payload, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+
+def build_all(kb, path=CARDS_PATH):
+    """Render every project's card (revalidating READMEs by ETag) and persist them."""
+    store = ProjectCardStore(kb, path)
+    for project in kb.projects:
+        store.refresh(project.url)
+    store.save()
+    return store
+
+
+if __name__ == "__main__":
+    from knowledge_base import load_knowledge_base
+
+    kb = load_knowledge_base()
+    store = build_all(kb)
+    with_readme = sum(1 for c in store.cards.values() if c.get("readme"))
+    print(f"Rendered {len(store.cards)} cards ({with_readme} with README) for KB {kb.version} -> {store.path}")
@@ -0,0 +1,68 @@
+"""
+Prompt context for questions that span several projects.
+The READMEs of every project a comparison mentions are loaded concurrently from
+the shared card store (fetching only on a miss), so the added latency is that of
+the slowest README rather than their sum. The most relevant sections of each are
+then packed into an even share of a token budget.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+
+from embeddings import split_readme_sections
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def load_cards(store, projects, max_workers=4):
+    """{url: card} for `projects`, loaded in parallel; misses are fetched and stored once."""
+    def load(project):
+        return project.url, store.get(project.url) or store.refresh(project.url) or {}
+
+    missing = [p for p in projects if store.get(p.url) is None]
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(projects)))) as pool:
+        cards = dict(pool.map(load, projects))
+    if missing:
+        try:
+            store.save()
+        except OSError:
+            pass
+    return cards
+
+
+def relevant_sections(readme_text, question, max_chars):
+    """README sections ranked by word overlap with the question, packed into max_chars."""
+    words = set(_WORD_RE.findall(question.lower()))
+    sections = split_readme_sections(readme_text)
+    ranked = sorted(
+        enumerate(sections),
+        key=lambda item: (-len(words & set(_WORD_RE.findall(item[1].lower()))), item[0]),
+    )
+    picked, used = [], 0
+    for _, section in ranked:
+        if used >= max_chars:
+            break
+        section = section[: max_chars - used]
+        picked.append(section)
+        used += len(section)
+    return picked
+
+
+def comparison_context(store, projects, question, token_budget=1500):
+    """Prompt block with metadata and README excerpts for each project, within token_budget (~4 chars/token)."""
+    cards = load_cards(store, projects)
+    share = token_budget * 4 // max(len(projects), 1)
+    blocks = []
+    for p in projects:
+        metrics = ", ".join(f"{k}={v}" for k, v in p.key_metrics)
+        header = (
+            f"### {p.name} ({p.category})\n"
+            f"Dataset: {p.dataset_size or 'N/A'}. Objective: {p.objective or 'N/A'}\n"
+            f"Key metrics: {metrics or 'N/A'}\n"
+            f"Techniques: {', '.join(p.techniques) or 'N/A'}"
+        )
+        excerpts = relevant_sections(cards[p.url].get("readme"), question, max(share - len(header), 0))
+        if excerpts:
+            header += "\nREADME excerpts:\n" + "\n\n".join(excerpts)
+        blocks.append(header[:share] if share else header)
+    return "**PROJECTS IN THIS COMPARISON**\n\n" + "\n\n".join(blocks)
@@ -0,0 +1,203 @@
+"""
+Autocomplete and typo-tolerant project lookup.
+Built once per knowledge-base version from project names, categories, techniques
+and metric names. A prefix trie (each node keeps its best completions, so a lookup
+is one walk down the typed prefix) serves suggestions; a trigram index resolves
+misspelled mentions such as "telco churm" to the right repository URL.
+"""
+
+import re
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Words that don't tell projects apart
+_GENERIC = {"analysis", "analytics", "dashboard", "project", "the", "of", "and", "a", "in", "data"}
+_KIND_WEIGHT = {"project": 0, "category": 1, "technique": 2, "metric": 3}  # lower sorts first
+_TOP_K = 8
+# Floor for a project named by a word no other project uses ("airbnb"); shorter words
+# ("time", "nyc") are too common in questions to name a project on their own
+_UNIQUE_WORD_SCORE = 0.75
+_UNIQUE_WORD_MIN_LEN = 5
+
+
+@dataclass(frozen=True, slots=True)
+class Entry:
+    term: str  # as displayed, e.g. "K-Means Clustering"
+    kind: str  # project | category | technique | metric
+    urls: tuple  # projects the term points to
+
+
+def _words(text):
+    return _WORD_RE.findall(text.lower())
+
+
+def trigrams(word):
+    padded = f"#{word}#"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def similarity(a, b):
+    """Dice coefficient of two trigram sets (1.0 = identical words)."""
+    if not a or not b:
+        return 0.0
+    return 2 * len(a & b) / (len(a) + len(b))
+
+
+class _Node:
+    __slots__ = ("children", "best")
+
+    def __init__(self):
+        self.children = {}
+        self.best = []  # [(rank, Entry)], kept sorted and capped at _TOP_K
+
+
+class ProjectSearch:
+    """Trie + trigram index over a KnowledgeBase; every lookup is in-memory and allocation-light."""
+
+    def __init__(self, kb):
+        self.kb = kb
+        self.root = _Node()
+        self.entries = self._entries(kb)
+        for entry in self.entries:
+            self._insert(entry)
+        # Trigram index over the distinctive words of each project name
+        self.name_words = {p.url: [w for w in _words(p.name) if w not in _GENERIC] or _words(p.name) for p in kb.projects}
+        self.word_df = {}  # name word -> number of projects using it
+        for words in self.name_words.values():
+            for w in set(words):
+                self.word_df[w] = self.word_df.get(w, 0) + 1
+        self.metric_vocab = {w for p in kb.projects for m, _ in p.key_metrics for w in m.lower().split("_")}
+        self.word_grams = {w: trigrams(w) for words in self.name_words.values() for w in words}
+        self.gram_words = {}
+        for word, grams in self.word_grams.items():
+            for g in grams:
+                self.gram_words.setdefault(g, set()).add(word)
+
+    @staticmethod
+    def _entries(kb):
+        merged = {}  # (kind, lowercased term) -> (term, [urls])
+
+        def add(term, kind, url):
+            term = term.replace("_", " ").strip()
+            if term:
+                urls = merged.setdefault((kind, term.lower()), (term, []))[1]
+                if url not in urls:
+                    urls.append(url)
+
+        for p in kb.projects:
+            add(p.name, "project", p.url)
+            add(p.category, "category", p.url)
+            for t in p.techniques:
+                add(t, "technique", p.url)
+            for m, _ in p.key_metrics:
+                add(m, "metric", p.url)
+        return [Entry(term, kind, tuple(urls)) for (kind, _), (term, urls) in merged.items()]
+
+    def _insert(self, entry):
+        rank = (_KIND_WEIGHT[entry.kind], -len(entry.urls), entry.term.lower())
+        lowered = entry.term.lower()
+        # Reachable from the start of every word: "churn" completes "Telco Customer Churn Analysis"
+        starts = {0} | {m.start() for m in re.finditer(r"(?<=[\s\-/])\w", lowered)}
+        seen = set()
+        for start in sorted(starts):
+            node = self.root
+            for ch in lowered[start:]:
+                node = node.children.setdefault(ch, _Node())
+                if id(node) in seen:
+                    continue
+                seen.add(id(node))
+                node.best.append((rank, entry))
+                node.best.sort(key=lambda item: item[0])
+                del node.best[_TOP_K:]
+
+    # ---- lookups ----
+    def complete(self, prefix, limit=_TOP_K):
+        """Entries whose term (or one of its words) starts with `prefix`, best first."""
+        node = self.root
+        for ch in " ".join(prefix.lower().split()):
+            node = node.children.get(ch)
+            if node is None:
+                return []
+        return [entry for _, entry in node.best[:limit]]
+
+    def _best_word(self, word):
+        """
+        (name word, similarity) closest to one typed word. Candidates come from shared
+        trigrams; the top few are rechecked with difflib so transpositions ("defualt") still match.
+        """
+        grams = trigrams(word)
+        candidates = {w for g in grams for w in self.gram_words.get(g, ())}
+        scored = sorted(((similarity(grams, self.word_grams[w]), w) for w in candidates), reverse=True)[:3]
+        best = (None, 0.0)
+        for dice, w in scored:
+            score = max(dice, SequenceMatcher(None, word, w).ratio())
+            if score > best[1]:
+                best = (w, score)
+        return best
+
+    def project_scores(self, text, min_word=0.75):
+        """
+        {url: score} for projects named (possibly misspelled) in `text`: the F1 of how much
+        of the project's name is covered and how many of the matched words belong to it.
+        """
+        return {url: score for url, (score, _) in self._scored(text, min_word).items()}
+
+    def _scored(self, text, min_word=0.75):
+        """{url: (score, name words hit)}; see project_scores."""
+        words = _words(text)
+        matched = {}  # typed word -> (name word, similarity)
+        for word in words:
+            if len(word) < 3 or word in _GENERIC:
+                continue
+            name_word, score = self._best_word(word)
+            if name_word and score >= min_word:
+                matched[word] = (name_word, score)
+        if not matched:
+            return {}
+        covered = {}
+        for name_word, score in matched.values():
+            covered[name_word] = max(covered.get(name_word, 0.0), score)
+        categories = {c for c in self.kb.categories if re.search(rf"\b{re.escape(c.lower())}\b", " ".join(words))}
+        scores = {}
+        for url, name_words in self.name_words.items():
+            hits = [w for w in name_words if w in covered]
+            unique = [w for w in hits if self.word_df[w] == 1]
+            # One shared word ("retail") or only metric words ("churn rate") don't name a project;
+            # a word no other project uses ("airbnb") does
+            if not unique and (len(hits) < 2 or set(hits) <= self.metric_vocab):
+                continue
+            recall = sum(covered[w] for w in hits) / len(name_words)
+            precision = sum(1 for nw, _ in matched.values() if nw in name_words) / len(matched)
+            score = 2 * precision * recall / (precision + recall)
+            if precision == 1 and any(len(w) >= _UNIQUE_WORD_MIN_LEN and w not in self.metric_vocab for w in unique):
+                score = max(score, _UNIQUE_WORD_SCORE)
+            if self.kb.by_url[url].category in categories:
+                score += 0.25
+            scores[url] = (score, frozenset(hits))
+        return scores
+
+    def resolve(self, text, min_score=0.6, margin=0.1):
+        """
+        Repository URL of the project `text` names (typos allowed), or None if absent or
+        ambiguous: a runner-up within `margin`, or one whose name has every word the best
+        match hit ("telco churn" fits three Telco projects), is a tie.
+        """
+        ranked = sorted(self._scored(text).items(), key=lambda item: -item[1][0])
+        if not ranked or ranked[0][1][0] < min_score:
+            return None
+        best_url, (best, hits) = ranked[0]
+        for _, (score, other_hits) in ranked[1:]:
+            if best - score < margin or hits <= other_hits:
+                return None
+        return best_url
+
+    def suggest(self, text, limit=6):
+        """Projects for a search box: trie completions first, then typo-tolerant matches."""
+        urls = []
+        for entry in self.complete(text, limit=_TOP_K):
+            urls += [u for u in entry.urls if u not in urls]
+        for url, _ in sorted(self.project_scores(text).items(), key=lambda us: -us[1]):
+            if url not in urls:
+                urls.append(url)
+        return [self.kb.by_url[u] for u in urls[:limit]]
@@ -0,0 +1,277 @@
+"""
+System-prompt assembly for Portfoli-AI.
+The prompt is a strictly static prefix (persona + portfolio + rules) that only
+changes with the knowledge-base version, followed by the volatile suffixes (chat
+mode, selected project). Keeping the prefix byte-identical across turns lets
+provider-side prefix/KV caching reuse it; PrefixRegistry tracks how often it does.
+
+The portfolio section comes in three precompiled profiles of increasing detail
+(compact: names only, standard: dataset + two metrics, full: every metric plus
+techniques and findings); choose_profile picks one from the query type and the
+token budget. Picking freely per request would make a session's system prompt
+flip between profiles and lose the cached prefix every time, so the app passes
+the session's current profile as a floor: a session only steps up (a comparison
+after small talk pays for the full profile from then on) and only a tight budget
+or latency cap steps it back down. The selected-project section is not part of
+the system prompt in the app either; it goes with the question-specific context.
+"""
+
+import hashlib
+import json
+import threading
+from collections import Counter, OrderedDict
+
+CHAT_MODES = ("General Assistant", "Business Analytics Assistant")
+PROFILES = ("compact", "standard", "full")
+# Smallest profile that serves each classify_user_query type well
+_PROFILE_FOR_QUERY = {
+    "general": "compact",
+    "code": "compact",  # code comes from the README, not the portfolio summary
+    "explanation": "standard",
+    "metrics": "standard",
+    "comparison": "full",
+}
+
+# Static prefixes for the live knowledge-base version: {(kb_version, profile): (text, hash)}
+_PREFIX_CACHE = {}
+
+
+def _project_line(proj, profile):
+    if profile == "compact":
+        return f"- {proj.name}\n"
+    line = f"- {proj.name}: {proj.dataset_size or 'N/A'}. "
+    metrics = proj.key_metrics if profile == "full" else proj.key_metrics[:2]
+    if metrics:
+        line += f"Key metrics: {', '.join([f'{k}={v}' for k,v in metrics])}. "
+    if profile == "full":
+        if proj.techniques:
+            line += f"Techniques: {', '.join(proj.techniques)}. "
+        if proj.key_findings:
+            line += f"Findings: {'; '.join(proj.key_findings)}. "
+        if proj.business_impact:
+            line += f"Impact: {proj.business_impact}. "
+    return line + f"GitHub: {proj.url or 'N/A'}\n"
+
+
+def _build_static_prefix(kb, profile="standard"):
+    # Base instruction - firm on accuracy
+    prefix = f"""You are {kb.assistant_name}, intelligent portfolio assistant for {kb.owner_name}.
+
+**CRITICAL: ACCURACY REQUIREMENT**
+- ONLY use data from the knowledge base below
+- NEVER invent metrics, formulas, or project details
+- If information is not in knowledge base, say: "That specific detail isn't available in Robin's repository"
+- Be specific: use exact numbers, exact project names, exact formulas
+- Admit uncertainty rather than guess
+
+**ROBIN'S PORTFOLIO SUMMARY**
+- Total Projects: 21 (Excel: 6, Power BI: 5, Python: 4, SQL: 6)
+- Total Records Analyzed: 185,000+
+- Industries: E-commerce, Healthcare, Finance, Telecom, Retail, Supply Chain
+- Data Span: 2019-2025
+
+**CORE PROJECTS DATA:**
+"""
+
+    # Add project details for context awareness (detail depends on the profile)
+    for category in kb.categories:
+        prefix += f"\n{category.upper()} PROJECTS:\n"
+        for proj in kb.by_category[category]:
+            prefix += _project_line(proj, profile)
+
+    prefix += """
+
+**RESPONSE GUIDELINES**
+1. Use EXACT project names: "Telco Customer Churn Analysis" not "Telecom project"
+2. Quote EXACT metrics: "26.54% churn rate" not "around 25%"
+3. Provide EXACT code when asked: DAX formulas, SQL queries, Python code
+4. Explain the "why" behind technical choices
+5. Link insights to business outcomes
+6. Keep responses 150-500 words (concise but thorough)
+
+**IF ASKED FOR:**
+- Code/Formulas: Provide exact snippets from projects
+- Project Details: Cite dataset size, key metrics, GitHub link
+- Comparison: Use actual numbers from multiple projects
+- Methodology: Explain exact techniques used (K-Means, ARIMA, DAX, etc.)
+- Business Impact: Reference specific outcomes ($, %, improvements)
+
+**ABSOLUTE RULES:**
+- Never say "probably" or "likely" without data
+- Never invent dataset sizes, metrics, or results
+- Never hallucinate formulas or code
+- Always ground answers in the 21 projects listed above
+- When uncertain, ask for clarification or admit gap
+"""
+    return prefix
+
+
+def static_prefix(kb, profile="standard"):
+    """(prefix_text, prefix_hash) for this knowledge-base version and profile; built and hashed once."""
+    cached = _PREFIX_CACHE.get((kb.version, profile))
+    if cached is None:
+        if any(version != kb.version for version, _ in _PREFIX_CACHE):
+            _PREFIX_CACHE.clear()  # only the live version is worth keeping
+        for name in PROFILES:  # compile every profile together so their sizes are known up front
+            text = _build_static_prefix(kb, name)
+            _PREFIX_CACHE[(kb.version, name)] = (text, hashlib.sha256(text.encode("utf-8")).hexdigest()[:16])
+        cached = _PREFIX_CACHE[(kb.version, profile)]
+    return cached
+
+
+def profile_tokens(kb):
+    """{profile: estimated prefix tokens} (~4 chars per token, like rate_limiter.estimate_tokens)."""
+    return {name: len(static_prefix(kb, name)[0]) // 4 for name in PROFILES}
+
+
+def prefix_profile(kb, system_prompt):
+    """(profile, prefix_text, prefix_hash) of the static prefix a system prompt starts with."""
+    for name in PROFILES:
+        text, digest = static_prefix(kb, name)
+        if system_prompt.startswith(text):
+            return name, text, digest
+    return None, "", None
+
+
+def choose_profile(kb, query_type, available_tokens=None, max_prefix_tokens=None, floor=None):
+    """
+    Profile for one request: the smallest one that suits the query type (and is at
+    least `floor`, the profile the session already uses), stepped down while its prefix
+    exceeds `max_prefix_tokens` (latency cap) or the tokens the budget has left.
+    """
+    profile = _PROFILE_FOR_QUERY.get(query_type, "standard")
+    if floor in PROFILES and PROFILES.index(floor) > PROFILES.index(profile):
+        profile = floor
+    sizes = profile_tokens(kb)
+    limits = [n for n in (available_tokens, max_prefix_tokens) if n is not None]
+    while profile != PROFILES[0] and limits and sizes[profile] > min(limits):
+        profile = PROFILES[PROFILES.index(profile) - 1]
+    return profile
+
+
+def mode_section(chat_mode):
+    if chat_mode == "Business Analytics Assistant":
+        return """
+**BUSINESS ANALYTICS MODE**
+Focus on:
+- Specific metrics and KPIs from projects
+- Business impact and ROI
+- Industry patterns and insights
+- Data-driven recommendations
+- Exact formulas/queries when requested
+"""
+    return """
+**GENERAL ASSISTANT MODE**
+- Relate back to Robin's expertise when relevant
+- Discuss analytics methodologies
+- Explain project approaches
+- Maintain professional tone
+"""
+
+
+def project_section(kb, selected_project):
+    if not selected_project:
+        return ""
+    # Add specific project context if user selected one
+    proj = kb.by_url.get(selected_project)
+    return f"""
+**CURRENT PROJECT CONTEXT**
+Name: {proj.name if proj else 'Unknown'}
+Category: {proj.category if proj else 'N/A'}
+URL: {selected_project}
+
+Available data on this project:
+- Dataset: {(proj and proj.dataset_size) or 'Not specified'}
+- Objective: {(proj and proj.objective) or 'Not specified'}
+- Key Metrics: {json.dumps(proj.metrics_dict() if proj else {}, indent=2)}
+- Techniques: {', '.join(proj.techniques if proj else [])}
+- Business Impact: {(proj and proj.business_impact) or 'Not specified'}
+
+When answering, prioritize insights from THIS project.
+"""
+
+
+def build_intelligent_system_prompt(kb, chat_mode, selected_project=None, profile="standard"):
+    """
+    Build enhanced system prompt with deep project knowledge.
+    Prevents hallucination by grounding in actual context data.
+    Static prefix first, then the mode and project suffixes.
+    """
+    prefix, _ = static_prefix(kb, profile)
+    return (prefix + mode_section(chat_mode) + project_section(kb, selected_project)).strip()
+
+
+def history_window(history, size=8):
+    """
+    Recent turns to send. The start only moves in steps of size // 2, so between jumps each
+    request repeats the previous one's messages as an exact prefix and just appends the new
+    turn (a sliding window would change the first message every turn).
+    """
+    step = max(size // 2, 1)
+    start = max(0, -(-(len(history) - size) // step) * step)
+    return history[start:]
+
+
+class PrefixRegistry:
+    """
+    Process-wide record of which static prefixes have already been sent, and per session,
+    how much of each request's message list repeats the previous request (message diffing).
+    """
+
+    def __init__(self, max_sessions=1000):
+        self.lock = threading.Lock()
+        self.seen = {}  # prefix_hash -> times sent
+        self.prefix_chars = {}
+        self.profiles = Counter()
+        self.hits = 0
+        self.misses = 0
+        self.max_sessions = max_sessions
+        self.last_sent = OrderedDict()  # session id -> digests of the messages last sent
+        self.messages_sent = 0
+        self.messages_repeated = 0
+
+    def record(self, prefix_hash, prefix_chars, profile=None):
+        """Note one request sent with this prefix; returns True if it was reused."""
+        with self.lock:
+            if profile:
+                self.profiles[profile] += 1
+            reused = prefix_hash in self.seen
+            self.seen[prefix_hash] = self.seen.get(prefix_hash, 0) + 1
+            self.prefix_chars[prefix_hash] = prefix_chars
+            if reused:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return reused
+
+    def record_messages(self, session, messages):
+        """Diff a session's request against its previous one; returns how many leading messages repeat."""
+        digests = [hashlib.sha256(f"{m['role']}\x00{m['content']}".encode("utf-8")).digest()[:8] for m in messages]
+        with self.lock:
+            previous = self.last_sent.pop(session, [])
+            self.last_sent[session] = digests
+            while len(self.last_sent) > self.max_sessions:
+                self.last_sent.popitem(last=False)
+            repeated = 0
+            for old, new in zip(previous, digests):
+                if old != new:
+                    break
+                repeated += 1
+            self.messages_sent += len(digests)
+            self.messages_repeated += repeated
+            return repeated
+
+    def snapshot(self):
+        with self.lock:
+            total = self.hits + self.misses
+            reused_chars = sum(self.prefix_chars[h] * (n - 1) for h, n in self.seen.items())
+            return {
+                "distinct_prefixes": len(self.seen),
+                "prefix_hits": self.hits,
+                "prefix_misses": self.misses,
+                "prefix_reuse_rate": round(self.hits / total, 3) if total else 0.0,
+                "reused_prefix_tokens_est": reused_chars // 4,
+                "requests_by_profile": dict(self.profiles),
+                "messages_sent": self.messages_sent,
+                "messages_repeating_previous_request": self.messages_repeated,
+            }
@@ -0,0 +1,164 @@
+"""
+Client-side rate limiting for Groq usage.
+One process-wide GroqBudget holds two token buckets (requests/min and tokens/min).
+Calls reserve an estimate up front, then reconcile with completion.usage.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously up to `capacity`."""
+
+    def __init__(self, capacity, refill_per_sec):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+
+    def _refill(self, now):
+        elapsed = now - self.updated
+        if elapsed > 0:
+            self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_sec)
+            self.updated = now
+
+    def wait_time(self, amount, now):
+        """Seconds until `amount` tokens are available (0 if available now)."""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_sec
+
+    def take(self, amount):
+        # May go negative: actual usage is only known after the call.
+        self.tokens -= amount
+
+    def drain(self):
+        self.tokens = min(self.tokens, 0.0)
+
+
+class GroqBudget:
+    """
+    Admission control in front of client.chat.completions.create.
+    acquire() queues a caller for at most `max_wait` seconds; if the budget
+    is still exhausted it returns False and the caller should shed load.
+    """
+
+    def __init__(self, requests_per_min=30, tokens_per_min=6000, max_wait=8.0):
+        self.requests = TokenBucket(requests_per_min, requests_per_min / 60.0)
+        self.tokens = TokenBucket(tokens_per_min, tokens_per_min / 60.0)
+        self.max_wait = max_wait
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+        self.stats = {
+            "admitted": 0,
+            "queued": 0,
+            "shed": 0,
+            "speculative": 0,
+            "rate_limited": 0,
+            "tokens_used": 0,
+        }
+
+    def acquire(self, estimated_tokens, max_wait=None):
+        """Reserve one request and `estimated_tokens`; returns True if admitted."""
+        max_wait = self.max_wait if max_wait is None else max_wait
+        deadline = time.monotonic() + max_wait
+        queued = False
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                wait = max(
+                    self.blocked_until - now,
+                    self.requests.wait_time(1, now),
+                    self.tokens.wait_time(estimated_tokens, now),
+                )
+                if wait <= 0:
+                    self.requests.take(1)
+                    self.tokens.take(estimated_tokens)
+                    self.stats["admitted"] += 1
+                    return True
+                if now + wait > deadline:
+                    self.stats["shed"] += 1
+                    return False
+                if not queued:
+                    self.stats["queued"] += 1
+                    queued = True
+            time.sleep(min(wait, 0.5))
+
+    def acquire_spare(self, estimated_tokens, reserve=0.5):
+        """
+        Non-blocking admission for background work: only succeeds if both buckets
+        keep at least `reserve` of their capacity for live requests afterwards.
+        Refusals are not counted as shed load.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                return False
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            if (self.requests.tokens - 1 < reserve * self.requests.capacity
+                    or self.tokens.tokens - estimated_tokens < reserve * self.tokens.capacity):
+                return False
+            self.requests.take(1)
+            self.tokens.take(estimated_tokens)
+            self.stats["speculative"] += 1
+            return True
+
+    def tokens_available(self):
+        """Tokens the per-minute bucket could admit right now (never negative)."""
+        with self.lock:
+            self.tokens._refill(time.monotonic())
+            return int(max(self.tokens.tokens, 0))
+
+    def record_usage(self, usage, estimated_tokens):
+        """Reconcile the reservation with completion.usage (object or dict)."""
+        if usage is None:
+            return
+        total = usage.get("total_tokens") if isinstance(usage, dict) else getattr(usage, "total_tokens", None)
+        if total is None:
+            return
+        with self.lock:
+            self.tokens.take(total - estimated_tokens)
+            self.stats["tokens_used"] += total
+
+    def penalize(self, retry_after=None):
+        """Provider returned 429: empty both buckets and hold off until retry_after."""
+        with self.lock:
+            self.requests.drain()
+            self.tokens.drain()
+            self.blocked_until = max(self.blocked_until, time.monotonic() + (retry_after or 10.0))
+            self.stats["rate_limited"] += 1
+
+    def snapshot(self):
+        """Current budget state for the metrics panel."""
+        with self.lock:
+            now = time.monotonic()
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            return {
+                "requests_available": int(max(self.requests.tokens, 0)),
+                "requests_per_min": int(self.requests.capacity),
+                "tokens_available": int(max(self.tokens.tokens, 0)),
+                "tokens_per_min": int(self.tokens.capacity),
+                "blocked_for_s": round(max(self.blocked_until - now, 0.0), 1),
+                **self.stats,
+            }
+
+
+def estimate_tokens(messages, max_tokens=0):
+    """Rough prompt size (~4 chars per token) plus the completion allowance."""
+    chars = sum(len(m.get("content") or "") for m in messages)
+    return chars // 4 + max_tokens
+
+
+def retry_after_seconds(error):
+    """Best-effort Retry-After parsing from a Groq RateLimitError."""
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
@@ -0,0 +1,42 @@
+"""
+README fetching from raw.githubusercontent.com.
+Shared by the app and offline build steps (e.g. project_cards.py); returns the
+ETag alongside the text so callers can key caches on it and revalidate cheaply.
+"""
+
+from urllib.parse import urlparse
+
+
+def extract_owner_repo(repo_url):
+    parsed = urlparse(repo_url)
+    parts = parsed.path.strip("/").split("/")
+    if len(parts) >= 2:
+        return parts[0], parts[1]
+    return None, None
+
+
+def fetch_readme(repo_url, etag=None, timeout=8):
+    """
+    Fetch README.md from the main or master branch.
+    Returns (text, etag). If `etag` is given and the README is unchanged,
+    returns (None, etag) so the caller keeps its copy. (None, None) if not found.
+    """
+    owner, repo = extract_owner_repo(repo_url)
+    if not owner:
+        return None, None
+    import requests  # deferred: most page loads are served from the card cache
+
+    headers = {"Accept": "application/vnd.github.v3.raw"}
+    if etag:
+        headers["If-None-Match"] = etag
+    for branch in ("main", "master"):
+        url = f"https://raw.githubusercontent.com/{owner}/{repo}/{branch}/README.md"
+        try:
+            r = requests.get(url, headers=headers, timeout=timeout)
+            if r.status_code == 304:
+                return None, etag
+            if r.status_code == 200 and r.text.strip():
+                return r.text, r.headers.get("ETag")
+        except Exception:
+            continue
+    return None, None
@@ -0,0 +1,242 @@
+"""
+Chat message rendering: markdown -> sanitized HTML, once per message.
+Every character of message text is HTML-escaped before any markup is added, so
+user or model text can't inject tags; only the small markdown subset the
+assistant writes (headings, emphasis, links, lists, tables, quotes, code) becomes
+HTML, and code fences are highlighted server-side with Pygments when it's
+installed. The result is stored on the message record keyed by a content hash,
+so re-displaying history is string reuse.
+"""
+
+import hashlib
+import hmac
+import html
+import re
+import secrets
+import threading
+from functools import lru_cache
+
+_FENCE_OPEN_RE = re.compile(r"^(`{3,}|~{3,})\s*([\w\-\+#.]*)\s*$")
+_HEADING_RE = re.compile(r"^(#{1,6})\s+(.*?)\s*#*\s*$")
+_HR_RE = re.compile(r"^\s{0,3}([-*_])(?:\s*\1){2,}\s*$")
+_LIST_RE = re.compile(r"^(\s*)([-*+]|\d{1,3}[.)])\s+(.*)$")
+_TABLE_SEP_RE = re.compile(r"^\s*\|?\s*:?-{2,}:?\s*(\|\s*:?-{2,}:?\s*)*\|?\s*$")
+_QUOTE_RE = re.compile(r"^\s{0,3}>\s?(.*)$")
+
+_CODE_SPAN_RE = re.compile(r"(`+)(.+?)\1")
+_LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)\s]+)\)")
+_BOLD_RE = re.compile(r"\*\*(\S(?:.*?\S)?)\*\*|__(\S(?:.*?\S)?)__")
+_ITALIC_RE = re.compile(r"(?<![\w*])\*(\S(?:.*?\S)?)\*(?![\w*])|(?<!\w)_(\S(?:.*?\S)?)_(?!\w)")
+_STRIKE_RE = re.compile(r"~~(\S(?:.*?\S)?)~~")
+_SAFE_SCHEMES = ("http://", "https://", "mailto:")
+_PLACEHOLDER = "\x00{}\x00"
+
+
+# ---- code ----
+@lru_cache(maxsize=1)
+def _pygments():
+    """(highlight, get_lexer_by_name, HtmlFormatter) or None; Pygments is optional."""
+    try:
+        from pygments import highlight
+        from pygments.formatters import HtmlFormatter
+        from pygments.lexers import get_lexer_by_name
+    except ImportError:
+        return None
+    return highlight, get_lexer_by_name, HtmlFormatter(style="monokai", noclasses=True, nowrap=False)
+
+
+def code_block(code, lang=""):
+    """Highlighted <pre> block (inline styles, no stylesheet needed); escaped plain <pre> without Pygments."""
+    tools = _pygments()
+    if tools is not None and lang:
+        highlight, get_lexer_by_name, formatter = tools
+        try:
+            return highlight(code, get_lexer_by_name(lang.lower()), formatter)
+        except Exception:
+            pass  # unknown language: plain block
+    lang_attr = f" class='language-{html.escape(lang, quote=True)}'" if lang else ""
+    return f"<pre><code{lang_attr}>{html.escape(code)}</code></pre>"
+
+
+# ---- inline ----
+def _inline(text):
+    """Escape a line of text and apply inline markdown (code spans are left untouched)."""
+    spans = []
+    text = text.replace("\x00", "")
+
+    def stash(fragment):
+        spans.append(fragment)
+        return _PLACEHOLDER.format(len(spans) - 1)
+
+    text = _CODE_SPAN_RE.sub(lambda m: stash(f"<code>{html.escape(m.group(2).strip())}</code>"), text)
+    text = html.escape(text, quote=False)
+
+    def link(m):
+        label, url = m.group(1), html.unescape(m.group(2))
+        if not url.lower().startswith(_SAFE_SCHEMES):
+            return m.group(0)
+        return stash(f"<a href='{html.escape(url, quote=True)}' target='_blank' rel='noopener noreferrer'>{label}</a>")
+
+    text = _LINK_RE.sub(link, text)
+    text = _BOLD_RE.sub(lambda m: f"<strong>{m.group(1) or m.group(2)}</strong>", text)
+    text = _ITALIC_RE.sub(lambda m: f"<em>{m.group(1) or m.group(2)}</em>", text)
+    text = _STRIKE_RE.sub(lambda m: f"<del>{m.group(1)}</del>", text)
+    # Links may contain emphasis and vice versa, so placeholders can nest
+    while "\x00" in text:
+        text = re.sub(r"\x00(\d+)\x00", lambda m: spans[int(m.group(1))], text)
+    return text
+
+
+def _cells(row):
+    row = row.strip()
+    if row.startswith("|"):
+        row = row[1:]
+    if row.endswith("|") and not row.endswith("\\|"):
+        row = row[:-1]
+    return [c.strip() for c in re.split(r"(?<!\\)\|", row)]
+
+
+# ---- blocks ----
+def _closes_fence(line, marker):
+    closing = line.strip()
+    return len(closing) >= len(marker) and set(closing) == {marker[0]}
+
+
+def _list_html(items):
+    """items: [(indent, ordered, text)] -> nested <ul>/<ol>."""
+    out, stack = [], []  # stack of (indent, tag)
+    for indent, ordered, text in items:
+        tag = "ol" if ordered else "ul"
+        while stack and (indent < stack[-1][0] or (indent == stack[-1][0] and tag != stack[-1][1])):
+            out.append(f"</li></{stack.pop()[1]}>")
+        if not stack or indent > stack[-1][0]:
+            stack.append((indent, tag))
+            out.append(f"<{tag}><li>")
+        else:
+            out.append("</li><li>")
+        out.append(_inline(text))
+    while stack:
+        out.append(f"</li></{stack.pop()[1]}>")
+    return "".join(out)
+
+
+@lru_cache(maxsize=512)
+def render_markdown(text):
+    """Sanitized HTML for a markdown string (cached: banked answers repeat across sessions)."""
+    lines = (text or "").replace("\r\n", "\n").split("\n")
+    out, para, i = [], [], 0
+
+    def flush():
+        if para:
+            out.append("<p>" + "<br>".join(_inline(p) for p in para) + "</p>")
+            para.clear()
+
+    while i < len(lines):
+        line = lines[i]
+        stripped = line.strip()
+        fence = _FENCE_OPEN_RE.match(stripped)
+        if fence:
+            flush()
+            marker, lang, body = fence.group(1), fence.group(2), []
+            i += 1
+            while i < len(lines) and not _closes_fence(lines[i], marker):
+                body.append(lines[i])
+                i += 1
+            out.append(code_block("\n".join(body), lang))
+            i += 1
+            continue
+        if not stripped:
+            flush()
+        elif _HEADING_RE.match(stripped):
+            flush()
+            level, title = _HEADING_RE.match(stripped).groups()
+            out.append(f"<h{len(level)}>{_inline(title)}</h{len(level)}>")
+        elif _HR_RE.match(line):
+            flush()
+            out.append("<hr>")
+        elif stripped.startswith("|") and i + 1 < len(lines) and _TABLE_SEP_RE.match(lines[i + 1]):
+            flush()
+            header = "".join(f"<th>{_inline(c)}</th>" for c in _cells(stripped))
+            rows, i = [], i + 2
+            while i < len(lines) and lines[i].strip().startswith("|"):
+                rows.append("<tr>" + "".join(f"<td>{_inline(c)}</td>" for c in _cells(lines[i])) + "</tr>")
+                i += 1
+            out.append(f"<table><thead><tr>{header}</tr></thead><tbody>{''.join(rows)}</tbody></table>")
+            continue
+        elif _LIST_RE.match(line):
+            flush()
+            items = []
+            while i < len(lines) and _LIST_RE.match(lines[i]):
+                indent, marker, item = _LIST_RE.match(lines[i]).groups()
+                items.append((len(indent.expandtabs(4)), marker[0].isdigit(), item))
+                i += 1
+            out.append(_list_html(items))
+            continue
+        elif _QUOTE_RE.match(line):
+            flush()
+            quoted = []
+            while i < len(lines) and _QUOTE_RE.match(lines[i]):
+                quoted.append(_QUOTE_RE.match(lines[i]).group(1))
+                i += 1
+            out.append(f"<blockquote>{render_markdown(chr(10).join(quoted))}</blockquote>")
+            continue
+        else:
+            para.append(stripped)
+        i += 1
+    flush()
+    return "".join(out)
+
+
+def plain_html(text):
+    """User text: escaped verbatim, line breaks kept, no markup."""
+    return html.escape(text or "").replace("\n", "<br>")
+
+
+class MessageRenderer:
+    """
+    Renders chat messages to HTML and caches it on each message under "_html".
+    With a `store` (a content_store.ContentStore), identical bubbles share one string.
+    The cache is keyed by an HMAC with a per-process secret, so an "_html" that didn't
+    come from this renderer (e.g. smuggled in through an imported file) is never trusted.
+    """
+
+    def __init__(self, assistant_name, store=None):
+        self.assistant_name = html.escape(assistant_name)
+        self.store = store
+        self.key = secrets.token_bytes(16)
+        self.lock = threading.Lock()
+        self.rendered = 0
+        self.reused = 0
+
+    def __call__(self, message):
+        role, content = message.get("role"), message.get("content") or ""
+        digest = hmac.new(self.key, f"{role}\x00{content}".encode("utf-8"), hashlib.sha256).hexdigest()[:16]
+        cached = message.get("_html")
+        if isinstance(cached, tuple) and len(cached) == 2 and hmac.compare_digest(str(cached[0]), digest):
+            with self.lock:
+                self.reused += 1
+            return cached[1]
+        if role == "user":
+            body = f"<div class='chat-bubble-user' aria-label='User message'><b>You:</b> {plain_html(content)}</div>"
+        else:
+            body = (f"<div class='chat-bubble-bot' aria-label='Assistant message'>"
+                    f"<b>{self.assistant_name}:</b>{render_markdown(content)}</div>")
+        if self.store is not None:
+            body = self.store.intern(body)
+        message["_html"] = (digest, body)
+        with self.lock:
+            self.rendered += 1
+        return body
+
+    def snapshot(self):
+        with self.lock:
+            total = self.rendered + self.reused
+            info = render_markdown.cache_info()
+            return {
+                "rendered": self.rendered,
+                "reused": self.reused,
+                "reuse_rate": round(self.reused / total, 3) if total else 0.0,
+                "markdown_cache_hits": info.hits,
+                "markdown_cache_size": info.currsize,
+                "highlighting": _pygments() is not None,
+            }
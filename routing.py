@@ -0,0 +1,73 @@
+"""
+Question routing shared by the app and the offline answer bank (answer_bank.py):
+query classification, whether the local answer engine settles a question, and
+which project a free-standing question is about. Both use these functions, so
+banked answers are keyed to the same project the app later looks them up under.
+"""
+
+import os
+import re
+
+LOCAL_ANSWER_THRESHOLD = float(os.getenv("PORTFOLI_LOCAL_THRESHOLD", "0.7"))
+
+
+def classify_user_query(query_text):
+    """
+    Classify query to determine response strategy.
+    Returns: {'type': 'code'|'metrics'|'explanation'|'comparison'|'general', 'context': {...}}
+    """
+    query_lower = query_text.lower()
+    
+    # Code extraction queries
+    code_patterns = {
+        'dax': r'\b(dax|measure|measures?)\b',
+        'sql': r'\b(sql|query|select|where|join)\b',
+        'python': r'\b(python|script|\.py|import|def|pandas|sklearn)\b',
+        'formula': r'\b(formula|equation|function)\b'
+    }
+    
+    # Metrics queries
+    metrics_patterns = r'\b(metric|rate|average|total|percentage|churn|revenue|profit)\b'
+    
+    # Comparison queries
+    comparison_patterns = r'\b(vs|versus|compare|difference|better|similar)\b'
+    
+    # Classification logic
+    for code_type, pattern in code_patterns.items():
+        if re.search(pattern, query_lower):
+            return {'type': 'code', 'language': code_type}
+    
+    if re.search(comparison_patterns, query_lower):
+        return {'type': 'comparison'}
+    
+    if re.search(metrics_patterns, query_lower):
+        return {'type': 'metrics'}
+    
+    if any(word in query_lower for word in ['explain', 'how', 'why', 'understand', 'tell me']):
+        return {'type': 'explanation'}
+    
+    return {'type': 'general'}
+
+
+def confident_local_answer(engine, text, query_type, selected_project=None):
+    """The answer engine's LocalAnswer if it clears LOCAL_ANSWER_THRESHOLD, else None (ask Groq)."""
+    local = engine.answer(text, query_type, selected_project)
+    return local if local and local.confidence > LOCAL_ANSWER_THRESHOLD else None
+
+
+def is_multi_project(engine, text, query_type):
+    """Comparisons and questions naming several projects shouldn't be pinned to one project."""
+    return query_type == 'comparison' or len(engine.mentioned_projects(text)) >= 2
+
+
+def route_question(text, query_type, engine, search, project_index):
+    """
+    Project URL a question asked with no project selected is about, or None.
+    A (possibly misspelled) project name settles it; otherwise the embedding index over
+    project profiles and README sections decides. `project_index` is a zero-argument
+    callable, so numpy and the index only load when the name search finds nothing.
+    Comparisons stay unpinned either way.
+    """
+    if is_multi_project(engine, text, query_type):
+        return None
+    return search.resolve(text) or project_index().route(text)
@@ -0,0 +1,176 @@
+"""
+Semantic response cache: reuse an answer for a paraphrase of an earlier question.
+Questions are normalized and embedded with the local CPU embedder from
+embeddings.py; each scope (knowledge-base version, chat mode, project) keeps a
+ring buffer of unit vectors, so a lookup is one matrix-vector product and an
+argmax. A hit needs cosine >= threshold and the same numbers, superlatives and
+project/category names ("highest" vs "lowest", "2022" vs "2023", "telco" vs
+"bank"), which embeddings alone blur. Normalization folds common synonyms
+("percentage" -> "rate"), so with the default hashing embedder rewordings with
+the same content words hit; looser paraphrases ("dataset size?" vs "how many
+records") need a sentence-transformers model via PORTFOLI_EMBED_MODEL.
+A sample of hits is kept (and can be re-asked in the background) to estimate
+how often a reused answer was wrong.
+"""
+
+import random
+import re
+import threading
+import time
+from collections import deque
+
+import numpy as np
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_CONTRACTIONS = (("what's", "what is"), ("how's", "how is"), ("where's", "where is"), ("who's", "who is"))
+_SYNONYMS = {
+    "percentage": "rate", "percent": "rate", "pct": "rate", "ratio": "rate",
+    "avg": "average", "mean": "average", "modeled": "modelled", "modeling": "modelling",
+    "biggest": "largest", "greatest": "highest", "max": "highest", "maximum": "highest",
+    "min": "lowest", "minimum": "lowest", "smallest": "lowest",
+}
+_DISTINCT = {
+    "highest", "lowest", "max", "maximum", "min", "minimum", "best", "worst", "top", "bottom",
+    "most", "least", "largest", "smallest", "increase", "decrease", "first", "last", "not", "without",
+}
+# Pronouns and back-references: the answer depends on the conversation, not just the question
+_FOLLOWUP_RE = re.compile(r"\b(it|its|they|them|their|these|those|that|above|previous|earlier|again|else|more)\b")
+
+
+def normalize(text):
+    text = (text or "").lower()
+    for short, long in _CONTRACTIONS:
+        text = text.replace(short, long)
+    return " ".join(_SYNONYMS.get(w, w) for w in _WORD_RE.findall(text))
+
+
+def guard_terms(normalized, entities=frozenset()):
+    """Words and numbers two questions must share for one's answer to serve the other."""
+    return frozenset(w for w in normalized.split() if w in _DISTINCT or w in entities or w.isdigit())
+
+
+def is_followup(text):
+    return bool(_FOLLOWUP_RE.search(normalize(text)))
+
+
+class _Scope:
+    __slots__ = ("matrix", "questions", "answers", "guards", "size", "next")
+
+    def __init__(self, capacity, dim):
+        self.matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self.questions = [None] * capacity
+        self.answers = [None] * capacity
+        self.guards = [None] * capacity
+        self.size = 0
+        self.next = 0
+
+
+class SemanticCache:
+    """Per-scope nearest-neighbour answer cache (process-local, bounded per scope)."""
+
+    def __init__(self, embedder, threshold=0.85, max_entries=512, max_scopes=256,
+                 sample_rate=0.05, agreement_threshold=0.6, entities=()):
+        """`entities`: words naming projects or categories; cached and new question must agree on them."""
+        self.embedder = embedder
+        self.entities = frozenset(entities)
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.max_scopes = max_scopes
+        self.sample_rate = sample_rate
+        self.agreement_threshold = agreement_threshold
+        self.lock = threading.Lock()
+        self.scopes = {}
+        self.samples = deque(maxlen=20)  # recent sampled hits, newest last
+        self.rng = random.Random()
+        self.stats = {"hits": 0, "misses": 0, "guard_rejects": 0, "stored": 0,
+                      "audited": 0, "false_hits": 0, "lookup_ms": 0.0}
+
+    def _embed(self, normalized):
+        return np.asarray(self.embedder.encode([normalized])[0], dtype=np.float32)
+
+    def lookup(self, scope, question):
+        """
+        (answer, score, matched question, sampled) for the closest earlier question in `scope`,
+        or None. `sampled` marks hits picked for false-hit auditing.
+        """
+        started = time.perf_counter()
+        normalized = normalize(question)
+        if not normalized:
+            return None
+        vector = self._embed(normalized)
+        with self.lock:
+            s = self.scopes.get(scope)
+            hit = None
+            if s is not None and s.size:
+                scores = s.matrix[:s.size] @ vector
+                best = int(np.argmax(scores))
+                if scores[best] >= self.threshold:
+                    if s.guards[best] == guard_terms(normalized, self.entities):
+                        hit = (s.answers[best], float(scores[best]), s.questions[best])
+                    else:
+                        self.stats["guard_rejects"] += 1
+            self.stats["hits" if hit else "misses"] += 1
+            self.stats["lookup_ms"] += (time.perf_counter() - started) * 1000
+            if hit is None:
+                return None
+            sampled = self.rng.random() < self.sample_rate
+            if sampled:
+                self.samples.append({"query": question, "matched": hit[2], "score": round(hit[1], 3),
+                                     "agreement": None})
+            return (*hit, sampled)
+
+    def store(self, scope, question, answer):
+        normalized = normalize(question)
+        if not normalized or not answer:
+            return
+        vector = self._embed(normalized)
+        with self.lock:
+            s = self.scopes.get(scope)
+            if s is None:
+                if len(self.scopes) >= self.max_scopes:
+                    self.scopes.pop(next(iter(self.scopes)))  # oldest scope first
+                s = self.scopes[scope] = _Scope(self.max_entries, vector.shape[0])
+            i = s.next
+            s.matrix[i] = vector
+            s.questions[i], s.answers[i], s.guards[i] = question, answer, guard_terms(normalized, self.entities)
+            s.next = (i + 1) % self.max_entries
+            s.size = min(s.size + 1, self.max_entries)
+            self.stats["stored"] += 1
+
+    def audit(self, query, cached_answer, fresh_answer):
+        """
+        Compare a reused answer with a freshly generated one for the same query; low
+        agreement counts as a false hit.
+        """
+        vectors = self.embedder.encode([normalize(cached_answer), normalize(fresh_answer)])
+        agreement = float(vectors[0] @ vectors[1])
+        with self.lock:
+            self.stats["audited"] += 1
+            if agreement < self.agreement_threshold:
+                self.stats["false_hits"] += 1
+            for sample in reversed(self.samples):
+                if sample["query"] == query and sample["agreement"] is None:
+                    sample["agreement"] = round(agreement, 3)
+                    break
+        return agreement
+
+    def snapshot(self):
+        with self.lock:
+            s = self.stats
+            lookups = s["hits"] + s["misses"]
+            return {
+                "embedder": getattr(self.embedder, "name", type(self.embedder).__name__),
+                "threshold": self.threshold,
+                "matches": ("rewordings with the same content words; set PORTFOLI_EMBED_MODEL for looser paraphrases"
+                            if getattr(self.embedder, "name", "") == "hash" else "paraphrases"),
+                "scopes": len(self.scopes),
+                "entries": sum(sc.size for sc in self.scopes.values()),
+                "hits": s["hits"],
+                "misses": s["misses"],
+                "hit_rate": round(s["hits"] / lookups, 3) if lookups else 0.0,
+                "guard_rejects": s["guard_rejects"],
+                "avg_lookup_ms": round(s["lookup_ms"] / lookups, 2) if lookups else 0.0,
+                "audited": s["audited"],
+                "false_hit_rate": round(s["false_hits"] / s["audited"], 3) if s["audited"] else None,
+                "samples": list(self.samples)[-5:],
+            }
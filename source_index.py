@@ -0,0 +1,421 @@
+"""
+Whole-repository source index.
+Each project repository is downloaded once as a single tarball (or read from a
+local mirror directory) and streamed through tarfile without touching disk;
+source files are split into code blocks tagged with language, kind and symbol
+(SQL statement type and object, Python function/class names, DAX measure names).
+The index is persisted to .cache/source_index.json and only rebuilt for repos
+whose HEAD commit changed, so the app serves real code with no per-query network:
+
+    python source_index.py [--mirror DIR] [--workers 4] [--force]
+"""
+
+import argparse
+import ast
+import json
+import os
+import re
+import tarfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from knowledge_base import CACHE_DIR
+from readmes import extract_owner_repo
+
+SOURCE_INDEX_PATH = os.path.join(CACHE_DIR, "source_index.json")
+MAX_FILE_BYTES = 512 * 1024
+MAX_BLOCK_CHARS = 6000
+
+LANG_BY_EXT = {
+    ".sql": "sql",
+    ".py": "python",
+    ".ipynb": "python",
+    ".dax": "dax",
+    ".msdax": "dax",
+    ".tmdl": "dax",
+    ".m": "m",
+    ".pq": "m",
+    ".md": "markdown",  # fenced blocks only; the fence decides the language
+}
+_FENCE_LANGS = {
+    "py": "python", "python3": "python", "tsql": "sql", "mysql": "sql", "postgresql": "sql",
+    "sqlite": "sql", "plsql": "sql", "powerquery": "m", "mquery": "m",
+}
+_FENCE_RE = re.compile(r"```([\w\-\+]+)?\n(.*?)```", re.DOTALL)
+# One identifier part: [bracketed], "quoted" or `backticked` (spaces allowed), or a bare word
+_SQL_IDENT = r"(?:\[[^\]]+\]|\"[^\"]+\"|`[^`]+`|\w+)"
+_SQL_IDENT_RE = re.compile(_SQL_IDENT)
+_SQL_NAME = rf"({_SQL_IDENT}(?:\s*\.\s*{_SQL_IDENT})*)"
+_SQL_CREATE_RE = re.compile(
+    r"^create\s+(?:or\s+(?:replace|alter)\s+)?(table|view|procedure|proc|function|index|trigger)\s+"
+    r"(?:if\s+not\s+exists\s+)?" + _SQL_NAME, re.IGNORECASE,
+)
+_SQL_CTE_RE = re.compile(r"^with\s+(?:recursive\s+)?" + _SQL_NAME + r"\s+as\b", re.IGNORECASE)
+# "Name = ...", "[Name] := ..." at the start of a line, or TMDL "measure 'Name' = ..." (any indent);
+# VAR/RETURN lines inside a measure are not new measures
+_DAX_MEASURE_RE = re.compile(
+    r"^(?:[ \t]*measure[ \t]+(?:'([^'\n]+)'|([^\s='][^=\n]*?))|\[([^\]\n]+)\]|(?!(?i:var|return)\b)([A-Za-z_][\w %]*?))"
+    r"[ \t]*:?=(?!=)",
+    re.MULTILINE,
+)
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def _block(lang, code, path, kind, symbol=None):
+    return {"lang": lang, "code": code.strip()[:MAX_BLOCK_CHARS], "path": path, "kind": kind, "symbol": symbol}
+
+
+# ---- per-language extraction ----
+_SQL_QUOTES = {"'": "'", '"': '"', "`": "`", "[": "]"}
+
+
+def split_sql(text):
+    """
+    [(statement, body without comments)] split on semicolons that aren't inside quoted
+    strings or identifiers ('a;b', "x", `x`, [x]) or -- and /* */ comments.
+    """
+    statements, start, body, i, n = [], 0, [], 0, len(text)
+    while i < n:
+        ch = text[i]
+        if ch in _SQL_QUOTES:
+            close = _SQL_QUOTES[ch]
+            j = i + 1
+            while j < n:
+                if text[j] == close:
+                    if close != "]" and j + 1 < n and text[j + 1] == close:  # doubled quote escapes itself
+                        j += 2
+                        continue
+                    break
+                j += 1
+            body.append(text[i:j + 1])
+            i = j + 1
+        elif text.startswith("--", i):
+            j = text.find("\n", i)
+            i = n if j < 0 else j
+        elif text.startswith("/*", i):
+            j = text.find("*/", i + 2)
+            i = n if j < 0 else j + 2
+            body.append(" ")
+        elif ch == ";":
+            statements.append((text[start:i], "".join(body)))
+            start, body, i = i + 1, [], i + 1
+        else:
+            body.append(ch)
+            i += 1
+    statements.append((text[start:], "".join(body)))
+    return statements
+
+
+def sql_name(qualified):
+    """'[dbo].[Sales Summary]' -> 'dbo.Sales Summary': quoting removed part by part."""
+    return ".".join(part[1:-1] if part[0] in "[\"`" else part for part in _SQL_IDENT_RE.findall(qualified))
+
+
+def sql_blocks(text, path):
+    """One block per statement, typed by its leading keyword (CREATE also names the object)."""
+    blocks = []
+    statements = split_sql(text)
+    for n, (statement, body) in enumerate(statements):
+        body = body.strip()
+        if len(body) < 12:  # "GO", "USE db", stray separators
+            continue
+        kind = body.split(None, 1)[0].upper()
+        symbol = None
+        created = _SQL_CREATE_RE.match(body)
+        if created:
+            kind = f"CREATE {created.group(1).upper()}"
+            symbol = sql_name(created.group(2))
+        else:
+            cte = _SQL_CTE_RE.match(body)
+            if cte:
+                symbol = sql_name(cte.group(1))
+        terminator = ";" if n < len(statements) - 1 else ""  # the last statement may end in a comment
+        blocks.append(_block("sql", statement.strip() + terminator, path, kind, symbol))
+    return blocks
+
+
+def python_blocks(text, path):
+    """Top-level functions and classes; a script without any becomes one block."""
+    try:
+        tree = ast.parse(text)
+    except (SyntaxError, ValueError):
+        return [_block("python", text, path, "script")]
+    blocks = []
+    for node in tree.body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            kind = "class" if isinstance(node, ast.ClassDef) else "function"
+            blocks.append(_block("python", ast.get_source_segment(text, node) or "", path, kind, node.name))
+    return blocks or [_block("python", text, path, "script")]
+
+
+def notebook_blocks(text, path):
+    """Code cells of a Jupyter notebook (magics and all), named after their first def."""
+    try:
+        cells = json.loads(text).get("cells", [])
+    except (ValueError, AttributeError):
+        return []
+    blocks = []
+    for cell in cells:
+        if cell.get("cell_type") != "code":
+            continue
+        source = cell.get("source", "")
+        source = "".join(source) if isinstance(source, list) else source
+        if source.strip():
+            named = re.search(r"^(?:def|class)\s+(\w+)", source, re.MULTILINE)
+            blocks.append(_block("python", source, path, "cell", named.group(1) if named else None))
+    return blocks
+
+
+def dax_blocks(text, path):
+    """One block per measure definition ("Name = ...", "[Name] := ...", TMDL "measure 'Name' = ...")."""
+    starts = list(_DAX_MEASURE_RE.finditer(text))
+    if not starts:
+        return [_block("dax", text, path, "script")] if text.strip() else []
+    blocks = []
+    for m, nxt in zip(starts, starts[1:] + [None]):
+        name = next((g for g in m.groups() if g), "").strip()
+        blocks.append(_block("dax", text[m.start():nxt.start() if nxt else len(text)], path, "measure", name))
+    return blocks
+
+
+def markdown_blocks(text, path):
+    """Fenced code in docs other than the README (the card store already covers that)."""
+    blocks = []
+    for m in _FENCE_RE.finditer(text):
+        lang = (m.group(1) or "").lower()
+        lang = _FENCE_LANGS.get(lang, lang)
+        code = m.group(2)
+        if lang == "sql":
+            blocks += sql_blocks(code, path)
+        elif lang == "dax":
+            blocks += dax_blocks(code, path)
+        elif lang:
+            blocks.append(_block(lang, code, path, "snippet"))
+    return blocks
+
+
+def file_blocks(path, data):
+    """Code blocks for one source file (bytes), or [] if it isn't indexed."""
+    ext = os.path.splitext(path)[1].lower()
+    lang = LANG_BY_EXT.get(ext)
+    if lang is None or os.path.basename(path).lower() == "readme.md":
+        return []
+    text = data.decode("utf-8-sig", errors="replace")
+    if ext == ".ipynb":
+        return notebook_blocks(text, path)
+    if lang == "markdown":
+        return markdown_blocks(text, path)
+    if lang == "sql":
+        return sql_blocks(text, path)
+    if lang == "python":
+        return python_blocks(text, path)
+    if lang == "dax":
+        return dax_blocks(text, path)
+    return [_block(lang, text, path, "script")]
+
+
+# ---- sources ----
+def iter_tar_files(fileobj):
+    """(path, bytes) for indexable files in a .tar.gz stream; top-level directory stripped."""
+    with tarfile.open(fileobj=fileobj, mode="r|gz") as tar:
+        for member in tar:
+            if not member.isfile() or member.size > MAX_FILE_BYTES:
+                continue
+            path = member.name.split("/", 1)[-1]
+            if os.path.splitext(path)[1].lower() not in LANG_BY_EXT:
+                continue
+            f = tar.extractfile(member)
+            if f is not None:
+                yield path, f.read()
+
+
+def iter_mirror_files(root):
+    """(path, bytes) for indexable files under a checked-out repository directory."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".")]
+        for name in filenames:
+            full = os.path.join(dirpath, name)
+            if os.path.splitext(name)[1].lower() not in LANG_BY_EXT or os.path.getsize(full) > MAX_FILE_BYTES:
+                continue
+            with open(full, "rb") as f:
+                yield os.path.relpath(full, root).replace(os.sep, "/"), f.read()
+
+
+def _github_headers(accept):
+    headers = {"Accept": accept}
+    token = os.getenv("GITHUB_TOKEN")
+    if token:
+        headers["Authorization"] = f"Bearer {token}"
+    return headers
+
+
+def head_commit(repo_url, timeout=8):
+    """SHA of the default branch's HEAD (one small API call), or None."""
+    owner, repo = extract_owner_repo(repo_url)
+    if not owner:
+        return None
+    import requests
+
+    try:
+        r = requests.get(f"https://api.github.com/repos/{owner}/{repo}/commits/HEAD",
+                         headers=_github_headers("application/vnd.github.sha"), timeout=timeout)
+    except Exception:
+        return None
+    return r.text.strip() if r.status_code == 200 else None
+
+
+def repo_blocks(repo_url, mirror=None, timeout=60):
+    """
+    All code blocks of one repository: from `mirror`/<repo> (a directory or <repo>.tar.gz)
+    if present, else streamed from GitHub's tarball endpoint. None if unavailable.
+    """
+    owner, repo = extract_owner_repo(repo_url)
+    if not owner:
+        return None
+    files = None
+    if mirror:
+        directory, archive = os.path.join(mirror, repo), os.path.join(mirror, repo + ".tar.gz")
+        if os.path.isdir(directory):
+            files = iter_mirror_files(directory)
+        elif os.path.isfile(archive):
+            with open(archive, "rb") as f:
+                return [b for path, data in iter_tar_files(f) for b in file_blocks(path, data)]
+    if files is None:
+        import requests
+
+        try:
+            r = requests.get(f"https://api.github.com/repos/{owner}/{repo}/tarball",
+                             headers=_github_headers("application/vnd.github+json"), stream=True, timeout=timeout)
+        except Exception:
+            return None
+        if r.status_code != 200:
+            return None
+        with r:
+            r.raw.decode_content = True  # transport encoding only; the tar itself stays gzipped
+            return [b for path, data in iter_tar_files(r.raw) for b in file_blocks(path, data)]
+    return [b for path, data in files for b in file_blocks(path, data)]
+
+
+# ---- index ----
+class SourceIndex:
+    """url -> {"commit", "indexed_at", "blocks"}, with lookups by language and symbol."""
+
+    def __init__(self, repos=None, path=SOURCE_INDEX_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.repos = repos or {}
+
+    @classmethod
+    def load(cls, path=SOURCE_INDEX_PATH):
+        try:
+            with open(path, encoding="utf-8") as f:
+                return cls(json.load(f).get("repos", {}), path)
+        except (OSError, ValueError):
+            return cls(path=path)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        tmp = self.path + ".tmp"
+        with self.lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"repos": self.repos}, f, ensure_ascii=False)
+        os.replace(tmp, self.path)
+
+    def put(self, url, blocks, commit=None):
+        with self.lock:
+            self.repos[url] = {"commit": commit, "indexed_at": round(time.time()), "blocks": blocks}
+
+    def __len__(self):
+        return sum(len(r["blocks"]) for r in self.repos.values())
+
+    def find(self, url, lang=None, query=""):
+        """
+        Blocks of one repo in `lang` ("m" also matches Power Query), best match for the
+        question first: symbol words count double, then path and kind words.
+        """
+        blocks = (self.repos.get(url) or {}).get("blocks", [])
+        if lang:
+            langs = {"m", "powerquery"} if lang == "m" else {lang}
+            blocks = [b for b in blocks if b.get("lang") in langs]
+        words = set(_WORD_RE.findall(query.lower()))
+        if not words:
+            return list(blocks)
+
+        def score(block):
+            symbol = set(_WORD_RE.findall((block.get("symbol") or "").lower().replace("_", " ")))
+            rest = set(_WORD_RE.findall(f"{block.get('path', '')} {block.get('kind', '')}".lower().replace("_", " ")))
+            return 2 * len(words & symbol) + len(words & rest)
+
+        return sorted(blocks, key=score, reverse=True)
+
+    def symbols(self, url, lang=None):
+        return [b["symbol"] for b in self.find(url, lang) if b.get("symbol")]
+
+    def snapshot(self):
+        with self.lock:
+            by_lang = {}
+            for repo in self.repos.values():
+                for b in repo["blocks"]:
+                    by_lang[b["lang"]] = by_lang.get(b["lang"], 0) + 1
+            return {"repos": len(self.repos), "blocks": sum(by_lang.values()), "blocks_by_lang": by_lang}
+
+
+def build_source_index(kb, path=SOURCE_INDEX_PATH, mirror=None, workers=4, force=False):
+    """
+    (Re)index every project repository in parallel and persist the index. Repos whose
+    HEAD commit is unchanged are skipped unless `force`; mirrored repos are always re-read.
+    """
+    index = SourceIndex.load(path)
+    report = {"indexed": 0, "unchanged": 0, "failed": 0, "started": time.perf_counter()}
+    report_lock = threading.Lock()
+
+    def index_one(project):
+        url = project.url
+        _, repo = extract_owner_repo(url)
+        mirrored = bool(mirror and repo and (os.path.isdir(os.path.join(mirror, repo))
+                                             or os.path.isfile(os.path.join(mirror, repo + ".tar.gz"))))
+        commit = None if mirrored else head_commit(url)
+        known = index.repos.get(url)
+        if not force and not mirrored and commit and known and known.get("commit") == commit:
+            outcome = "unchanged"
+        else:
+            blocks = repo_blocks(url, mirror=mirror)
+            if blocks is None:
+                outcome = "failed"
+            else:
+                index.put(url, blocks, commit or ("mirror" if mirrored else None))
+                outcome = "indexed"
+        with report_lock:
+            report[outcome] += 1
+
+    projects = [p for p in kb.projects if p.url]
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(projects) or 1))) as pool:
+        list(pool.map(index_one, projects))
+    with index.lock:
+        index.repos = {url: r for url, r in index.repos.items() if url in kb.by_url}
+    index.save()
+    report["seconds"] = round(time.perf_counter() - report.pop("started"), 1)
+    return index, report
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Index the source files of every project repository.")
+    parser.add_argument("--output", default=SOURCE_INDEX_PATH)
+    parser.add_argument("--mirror", default=os.getenv("PORTFOLI_SOURCE_MIRROR"),
+                        help="directory holding <repo>/ checkouts or <repo>.tar.gz archives")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--force", action="store_true", help="re-download repos even if HEAD is unchanged")
+    args = parser.parse_args(argv)
+
+    from knowledge_base import load_knowledge_base
+
+    kb = load_knowledge_base()
+    index, report = build_source_index(kb, args.output, mirror=args.mirror, workers=args.workers, force=args.force)
+    snap = index.snapshot()
+    print(f"{report['indexed']} indexed, {report['unchanged']} unchanged, {report['failed']} failed "
+          f"in {report['seconds']}s: {snap['blocks']} blocks {snap['blocks_by_lang']} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
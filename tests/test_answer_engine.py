@@ -0,0 +1,56 @@
+"""Project matching and comparisons in the local answer engine."""
+
+import pytest
+
+from answer_engine import AnswerEngine
+from knowledge_base import load_knowledge_base
+from metrics_table import build_metrics_table
+from routing import classify_user_query
+
+
+@pytest.fixture(scope="module")
+def kb():
+    return load_knowledge_base()
+
+
+@pytest.fixture(scope="module")
+def engine(kb):
+    return AnswerEngine(kb, build_metrics_table(kb))
+
+
+def ask(engine, question):
+    return engine.answer(question, classify_user_query(question)["type"])
+
+
+def test_type_word_picks_the_dashboard(engine):
+    assert [p.name for p, _ in engine.match_projects("the telco dashboard")] == ["Telco Customer Churn Dashboard"]
+
+
+def test_type_word_keeps_every_matching_project(engine):
+    names = {p.name for p, _ in engine.match_projects("telco analysis")}
+    assert names == {"Telco Churn Analysis", "Telco Customer Churn Analysis"}
+
+
+def test_name_alone_stays_ambiguous(engine):
+    assert len(engine.match_projects("telco churn rate")) == 3
+
+
+def test_dashboard_question_is_not_answered_with_another_projects_figures(engine):
+    # The Power BI dashboard reports no churn metric; the SQL project's figure would be wrong
+    assert ask(engine, "the telco dashboard churn rate") is None
+
+
+def test_comparison_with_named_types(engine):
+    question = "compare the dataset size of the telco dashboard vs the telco excel project"
+    assert [p.name for p in engine.mentioned_projects(question)] == [
+        "Telco Customer Churn Dashboard", "Telco Customer Churn Analysis",
+    ]
+    answer = ask(engine, question)
+    assert answer is not None and answer.source == "metrics_table"
+    assert "Telco Customer Churn Dashboard" in answer.text
+    assert "Telco Customer Churn Analysis" in answer.text
+    assert "Telco Churn Analysis (SQL)" not in answer.text
+
+
+def test_comparison_never_drops_a_named_project(engine):
+    assert ask(engine, "Compare Telco churn analysis vs HR attrition") is None
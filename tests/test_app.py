@@ -0,0 +1,39 @@
+"""End-to-end chat turns through handle_user_input (Streamlit AppTest, no Groq calls)."""
+
+import os
+
+import pytest
+
+pytest.importorskip("streamlit.testing.v1")
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+
+
+@pytest.fixture
+def app():
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.secrets["GROQ_API_KEY"] = "gsk_test"
+    at.run()
+    assert not at.exception
+    return at
+
+
+def ask(at, question):
+    at.chat_input[0].set_value(question).run()
+    assert not at.exception
+    return at.session_state.history[-1]
+
+
+def test_comparison_with_named_types_is_answered_locally(app):
+    answer = ask(app, "compare the dataset size of the telco dashboard vs the telco excel project")
+    assert answer["role"] == "assistant" and answer["source"] == "local"
+    assert "Telco Customer Churn Dashboard" in answer["content"]
+    assert "Telco Customer Churn Analysis" in answer["content"]
+    assert not [c.value for c in app.caption if "Auto-detected" in c.value]
+
+
+def test_category_comparison_is_answered_locally(app):
+    answer = ask(app, "compare Excel vs Power BI project counts")
+    assert answer["source"] == "local"
+    assert "**Excel**: 6 projects" in answer["content"]
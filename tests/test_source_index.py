@@ -0,0 +1,31 @@
+"""SQL statement blocks and the object names they carry."""
+
+import pytest
+
+from source_index import sql_blocks, sql_name
+
+
+@pytest.mark.parametrize("raw, name", [
+    ("[dbo].[x]", "dbo.x"),
+    ("[dbo].[Sales Summary]", "dbo.Sales Summary"),
+    ('"public"."churn_by_contract"', "public.churn_by_contract"),
+    ("`shop`.`orders`", "shop.orders"),
+    ("dbo.customers", "dbo.customers"),
+    ("[dbo] . [x]", "dbo.x"),
+])
+def test_sql_name_unquotes_each_part(raw, name):
+    assert sql_name(raw) == name
+
+
+def test_create_and_cte_symbols():
+    sql = (
+        "CREATE VIEW [dbo].[x] AS SELECT * FROM customers;\n"
+        "CREATE TABLE IF NOT EXISTS \"public\".\"Churn Rates\" (id INT);\n"
+        "WITH [monthly totals] AS (SELECT 1 AS n) SELECT n FROM [monthly totals];\n"
+    )
+    blocks = sql_blocks(sql, "queries.sql")
+    assert [(b["kind"], b["symbol"]) for b in blocks] == [
+        ("CREATE VIEW", "dbo.x"),
+        ("CREATE TABLE", "public.Churn Rates"),
+        ("WITH", "monthly totals"),
+    ]